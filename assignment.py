@@ -0,0 +1,265 @@
+from vacuumworld.common.vworientation import VWOrientation
+
+from distanceoracle import DistanceOracle
+from spatialindex import BucketGrid
+
+
+# A dirt cell to clean: colour, x, y
+Task = tuple[str, int, int]
+
+# Tasks queued ahead for each cleaner, so it has its next dirt before reporting the last
+DEFAULT_LOOKAHEAD: int = 2
+# Cycles spent on the clean action once at the dirt
+CLEAN_CYCLES: int = 1
+
+
+def hungarian(cost: list[list[int]]) -> list[int]:
+    # minimum cost assignment of every row to a distinct column, rows <= columns,
+    # returns column chosen for each row (potentials method, O(rows^2 * columns))
+    rows: int = len(cost)
+    columns: int = len(cost[0]) if rows else 0
+    infinity: float = float("inf")
+    u: list[float] = [0.0] * (rows + 1)
+    v: list[float] = [0.0] * (columns + 1)
+    # row matched to each column, 1 based, 0 if free
+    match: list[int] = [0] * (columns + 1)
+    way: list[int] = [0] * (columns + 1)
+
+    for row in range(1, rows + 1):
+        match[0] = row
+        column: int = 0
+        slack: list[float] = [infinity] * (columns + 1)
+        used: list[bool] = [False] * (columns + 1)
+        while match[column]:
+            used[column] = True
+            current_row: int = match[column]
+            delta: float = infinity
+            next_column: int = 0
+            for j in range(1, columns + 1):
+                if used[j]:
+                    continue
+                reduced: float = cost[current_row - 1][j - 1] - u[current_row] - v[j]
+                if reduced < slack[j]:
+                    slack[j] = reduced
+                    way[j] = column
+                if slack[j] < delta:
+                    delta = slack[j]
+                    next_column = j
+            for j in range(columns + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    slack[j] -= delta
+            column = next_column
+        # flip the augmenting path back to its start
+        while column:
+            previous: int = way[column]
+            match[column] = match[previous]
+            column = previous
+
+    assigned: list[int] = [-1] * rows
+    for j in range(1, columns + 1):
+        if match[j]:
+            assigned[match[j] - 1] = j - 1
+    return assigned
+
+
+class AssignmentEngine:
+    def __init__(self, oracle: DistanceOracle, lookahead: int = DEFAULT_LOOKAHEAD) -> None:
+        # Cycle costs between cells for the explored grid
+        self.__oracle: DistanceOracle = oracle
+        # Number of tasks each cleaner is given ahead
+        self.__lookahead: int = lookahead
+
+        # Dirt not yet given to any cleaner, spatial index per colour
+        self.__unassigned: dict[str, BucketGrid] = {}
+        # Colours each cleaner can clean, by agent id
+        self.__colours: dict[str, tuple[str, ...]] = {}
+        # Last reported position and orientation of each cleaner
+        self.__states: dict[str, tuple[int, int, VWOrientation]] = {}
+        # Tasks given to each cleaner in the order it will do them
+        self.__queues: dict[str, list[Task]] = {}
+
+    def add_tasks(self, colour: str, coords: list[tuple[int, int]]) -> None:
+        pool: BucketGrid = self.__unassigned.setdefault(
+            colour, BucketGrid(self.__oracle.get_n())
+        )
+        for x, y in coords:
+            pool.insert(x, y)
+
+    def set_agent(
+        self,
+        agent_id: str,
+        colours: tuple[str, ...],
+        x: int,
+        y: int,
+        orientation: VWOrientation,
+    ) -> None:
+        # add a cleaner or move one to where it reported itself
+        self.__colours[agent_id] = colours
+        self.__states[agent_id] = (x, y, orientation)
+        self.__queues.setdefault(agent_id, [])
+
+    def complete(self, colour: str, x: int, y: int) -> bool:
+        # dirt reported clean, drop it wherever it is, return whether it was known
+        for queue in self.__queues.values():
+            if (colour, x, y) in queue:
+                queue.remove((colour, x, y))
+                return True
+        return colour in self.__unassigned and self.__unassigned[colour].remove(x, y)
+
+    def get_queue(self, agent_id: str) -> list[Task]:
+        return list(self.__queues.get(agent_id, []))
+
+    def is_idle(self, agent_id: str) -> bool:
+        return agent_id in self.__queues and not self.__queues[agent_id]
+
+    def hand_over(self, agent_id: str) -> tuple[str, Task] | None:
+        # give the task a cleaner is on its way to, and cannot get to, to the idle
+        # cleaner of its colour that gets there soonest, returning who took which
+        # task, None if no idle cleaner can take it
+        if not self.__queues.get(agent_id):
+            return None
+        task: Task = self.__queues[agent_id][0]
+        colour, x, y = task
+        idle: list[tuple[int, str]] = [
+            (self.__oracle.cycles(*self.__states[other], x, y), other)
+            for other, queue in self.__queues.items()
+            if not queue and colour in self.__colours[other]
+        ]
+        if not idle:
+            return None
+        receiver: str = min(idle)[1]
+        self.__queues[agent_id].pop(0)
+        self.__queues[receiver].append(task)
+        return receiver, task
+
+    def has_tasks(self) -> bool:
+        return any(self.__queues.values()) or any(
+            len(pool) for pool in self.__unassigned.values()
+        )
+
+    ### PLANNING ###
+
+    def __projected(self, agent_id: str) -> tuple[int, int, int, VWOrientation]:
+        # cycles for cleaner to do everything queued for it,
+        # and where it will be and which way it will face by then
+        x, y, orientation = self.__states[agent_id]
+        total: int = 0
+        for _, to_x, to_y in self.__queues[agent_id]:
+            total += self.__oracle.cycles(x, y, orientation, to_x, to_y) + CLEAN_CYCLES
+            orientation = self.__oracle.arrival(x, y, orientation, to_x, to_y)
+            x, y = to_x, to_y
+        return total, x, y, orientation
+
+    def __cheapest(self, agent_id: str, k: int) -> list[tuple[int, Task]]:
+        # k cheapest unassigned tasks for cleaner from the end of its queue
+        _, x, y, orientation = self.__projected(agent_id)
+
+        def cost(to_x: int, to_y: int) -> int:
+            return self.__oracle.cycles(x, y, orientation, to_x, to_y)
+
+        found: list[tuple[int, Task]] = []
+        for colour in self.__colours[agent_id]:
+            if colour in self.__unassigned:
+                for to_x, to_y in self.__unassigned[colour].nearest(x, y, k, cost=cost):
+                    found.append((cost(to_x, to_y), (colour, to_x, to_y)))
+        found.sort()
+        return found[:k]
+
+    def __give(self, agent_id: str, task: Task, assigned: dict[str, list[Task]]) -> None:
+        colour, x, y = task
+        self.__unassigned[colour].remove(x, y)
+        self.__queues[agent_id].append(task)
+        assigned.setdefault(agent_id, []).append(task)
+
+    def __assign_idle(self, assigned: dict[str, list[Task]]) -> None:
+        # idle cleaners take their first tasks together, hungarian over the few
+        # cheapest candidates of each so no two race for the same dirt
+        idle: list[str] = [a for a, queue in self.__queues.items() if not queue]
+        candidates: list[Task] = []
+        for agent_id in idle:
+            for _, task in self.__cheapest(agent_id, len(idle)):
+                if task not in candidates:
+                    candidates.append(task)
+        if not idle or not candidates:
+            return
+
+        # cleaners that cannot take a candidate cost more than any real leg
+        unreachable: int = 4 * self.__oracle.get_n() + 4
+        cost: list[list[int]] = []
+        for agent_id in idle:
+            x, y, orientation = self.__states[agent_id]
+            cost.append(
+                [
+                    self.__oracle.cycles(x, y, orientation, to_x, to_y)
+                    if colour in self.__colours[agent_id]
+                    else unreachable
+                    for colour, to_x, to_y in candidates
+                ]
+            )
+        # more cleaners than candidates, leave the most expensive ones idle
+        if len(idle) > len(candidates):
+            order: list[int] = sorted(range(len(idle)), key=lambda i: min(cost[i]))
+            keep: list[int] = sorted(order[: len(candidates)])
+            idle = [idle[i] for i in keep]
+            cost = [cost[i] for i in keep]
+
+        for agent_id, column, row in zip(idle, hungarian(cost), cost):
+            if row[column] < unreachable:
+                self.__give(agent_id, candidates[column], assigned)
+
+    def __fill_queues(self, assigned: dict[str, list[Task]]) -> None:
+        # list scheduling for makespan, the cleaner that would finish first
+        # takes its cheapest next task until every queue is full
+        while True:
+            open_agents: list[tuple[int, str]] = [
+                (self.__projected(a)[0], a)
+                for a, queue in self.__queues.items()
+                if len(queue) < self.__lookahead
+            ]
+            open_agents.sort()
+            for _, agent_id in open_agents:
+                cheapest: list[tuple[int, Task]] = self.__cheapest(agent_id, 1)
+                if cheapest:
+                    self.__give(agent_id, cheapest[0][1], assigned)
+                    break
+            else:
+                return
+
+    def __steal(self, assigned: dict[str, list[Task]], revoked: dict[str, list[Task]]) -> None:
+        # a cleaner with nothing left to do takes the last queued task of the
+        # cleaner finishing latest, if that task is not already under way
+        for agent_id, queue in self.__queues.items():
+            if queue:
+                continue
+            donors: list[tuple[int, str]] = sorted(
+                (
+                    (self.__projected(d)[0], d)
+                    for d, q in self.__queues.items()
+                    if len(q) > 1 and q[-1][0] in self.__colours[agent_id]
+                ),
+                reverse=True,
+            )
+            if not donors:
+                continue
+            donor: str = donors[0][1]
+            task: Task = self.__queues[donor].pop()
+            # donor only needs telling if it was sent the task before this round
+            if task in assigned.get(donor, []):
+                assigned[donor].remove(task)
+            else:
+                revoked.setdefault(donor, []).append(task)
+            queue.append(task)
+            assigned.setdefault(agent_id, []).append(task)
+
+    def rebalance(self) -> tuple[dict[str, list[Task]], dict[str, list[Task]]]:
+        # top up every cleaner's queue, returning tasks newly given to each cleaner
+        # and tasks taken back from each cleaner
+        assigned: dict[str, list[Task]] = {}
+        revoked: dict[str, list[Task]] = {}
+        self.__assign_idle(assigned)
+        self.__fill_queues(assigned)
+        self.__steal(assigned, revoked)
+        return assigned, revoked
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# Runs the minds over many seeded random grids on the headless simulator, fanned
+# out over a process pool, and sums up cycles to map, cycles to clean, messages
+# sent, agents found getting nowhere and runs that got stuck per part, grid size,
+# number of cleaners per colour and the way white explores.
+#
+# A scenario is fully determined by its part, n, dirt density, seed, cleaners per
+# colour, exploration and whether dirt is handed out as it is found, so any run can
+# be reproduced on its own, traced cycle by cycle or written to a file:
+#   python batch.py --sizes 5 10 20 --seeds 100
+#   python batch.py --parts part3 --sizes 50 --cleaners 1 5 10
+#   python batch.py --parts part2 part3 --exploration zigzag cooperative --pipelined
+#   python batch.py --regressions
+#   python batch.py --reproduce part2 20 0.3 17
+#   python batch.py --reproduce part3 50 0.3 17 --cleaners 10
+#   python batch.py --reproduce part3 50 0.3 17 --exploration cooperative --pipelined
+#   python batch.py --reproduce part2 20 0.3 17 --trace event --trace-file run.log
+# and, with --profile, timed call by call, untraced:
+#   python batch.py --reproduce part2 20 0.3 17 --profile
+
+import argparse
+import importlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Protocol, cast
+
+from vacuumworld.common.vwcolour import VWColour
+from vacuumworld.common.vworientation import VWOrientation
+
+import codec
+import tracelog
+from distanceoracle import ORIENTATIONS
+from explorer import Exploration
+from profiler import Profiler
+from progress import Stall
+from simulator import Simulator
+from tracelog import Level
+
+
+PARTS: list[str] = ["part1", "part2", "part3"]
+# Give up on a run after this many cycles, it counts as stuck
+MAX_CYCLES: int = 5000
+# Stage white is at once the grid is mapped
+MAPPED_STAGE: int = 2
+
+# A scenario: part, n, dirt density, seed, cleaners of each colour, how white
+# explores and whether it hands out dirt as it finds it, neither of which part 1,
+# with no cleaners, has a choice of but to explore alone
+Scenario = tuple[str, int, float, int, int, Exploration, bool]
+# Scenarios that once went round in circles until the cycle limit, run again with
+# --regressions and by the benchmark suite
+REGRESSIONS: list[Scenario] = [
+    # white and orange trading targets back and forth
+    ("part3", 3, 0.3, 7, 1, Exploration.zigzag, False),
+    ("part2", 3, 0.9, 3, 1, Exploration.zigzag, False),
+]
+# Result of a run: cycles to map and cycles to clean, -1 if that never happened,
+# messages delivered, times an agent was found getting nowhere and whether the
+# run got stuck
+Outcome = tuple[int, int, int, int, bool]
+
+
+def scenarios(
+    parts: list[str],
+    sizes: list[int],
+    densities: list[float],
+    seeds: int,
+    fleets: list[int],
+    explorations: list[Exploration],
+    pipelined: bool,
+) -> list[Scenario]:
+    return list(
+        product(
+            parts, sizes, densities, range(seeds), fleets, explorations, [pipelined]
+        )
+    )
+
+
+def actor_id(colour: VWColour, index: int) -> str:
+    # the first actor of a colour goes by the colour, the rest by it and a number
+    return colour.value if index == 0 else f"{colour.value}{index}"
+
+
+def build(scenario: Scenario) -> Simulator:
+    # a grid drawn from the seed alone, so the parts and fleets are run on the same
+    # grids, white alone in part 1, with as many green and orange cleaners as asked
+    # for otherwise
+    part, n, density, seed, cleaners, exploration, pipelined = scenario
+    rng: random.Random = random.Random(seed)
+    cells: list[tuple[int, int]] = [(x, y) for x in range(n) for y in range(n)]
+    dirt: dict[tuple[int, int], VWColour] = {}
+    for cell in cells:
+        if rng.random() < density:
+            dirt[cell] = rng.choice([VWColour.orange, VWColour.green])
+
+    module = importlib.import_module(part)
+    actors: list[tuple[VWColour, int]] = [(VWColour.white, 0)]
+    if part != "part1":
+        actors += [(VWColour.green, i) for i in range(cleaners)]
+        actors += [(VWColour.orange, i) for i in range(cleaners)]
+    simulator: Simulator = Simulator(n, dirt)
+    for (colour, index), (x, y) in zip(actors, rng.sample(cells, len(actors))):
+        orientation: VWOrientation = rng.choice(ORIENTATIONS)
+        if colour != VWColour.white:
+            mind = module.CleanerMind()
+        elif part == "part1":
+            mind = module.ZigZagMind(exploration)
+        else:
+            mind = module.ZigZagMind(exploration, pipelined)
+        simulator.add_actor(actor_id(colour, index), colour, mind, x, y, orientation)
+    return simulator
+
+
+class Monitored(Protocol):
+    # What the minds of every part offer beyond the surrogate, for telling how a
+    # run is going, stall counts in parts 2 and 3 only
+    def get_stage(self) -> int: ...
+
+    def get_stall_counts(self) -> dict[str, int]: ...
+
+
+def monitored(simulator: Simulator, agent_id: str) -> Monitored:
+    # the simulator hands back every mind as a surrogate, these ones are from build
+    return cast(Monitored, simulator.get_mind(agent_id))
+
+
+def _stalls(simulator: Simulator, scenario: Scenario) -> int:
+    # stalls found by every mind, there are no stalls to find in part 1
+    part, _, _, _, cleaners, _, _ = scenario
+    if part == "part1":
+        return 0
+    ids: list[str] = [VWColour.white.value] + [
+        actor_id(colour, index)
+        for colour in (VWColour.green, VWColour.orange)
+        for index in range(cleaners)
+    ]
+    return sum(
+        monitored(simulator, agent_id).get_stall_counts().get(stall.name, 0)
+        for agent_id in ids
+        for stall in (Stall.repeating, Stall.stuck)
+    )
+
+
+def run_scenario(
+    scenario: Scenario, max_cycles: int = MAX_CYCLES, quiet: bool = True
+) -> Outcome:
+    # part 1 is done once the grid is mapped, the others once it is clean too,
+    # tracing is left as configured unless quiet
+    if quiet:
+        tracelog.configure(Level.off)
+    simulator: Simulator = build(scenario)
+    mapped: int = -1
+
+    def is_done(simulator: Simulator) -> bool:
+        nonlocal mapped
+        white: Monitored = monitored(simulator, VWColour.white.value)
+        if mapped == -1 and white.get_stage() >= MAPPED_STAGE:
+            mapped = simulator.get_cycle()
+        return mapped != -1 and (scenario[0] == "part1" or simulator.is_clean())
+
+    done: bool = simulator.run(is_done, max_cycles, quiet)
+    # white does not clean in part 1
+    cleaned: int = simulator.get_cycle() if done and scenario[0] != "part1" else -1
+    return (
+        mapped,
+        cleaned,
+        simulator.get_messages(),
+        _stalls(simulator, scenario),
+        not done,
+    )
+
+
+def run_batch(
+    batch: list[Scenario], max_cycles: int = MAX_CYCLES, processes: int | None = None
+) -> list[Outcome]:
+    # outcomes in the order of the scenarios, whichever process ran them,
+    # handed out a few chunks per process to keep the pipes quiet
+    workers: int = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        return list(
+            pool.map(
+                run_scenario,
+                batch,
+                [max_cycles] * len(batch),
+                chunksize=max(1, len(batch) // (4 * workers)),
+            )
+        )
+
+
+def _mean(values: list[int]) -> str:
+    return f"{sum(values) / len(values):.1f}" if values else "-"
+
+
+def report(batch: list[Scenario], outcomes: list[Outcome]) -> None:
+    # means over the runs that got that far, by part, n, cleaners per colour and
+    # exploration, then the stuck runs
+    groups: dict[tuple[str, int, int, Exploration, bool], list[Outcome]] = {}
+    for (part, n, _, _, cleaners, exploration, pipelined), outcome in zip(
+        batch, outcomes
+    ):
+        groups.setdefault((part, n, cleaners, exploration, pipelined), []).append(
+            outcome
+        )
+
+    print(
+        f"{'part':>6} {'n':>4} {'cleaners':>8} {'exploration':>11} {'pipelined':>9}"
+        f" {'runs':>5} {'to map':>8} {'to clean':>9} {'messages':>9} {'stalls':>7}"
+        f" {'stuck':>6}"
+    )
+    for (part, n, cleaners, exploration, pipelined), group in groups.items():
+        print(
+            f"{part:>6} {n:>4} {cleaners:>8} {exploration.value:>11}"
+            f" {'yes' if pipelined else 'no':>9} {len(group):>5}"
+            f" {_mean([mapped for mapped, _, _, _, _ in group if mapped != -1]):>8}"
+            f" {_mean([cleaned for _, cleaned, _, _, _ in group if cleaned != -1]):>9}"
+            f" {_mean([messages for _, _, messages, _, _ in group]):>9}"
+            f" {sum(stalls for _, _, _, stalls, _ in group):>7}"
+            f" {sum(stuck for _, _, _, _, stuck in group):>6}"
+        )
+
+    for scenario, (_, _, _, _, stuck) in zip(batch, outcomes):
+        part, n, density, seed, cleaners, exploration, pipelined = scenario
+        if stuck:
+            print(
+                f"stuck: python batch.py --reproduce {part} {n} {density} {seed}"
+                f" --cleaners {cleaners} --exploration {exploration.value}"
+                f"{' --pipelined' if pipelined else ''}"
+            )
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--parts", nargs="+", default=PARTS, choices=PARTS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[5, 10, 20])
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.1, 0.3])
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument(
+        "--cleaners",
+        nargs="+",
+        type=int,
+        default=[1],
+        help="cleaners of each colour, the first number only when reproducing",
+    )
+    parser.add_argument(
+        "--exploration",
+        nargs="+",
+        type=Exploration,
+        default=[Exploration.zigzag],
+        choices=list(Exploration),
+        metavar="{" + ",".join(exploration.value for exploration in Exploration) + "}",
+        help="how white explores, the first one only when reproducing",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="hand out dirt as it is found instead of once the grid is mapped",
+    )
+    parser.add_argument(
+        "--regressions",
+        action="store_true",
+        help="run the scenarios that once got stuck instead",
+    )
+    parser.add_argument("--max-cycles", type=int, default=MAX_CYCLES)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument(
+        "--reproduce",
+        nargs=4,
+        metavar=("PART", "N", "DENSITY", "SEED"),
+        help="run one scenario in this process, showing what the minds print",
+    )
+    parser.add_argument(
+        "--trace",
+        default=Level.cycle.name,
+        choices=[level.name for level in Level],
+        help="highest level traced when reproducing",
+    )
+    parser.add_argument(
+        "--trace-file", help="write the trace to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time the minds' methods and message coding when reproducing",
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.reproduce:
+        part, n, density, seed = args.reproduce
+        scenario: Scenario = (
+            part,
+            int(n),
+            float(density),
+            int(seed),
+            args.cleaners[0],
+            args.exploration[0],
+            args.pipelined,
+        )
+        profiler: Profiler = Profiler()
+        if args.profile:
+            module = importlib.import_module(part)
+            profiler.wrap_class(module.ZigZagMind)
+            if part != "part1":
+                profiler.wrap_class(module.CleanerMind)
+                profiler.wrap_functions(codec, ["decode", "encode_batch"])
+        tracelog.configure(
+            Level[args.trace], echo=not args.trace_file, path=args.trace_file or ""
+        )
+        mapped, cleaned, messages, stalls, stuck = run_scenario(
+            scenario, args.max_cycles, quiet=args.profile
+        )
+        profiler.unwrap()
+        if args.profile:
+            print(profiler)
+        if args.trace_file:
+            tracelog.flush(args.trace_file)
+        print(
+            f"mapped {mapped} cleaned {cleaned} messages {messages} stalls {stalls}"
+            f"{' stuck' if stuck else ''}"
+        )
+        return
+
+    batch: list[Scenario] = scenarios(
+        args.parts,
+        args.sizes,
+        args.densities,
+        args.seeds,
+        args.cleaners,
+        args.exploration,
+        args.pipelined,
+    )
+    if args.regressions:
+        batch = list(REGRESSIONS)
+    report(batch, run_batch(batch, args.max_cycles, args.processes))
+
+
+if __name__ == "__main__":
+    main()
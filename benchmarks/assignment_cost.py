@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# Cycles a lone cleaner needs to clear a grid when it always picks its next dirt
+# by euclidean distance, against picking it by the orientation-aware distance oracle.
+#
+# The cleaner walks each leg with the path planner on an empty grid and spends one
+# cycle cleaning, so the cycle counts are what the agent would actually take.
+#
+# Run from the repository root:
+#   python -m benchmarks.assignment_cost
+
+import random
+import time
+from typing import Callable
+
+from vacuumworld.common.vworientation import VWOrientation
+
+from distanceoracle import ORIENTATIONS, DistanceOracle, get_oracle
+from pathplanner import STEPS, PathPlanner
+from spatialindex import BucketGrid
+
+
+SIZES: list[int] = [10, 20, 35, 50]
+DIRT_DENSITY: float = 0.3
+SEEDS: int = 5
+
+
+def _clear(
+    n: int,
+    dirt: list[tuple[int, int]],
+    start: tuple[int, int],
+    facing: VWOrientation,
+    oracle: DistanceOracle | None,
+) -> tuple[int, float]:
+    # cycles to clean all dirt, and seconds spent picking the next dirt
+    index: BucketGrid = BucketGrid(n)
+    for x, y in dirt:
+        index.insert(x, y)
+    planner: PathPlanner = PathPlanner(n)
+
+    cycles: int = 0
+    picking: float = 0.0
+    position: tuple[int, int] = start
+    while len(index):
+        cost: Callable[[int, int], int] | None = None
+        if oracle is not None:
+            cost = lambda x, y: oracle.cycles(*position, facing, x, y)
+        started: float = time.perf_counter()
+        goal: tuple[int, int] = index.nearest(*position, cost=cost)[0]
+        picking += time.perf_counter() - started
+
+        # walk there one action per cycle, then clean
+        while position != goal:
+            step: VWOrientation | None = planner.next_step(position, facing, goal)
+            if step is None:
+                break
+            if step == facing:
+                position = (position[0] + STEPS[step][0], position[1] + STEPS[step][1])
+            else:
+                facing = facing.get_left() if facing.get_left() == step else facing.get_right()
+            cycles += 1
+        index.remove(*goal)
+        cycles += 1
+
+    return cycles, picking
+
+
+def main() -> None:
+    print(
+        f"{'n':>4} {'dirt':>6} {'euclid cycles':>14} {'oracle cycles':>14}"
+        f" {'saved':>7} {'euclid pick us':>15} {'oracle pick us':>15}"
+    )
+    for n in SIZES:
+        totals: list[float] = [0, 0, 0, 0, 0]
+        # building the table is paid once per grid size
+        oracle: DistanceOracle = get_oracle(n)
+        for seed in range(SEEDS):
+            rng: random.Random = random.Random(seed * 1000 + n)
+            dirt: list[tuple[int, int]] = [
+                (x, y) for x in range(n) for y in range(n) if rng.random() < DIRT_DENSITY
+            ]
+            start: tuple[int, int] = (rng.randrange(n), rng.randrange(n))
+            facing: VWOrientation = rng.choice(ORIENTATIONS)
+
+            euclid_cycles, euclid_pick = _clear(n, dirt, start, facing, None)
+            oracle_cycles, oracle_pick = _clear(n, dirt, start, facing, oracle)
+            totals[0] += len(dirt)
+            totals[1] += euclid_cycles
+            totals[2] += oracle_cycles
+            totals[3] += euclid_pick / len(dirt)
+            totals[4] += oracle_pick / len(dirt)
+
+        print(
+            f"{n:>4} {int(totals[0]):>6} {int(totals[1]):>14} {int(totals[2]):>14}"
+            f" {(totals[1] - totals[2]) / totals[1]:>7.1%}"
+            f" {totals[3] / SEEDS * 1e6:>15.1f} {totals[4] / SEEDS * 1e6:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# Cycles until the last dirt is cleaned, with several cleaners per colour and dirt
+# packed into one side of the grid: the previous one-dirt-at-a-time nearest pick
+# against the assignment engine.
+#
+# Cleaners move at the oracle's cycle costs and do not collide. A report takes a
+# cycle to reach white and the answer another to come back, so a cleaner given one
+# dirt at a time waits 2 cycles after each clean, while one with a queue does not.
+#
+# Run from the repository root:
+#   python -m benchmarks.assignment_makespan
+
+import heapq
+import random
+
+from vacuumworld.common.vworientation import VWOrientation
+
+from assignment import CLEAN_CYCLES, AssignmentEngine, Task
+from distanceoracle import ORIENTATIONS, DistanceOracle, get_oracle
+from spatialindex import BucketGrid
+
+
+SIZES: list[int] = [20, 50]
+CLEANERS_PER_COLOUR: list[int] = [1, 3]
+SEEDS: int = 5
+# Round trip of a report and the next instruction
+ROUND_TRIP: int = 2
+
+
+def _uneven_dirt(n: int, rng: random.Random) -> dict[str, list[tuple[int, int]]]:
+    # dense in the west third, mostly orange
+    dirt: dict[str, list[tuple[int, int]]] = {"orange": [], "green": []}
+    for x in range(n):
+        for y in range(n):
+            if rng.random() < (0.6 if x < n // 3 else 0.1):
+                dirt["orange" if rng.random() < 0.8 else "green"].append((x, y))
+    return dirt
+
+
+def _greedy(
+    oracle: DistanceOracle,
+    dirt: dict[str, list[tuple[int, int]]],
+    cleaners: list[tuple[str, int, int, VWOrientation]],
+) -> int:
+    # each idle cleaner is sent the dirt of its colour it reaches soonest
+    pools: dict[str, BucketGrid] = {}
+    for colour, coords in dirt.items():
+        pools[colour] = BucketGrid(oracle.get_n())
+        for x, y in coords:
+            pools[colour].insert(x, y)
+
+    finish: int = 0
+    # cleaners by the cycle they next become idle
+    idle: list[tuple[int, int, str, int, int, VWOrientation]] = [
+        (0, i, colour, x, y, o) for i, (colour, x, y, o) in enumerate(cleaners)
+    ]
+    heapq.heapify(idle)
+    while idle:
+        now, i, colour, x, y, o = heapq.heappop(idle)
+        nearest: list[tuple[int, int]] = pools[colour].nearest(
+            x, y, cost=lambda to_x, to_y: oracle.cycles(x, y, o, to_x, to_y)
+        )
+        if not nearest:
+            continue
+        to_x, to_y = nearest[0]
+        pools[colour].remove(to_x, to_y)
+        done: int = now + oracle.cycles(x, y, o, to_x, to_y) + CLEAN_CYCLES
+        heapq.heappush(
+            idle,
+            (done + ROUND_TRIP, i, colour, to_x, to_y, oracle.arrival(x, y, o, to_x, to_y)),
+        )
+        finish = max(finish, done)
+    return finish
+
+
+def _engine(
+    oracle: DistanceOracle,
+    dirt: dict[str, list[tuple[int, int]]],
+    cleaners: list[tuple[str, int, int, VWOrientation]],
+) -> int:
+    # cleaners work through their queues, engine rebalances on every report
+    engine: AssignmentEngine = AssignmentEngine(oracle)
+    for colour, coords in dirt.items():
+        engine.add_tasks(colour, coords)
+    states: dict[str, tuple[int, int, int, VWOrientation]] = {}
+    for i, (colour, x, y, o) in enumerate(cleaners):
+        engine.set_agent(str(i), (colour,), x, y, o)
+        states[str(i)] = (0, x, y, o)
+    engine.rebalance()
+
+    finish: int = 0
+    while engine.has_tasks():
+        # the cleaner that finishes its next dirt soonest reports it
+        reports: list[tuple[int, str, Task]] = []
+        for agent_id, (now, x, y, o) in states.items():
+            queue: list[Task] = engine.get_queue(agent_id)
+            if queue:
+                _, to_x, to_y = queue[0]
+                reports.append(
+                    (now + oracle.cycles(x, y, o, to_x, to_y) + CLEAN_CYCLES, agent_id, queue[0])
+                )
+        if not reports:
+            break
+        done, agent_id, (colour, to_x, to_y) = min(reports)
+        _, x, y, o = states[agent_id]
+        arrival: VWOrientation = oracle.arrival(x, y, o, to_x, to_y)
+        states[agent_id] = (done, to_x, to_y, arrival)
+        engine.set_agent(agent_id, (colour,), to_x, to_y, arrival)
+        engine.complete(colour, to_x, to_y)
+        engine.rebalance()
+        finish = max(finish, done)
+    return finish
+
+
+def main() -> None:
+    print(f"{'n':>4} {'per colour':>11} {'dirt':>6} {'greedy':>8} {'engine':>8} {'saved':>7}")
+    for n in SIZES:
+        oracle: DistanceOracle = get_oracle(n)
+        for per_colour in CLEANERS_PER_COLOUR:
+            totals: list[int] = [0, 0, 0]
+            for seed in range(SEEDS):
+                rng: random.Random = random.Random(seed * 1000 + n)
+                dirt: dict[str, list[tuple[int, int]]] = _uneven_dirt(n, rng)
+                cleaners: list[tuple[str, int, int, VWOrientation]] = [
+                    (colour, rng.randrange(n), rng.randrange(n), rng.choice(ORIENTATIONS))
+                    for colour in ("orange", "green")
+                    for _ in range(per_colour)
+                ]
+                totals[0] += sum(len(coords) for coords in dirt.values())
+                totals[1] += _greedy(oracle, dirt, cleaners)
+                totals[2] += _engine(oracle, dirt, cleaners)
+            print(
+                f"{n:>4} {per_colour:>11} {totals[0]:>6} {totals[1]:>8} {totals[2]:>8}"
+                f" {(totals[1] - totals[2]) / totals[1]:>7.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# Cycles until white has seen every cell of an empty grid, exploring by the fixed
+# zigzag against exploring by frontier viewpoints, from each corner and the centre
+# of the grid facing each way.
+#
+# White runs alone, as in part 1, on the headless simulator.
+#
+# Run from the repository root:
+#   python -m benchmarks.exploration
+
+from vacuumworld.common.vwcolour import VWColour
+from vacuumworld.common.vwcoordinates import VWCoord
+from vacuumworld.common.vworientation import VWOrientation
+
+from distanceoracle import ORIENTATIONS
+from explorer import Exploration
+from part1 import ZigZagMind
+from simulator import Simulator
+
+
+SIZES: list[int] = [8, 16, 32]
+# Give up on a run after this many cycles
+MAX_CYCLES: int = 5000
+
+
+def _explore(
+    n: int, x: int, y: int, orientation: VWOrientation, exploration: Exploration
+) -> int:
+    # cycles until every cell has been in view, MAX_CYCLES if that never happens
+    simulator: Simulator = Simulator(n, {})
+    simulator.add_actor(
+        "white", VWColour.white, ZigZagMind(exploration), x, y, orientation
+    )
+    seen: set[tuple[int, int]] = set()
+
+    def is_seen(simulator: Simulator) -> bool:
+        # counting the observation white is about to perceive
+        for location in simulator.get_observation("white").get_locations_in_order():
+            coord: VWCoord = location.or_else_raise().get_coord()
+            seen.add((coord.get_x(), coord.get_y()))
+        return len(seen) == n * n
+
+    if not simulator.run(is_seen, MAX_CYCLES - 1):
+        return MAX_CYCLES
+    return simulator.get_cycle() + 1
+
+
+def main() -> None:
+    print(f"{'n':>4} {'start':>12} {'zigzag':>8} {'frontier':>9} {'saved':>7}")
+    for n in SIZES:
+        starts: dict[str, tuple[int, int]] = {
+            "north west": (0, 0),
+            "north east": (n - 1, 0),
+            "south west": (0, n - 1),
+            "south east": (n - 1, n - 1),
+            "centre": (n // 2, n // 2),
+        }
+        for name, (x, y) in starts.items():
+            # mean over the four orientations
+            zigzag: float = sum(
+                _explore(n, x, y, o, Exploration.zigzag) for o in ORIENTATIONS
+            ) / len(ORIENTATIONS)
+            frontier: float = sum(
+                _explore(n, x, y, o, Exploration.frontier) for o in ORIENTATIONS
+            ) / len(ORIENTATIONS)
+            print(
+                f"{n:>4} {name:>12} {zigzag:>8.1f} {frontier:>9.1f}"
+                f" {(zigzag - frontier) / zigzag:>7.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# Memory and dirt extraction cost of the GridModel against the previous
+# list[list[int]] map, on fully explored grids with 30% dirt.
+#
+# Run from the repository root:
+#   python -m benchmarks.grid_model
+
+import random
+import sys
+import time
+
+from gridmodel import DIRT_COLOURS, EMPTY, GridModel
+
+
+SIZES: list[int] = [50, 100, 200, 500]
+DIRT_DENSITY: float = 0.3
+
+
+def _list_map_bytes(grid: list[list[int]]) -> int:
+    # list objects only, small ints are shared by the interpreter
+    return sys.getsizeof(grid) + sum(sys.getsizeof(column) for column in grid)
+
+
+def _list_map_dirt(grid: list[list[int]], n: int) -> dict[str, list[tuple[int, int]]]:
+    # the previous __prepare_dirt_dict scan, minus building strings
+    dirt_loc: dict[str, list[tuple[int, int]]] = {"orange": [], "green": []}
+    for x in range(n):
+        for y in range(n):
+            if grid[x][y] == 1:
+                dirt_loc["orange"].append((x, y))
+            if grid[x][y] == 2:
+                dirt_loc["green"].append((x, y))
+    return dirt_loc
+
+
+def bench(n: int) -> tuple[int, int, float, float]:
+    rng: random.Random = random.Random(n)
+    values: list[int] = [
+        rng.choice(list(DIRT_COLOURS.values())) if rng.random() < DIRT_DENSITY else EMPTY
+        for _ in range(n * n)
+    ]
+
+    grid: list[list[int]] = [values[x * n : (x + 1) * n] for x in range(n)]
+    model: GridModel = GridModel(n)
+    model.update(
+        [i // n for i in range(n * n)], [i % n for i in range(n * n)], values
+    )
+
+    start: float = time.perf_counter()
+    _list_map_dirt(grid, n)
+    list_time: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for colour in DIRT_COLOURS:
+        model.get_dirt_coords(colour)
+    model_time: float = time.perf_counter() - start
+
+    # cells plus one mask per colour, one byte each
+    model_bytes: int = n * n * (1 + len(DIRT_COLOURS))
+
+    return _list_map_bytes(grid), model_bytes, list_time, model_time
+
+
+def main() -> None:
+    print(
+        f"{'n':>5} {'list KiB':>10} {'model KiB':>10}"
+        f" {'list dirt ms':>13} {'model dirt ms':>14}"
+    )
+    for n in SIZES:
+        list_bytes, model_bytes, list_time, model_time = bench(n)
+        print(
+            f"{n:>5} {list_bytes / 1024:>10.1f} {model_bytes / 1024:>10.1f}"
+            f" {list_time * 1e3:>13.2f} {model_time * 1e3:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
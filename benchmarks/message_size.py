@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# Payload size and decode time of the part2 full-dirt announcement: the previous
+# json layout against the binary codec, on grids with 30% dirt.
+#
+# Decode time covers getting from payload to x y tuples, so the json column also
+# splits each "x,y" string as the cleaners did.
+#
+# Run from the repository root:
+#   python -m benchmarks.message_size
+
+import json
+import random
+import time
+
+from pystarworldsturbo.common.message import BccMessage
+
+import codec
+
+
+SIZES: list[int] = [10, 25, 50, 100]
+DIRT_DENSITY: float = 0.3
+DECODES: int = 200
+
+
+def main() -> None:
+    print(
+        f"{'n':>5} {'json bytes':>11} {'codec bytes':>12}"
+        f" {'json decode us':>15} {'codec decode us':>16}"
+    )
+    for n in SIZES:
+        rng: random.Random = random.Random(n)
+        dirt: dict[str, list[tuple[int, int]]] = {"orange": [], "green": []}
+        for x in range(n):
+            for y in range(n):
+                if rng.random() < DIRT_DENSITY:
+                    dirt[rng.choice(["orange", "green"])].append((x, y))
+
+        # the previous announcement layout
+        legacy: str = json.dumps(
+            {
+                "command": ["clean"],
+                "orange": [f"{x},{y}" for x, y in dirt["orange"]],
+                "green": [f"{x},{y}" for x, y in dirt["green"]],
+            }
+        )
+        # sizes are of the binary encoding, not the json debug fallback
+        payload: codec.Payload = codec.encode(codec.clean(dirt))
+        assert isinstance(payload, bytes)
+        message: BccMessage = BccMessage(payload, "white", "green")
+
+        start: float = time.perf_counter()
+        for _ in range(DECODES):
+            content: dict[str, list[str]] = json.loads(legacy)
+            for colour in ("orange", "green"):
+                [tuple(int(v) for v in coord.split(",")) for coord in content[colour]]
+        json_time: float = (time.perf_counter() - start) / DECODES
+
+        start = time.perf_counter()
+        for _ in range(DECODES):
+            codec.decode(message)
+        codec_time: float = (time.perf_counter() - start) / DECODES
+
+        print(
+            f"{n:>5} {len(legacy):>11} {len(payload):>12}"
+            f" {json_time * 1e6:>15.1f} {codec_time * 1e6:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Nearest dirt lookups with 10k dirt cells: the previous linear scan over
+# "x,y" strings against the BucketGrid spatial index.
+#
+# Each assignment looks up the dirt nearest to the cleaner, moves the cleaner
+# there and removes that dirt, as the supervisor does when dirt is reported clean.
+#
+# Run from the repository root:
+#   python -m benchmarks.nearest_dirt
+
+import math
+import random
+import time
+
+from vacuumworld.common.vwcoordinates import VWCoord
+
+from spatialindex import BucketGrid
+
+
+N: int = 200
+DIRT_COUNT: int = 10_000
+ASSIGNMENTS: int = 1_000
+
+
+def _linear_nearest(dirt_loc: list[str], agent_coord: VWCoord) -> VWCoord:
+    # the previous __get_nearest_coord loop
+    nearest_coord: VWCoord = VWCoord(-1, -1)
+    nearest_distance: float = math.inf
+    for dirt_coord in dirt_loc:
+        x, y = dirt_coord.split(",")
+        dirt_vwcoord: VWCoord = VWCoord(int(x), int(y))
+        delta_x: int = agent_coord.get_x() - dirt_vwcoord.get_x()
+        delta_y: int = agent_coord.get_y() - dirt_vwcoord.get_y()
+        dirt_distance: float = math.sqrt(delta_x**2 + delta_y**2)
+        if dirt_distance < nearest_distance:
+            nearest_distance = dirt_distance
+            nearest_coord = dirt_vwcoord
+    return nearest_coord
+
+
+def main() -> None:
+    rng: random.Random = random.Random(0)
+    dirt: list[tuple[int, int]] = sorted(
+        rng.sample([(x, y) for x in range(N) for y in range(N)], DIRT_COUNT)
+    )
+
+    dirt_loc: list[str] = [f"{x},{y}" for x, y in dirt]
+    agent: VWCoord = VWCoord(N // 2, N // 2)
+    start: float = time.perf_counter()
+    for _ in range(ASSIGNMENTS):
+        agent = _linear_nearest(dirt_loc, agent)
+        dirt_loc.remove(f"{agent.get_x()},{agent.get_y()}")
+    linear_time: float = time.perf_counter() - start
+    linear_path: VWCoord = agent
+
+    index: BucketGrid = BucketGrid(N)
+    for x, y in dirt:
+        index.insert(x, y)
+    x, y = N // 2, N // 2
+    start = time.perf_counter()
+    for _ in range(ASSIGNMENTS):
+        x, y = index.nearest(x, y)[0]
+        index.remove(x, y)
+    index_time: float = time.perf_counter() - start
+
+    # both must visit the same dirt in the same order
+    assert linear_path == VWCoord(x, y)
+
+    print(f"{DIRT_COUNT} dirt cells on {N}x{N}, {ASSIGNMENTS} assignments")
+    print(f"linear scan:  {linear_time / ASSIGNMENTS * 1e6:10.1f} us/assignment")
+    print(f"bucket grid:  {index_time / ASSIGNMENTS * 1e6:10.1f} us/assignment")
+
+
+if __name__ == "__main__":
+    main()
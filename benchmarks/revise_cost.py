@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# Per-cycle cost of ZigZagMind stage 1 map bookkeeping as grid size n grows.
+#
+# Each simulated cycle observes the 3x2 footprint ahead of an agent sweeping the
+# grid in 3-row bands (as the zigzag scan does), then asks whether the map is
+# fully explored. The legacy full-grid rescan is timed alongside for contrast.
+#
+# Run from the repository root:
+#   python -m benchmarks.revise_cost
+
+import time
+
+from vacuumworld.common.vwcoordinates import VWCoord
+
+from gridmodel import GridModel
+from part1 import ZigZagMind
+
+
+SIZES: list[int] = [10, 25, 50, 100, 200]
+
+
+class _Cell:
+    # minimal stand-in for VWLocation, only what __observe_cells reads
+    def __init__(self, x: int, y: int) -> None:
+        self.__coord: VWCoord = VWCoord(x, y)
+
+    def get_coord(self) -> VWCoord:
+        return self.__coord
+
+    def has_dirt(self) -> bool:
+        return False
+
+
+def _sweep(n: int) -> list[list[_Cell]]:
+    # build the 6 cells observed each cycle while sweeping 3-row bands west/east
+    cycles: list[list[_Cell]] = []
+    going_west: bool = True
+    for centre_y in range(n - 2, -2, -3):
+        rows: list[int] = [y for y in (centre_y - 1, centre_y, centre_y + 1) if 0 <= y < n]
+        xs: range = range(n - 1, -1, -1) if going_west else range(n)
+        for x in xs:
+            ahead: int = x - 1 if going_west else x + 1
+            cells: list[_Cell] = [_Cell(x, y) for y in rows]
+            if 0 <= ahead < n:
+                cells += [_Cell(ahead, y) for y in rows]
+            cycles.append(cells)
+        going_west = not going_west
+    return cycles
+
+
+def _full_rescan(grid: list[list[int]], n: int) -> bool:
+    # the previous __is_map_populated: walk all n x n cells
+    for x in range(n):
+        for y in range(n):
+            if grid[x][y] == -1:
+                return False
+    return True
+
+
+def _time_cycles(cycles: list[list[_Cell]], step) -> tuple[float, float]:
+    # return mean and worst per-cycle time of running step over every cycle
+    timings: list[float] = []
+    for cells in cycles:
+        start: float = time.perf_counter()
+        step(cells)
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings), max(timings)
+
+
+def bench(n: int) -> tuple[tuple[float, float], tuple[float, float]]:
+    mind: ZigZagMind = ZigZagMind()
+    mind._ZigZagMind__n = n  # type: ignore[attr-defined]
+    mind._ZigZagMind__map = GridModel(n)  # type: ignore[attr-defined]
+    observe = mind._ZigZagMind__observe_cells  # type: ignore[attr-defined]
+    is_populated = mind._ZigZagMind__is_map_populated  # type: ignore[attr-defined]
+    cycles: list[list[_Cell]] = _sweep(n)
+
+    def incremental_step(cells: list[_Cell]) -> None:
+        observe(cells)
+        is_populated()
+
+    incremental: tuple[float, float] = _time_cycles(cycles, incremental_step)
+    assert is_populated()
+
+    # replay the same sweep on a fresh grid using the full rescan check
+    grid: list[list[int]] = [[-1 for _ in range(n)] for _ in range(n)]
+
+    def rescan_step(cells: list[_Cell]) -> None:
+        for cell in cells:
+            grid[cell.get_coord().get_x()][cell.get_coord().get_y()] = 0
+        _full_rescan(grid, n)
+
+    rescan: tuple[float, float] = _time_cycles(cycles, rescan_step)
+
+    return incremental, rescan
+
+
+def main() -> None:
+    print(f"{'n':>5} {'incremental mean/worst us':>28} {'full rescan mean/worst us':>28}")
+    for n in SIZES:
+        (inc_mean, inc_worst), (scan_mean, scan_worst) = bench(n)
+        print(
+            f"{n:>5} {inc_mean * 1e6:>14.2f} {inc_worst * 1e6:>13.2f}"
+            f" {scan_mean * 1e6:>14.2f} {scan_worst * 1e6:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# Cycles to completion, messages, message bytes and CPU time per revise and decide,
+# white's and the cleaners' apart, for part 1 exploring, part 2 white helping clean
+# and part 3 supervised cleaning, on seeded grids from the batch runner, checked
+# against a stored baseline. Part 3 is also measured with fleets of several cleaners
+# of each colour on one grid size, to show cleaning speeding up with the fleet.
+# Parts 2 and 3 are also measured on one grid size with white handing out dirt as
+# it finds it, exploring cooperatively, and both, and the part 3 fleets with both,
+# so the ways of exploring can be compared run for run. The scenarios that once
+# went round in circles until the cycle limit are run again one by one, with the
+# batch runner's cycle limit.
+#
+# A part 1 run is complete once the grid is mapped, the others once it is clean.
+# Cycles and messages are deterministic, so any change to them is a change in
+# behaviour, CPU time depends on the machine and gets a looser tolerance.
+# Runs still not complete at the cycle limit are counted as stuck, apart from the
+# cycles they ran for. Exits with status 1 if any run got stuck, or any metric is
+# worse than the baseline beyond tolerance.
+#
+# Run from the repository root:
+#   python -m benchmarks.suite
+#   python -m benchmarks.suite --update   (to store a new baseline, for what is run)
+#   python -m benchmarks.suite --parts part3 --sizes 50 --fleets 2 5 10
+#   python -m benchmarks.suite --parts part3 --sizes 20 --fleets --mode-size 20
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Iterable
+
+from vacuumworld.common.vwcolour import VWColour
+from vacuumworld.model.actions.vwactions import VWAction
+from vacuumworld.model.actor.mind.surrogate.vwactor_mind_surrogate import (
+    VWActorMindSurrogate,
+)
+
+import tracelog
+from batch import (
+    MAPPED_STAGE,
+    MAX_CYCLES,
+    PARTS,
+    REGRESSIONS,
+    Monitored,
+    Scenario,
+    actor_id,
+    build,
+    monitored,
+)
+from explorer import Exploration
+from simulator import Simulator
+from tracelog import Level
+
+
+SIZES: list[int] = [5, 10, 25, 50, 100]
+SEEDS: int = 2
+DENSITY: float = 0.1
+# Give up on a run after this many cycles per cell
+CYCLES_PER_CELL: int = 4
+# Cleaners of each colour in the part 3 fleets, and the grid size they clean
+FLEETS: list[int] = [5, 10]
+FLEET_N: int = 50
+# Ways of exploring measured besides the two-phase zigzag, as exploration and
+# whether dirt is handed out as it is found, and the grid size they are measured on,
+# the fleets are measured with the last of them too
+MODES: list[tuple[Exploration, bool]] = [
+    (Exploration.zigzag, True),
+    (Exploration.cooperative, False),
+    (Exploration.cooperative, True),
+]
+MODE_N: int = 25
+BASELINE: str = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Minds timed apart, white and every cleaner together
+ROLES: list[str] = ["white", "cleaner"]
+# Metrics measured, the CPU time ones per role in microseconds per call, part 1 has
+# no cleaner ones
+TIME_METRICS: list[str] = [
+    f"{role}_{call}_us" for role in ROLES for call in ("revise", "decide")
+]
+METRICS: list[str] = ["cycles", "messages", "message_bytes"] + TIME_METRICS
+# Runs not complete by the cycle limit, a count rather than a mean over the seeds,
+# any at all is a regression
+STUCK: str = "stuck"
+
+# Metric name to value, for one part and n
+Results = dict[str, float]
+
+
+class _Timer:
+    def __init__(self) -> None:
+        # CPU time spent in revise and decide, in nanoseconds, and calls made
+        self.__revise_ns: int = 0
+        self.__decide_ns: int = 0
+        self.__calls: int = 0
+
+    def time(self, mind: VWActorMindSurrogate) -> None:
+        # times the mind's revise and decide from now on, decide is consumed
+        # here in case it hands back a generator
+        revise: Callable[[], None] = mind.revise
+        decide: Callable[[], Iterable[VWAction]] = mind.decide
+
+        def timed_revise() -> None:
+            start: int = time.process_time_ns()
+            revise()
+            self.__revise_ns += time.process_time_ns() - start
+            self.__calls += 1
+
+        def timed_decide() -> list[VWAction]:
+            start: int = time.process_time_ns()
+            actions: list[VWAction] = list(decide())
+            self.__decide_ns += time.process_time_ns() - start
+            return actions
+
+        # set on the instance, which shadows the class's methods
+        setattr(mind, "revise", timed_revise)
+        setattr(mind, "decide", timed_decide)
+
+    def get_calls(self) -> int:
+        return self.__calls
+
+    def get_revise_us(self) -> float:
+        return self.__revise_ns / max(self.__calls, 1) / 1000
+
+    def get_decide_us(self) -> float:
+        return self.__decide_ns / max(self.__calls, 1) / 1000
+
+
+def _measure(scenario: Scenario, max_cycles: int) -> Results:
+    part, _, _, _, cleaners, _, _ = scenario
+    simulator: Simulator = build(scenario)
+    timers: dict[str, _Timer] = {role: _Timer() for role in ROLES}
+    timers["white"].time(simulator.get_mind(VWColour.white.value))
+    if part != "part1":
+        for colour in (VWColour.green, VWColour.orange):
+            for index in range(cleaners):
+                timers["cleaner"].time(simulator.get_mind(actor_id(colour, index)))
+
+    def is_complete(simulator: Simulator) -> bool:
+        white: Monitored = monitored(simulator, VWColour.white.value)
+        return white.get_stage() >= MAPPED_STAGE and (
+            part == "part1" or simulator.is_clean()
+        )
+
+    done: bool = simulator.run(is_complete, max_cycles)
+    results: Results = {
+        STUCK: 0 if done else 1,
+        "cycles": simulator.get_cycle(),
+        "messages": simulator.get_messages(),
+        "message_bytes": simulator.get_message_bytes(),
+    }
+    for role, timer in timers.items():
+        if timer.get_calls():
+            results[f"{role}_revise_us"] = timer.get_revise_us()
+            results[f"{role}_decide_us"] = timer.get_decide_us()
+    return results
+
+
+def measure(
+    parts: list[str],
+    sizes: list[int],
+    seeds: int,
+    cleaners: int = 1,
+    exploration: Exploration = Exploration.zigzag,
+    pipelined: bool = False,
+) -> dict[str, Results]:
+    # means over the seeds, keyed by part and n, and by cleaners of each colour
+    # unless just the one, exploration unless the zigzag and pipelined if so,
+    # untraced
+    tracelog.configure(Level.off)
+    results: dict[str, Results] = {}
+    for part in parts:
+        for n in sizes:
+            key: str = f"{part} n={n}"
+            if cleaners != 1:
+                key += f" cleaners={cleaners}"
+            if exploration != Exploration.zigzag:
+                key += f" {exploration.value}"
+            if pipelined:
+                key += " pipelined"
+            runs: list[Results] = [
+                _measure(
+                    (part, n, DENSITY, seed, cleaners, exploration, pipelined),
+                    CYCLES_PER_CELL * n * n,
+                )
+                for seed in range(seeds)
+            ]
+            results[key] = {STUCK: sum(run[STUCK] for run in runs)}
+            results[key].update(
+                (metric, round(sum(run[metric] for run in runs) / seeds, 2))
+                for metric in METRICS
+                if metric in runs[0]
+            )
+            print(
+                f"{key:>40}",
+                " ".join(
+                    f"{metric} {value:g}" for metric, value in results[key].items()
+                ),
+                flush=True,
+            )
+    return results
+
+
+def measure_regressions(parts: list[str]) -> dict[str, Results]:
+    # each scenario that once got stuck, of the parts given, keyed by its part, n,
+    # density and seed, untraced, without CPU times, a few dozen calls on a tiny
+    # grid time nothing but noise
+    tracelog.configure(Level.off)
+    results: dict[str, Results] = {}
+    for scenario in REGRESSIONS:
+        part, n, density, seed, _, _, _ = scenario
+        if part not in parts:
+            continue
+        key: str = f"{part} n={n} density={density} seed={seed}"
+        results[key] = {
+            metric: round(value, 2)
+            for metric, value in _measure(scenario, MAX_CYCLES).items()
+            if metric not in TIME_METRICS
+        }
+        print(
+            f"{key:>40}",
+            " ".join(f"{metric} {value:g}" for metric, value in results[key].items()),
+            flush=True,
+        )
+    return results
+
+
+def regressions(
+    baseline: dict[str, Results],
+    results: dict[str, Results],
+    tolerance: float,
+    time_tolerance: float,
+) -> list[str]:
+    # every stuck run, and every metric worse than its baseline beyond tolerance,
+    # relative to the baseline, for the parts and sizes measured in both
+    found: list[str] = []
+    for key, measured in results.items():
+        if measured.get(STUCK, 0) > 0:
+            found.append(f"{key}: {measured[STUCK]:g} {STUCK}")
+        for metric, value in measured.items():
+            if metric == STUCK or key not in baseline or metric not in baseline[key]:
+                continue
+            allowed: float = time_tolerance if metric in TIME_METRICS else tolerance
+            if value > baseline[key][metric] * (1 + allowed):
+                found.append(
+                    f"{key} {metric}: {value:g} against {baseline[key][metric]:g}"
+                )
+    return found
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--parts", nargs="+", default=PARTS, choices=PARTS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--seeds", type=int, default=SEEDS)
+    # part 3 only, none to leave the fleets out
+    parser.add_argument("--fleets", nargs="*", type=int, default=FLEETS)
+    parser.add_argument("--fleet-size", type=int, default=FLEET_N)
+    # parts 2 and 3 only, none to leave the other ways of exploring out
+    parser.add_argument("--mode-size", nargs="?", type=int, default=MODE_N)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update", action="store_true")
+    # allowed increase as a fraction of the baseline
+    parser.add_argument("--tolerance", type=float, default=0.02)
+    parser.add_argument("--time-tolerance", type=float, default=0.5)
+    args: argparse.Namespace = parser.parse_args()
+
+    results: dict[str, Results] = measure(args.parts, args.sizes, args.seeds)
+    if "part3" in args.parts:
+        for cleaners in args.fleets:
+            results.update(measure(["part3"], [args.fleet_size], args.seeds, cleaners))
+    cleaning: list[str] = [part for part in args.parts if part != "part1"]
+    if cleaning and args.mode_size is not None:
+        for exploration, pipelined in MODES:
+            results.update(
+                measure(
+                    cleaning, [args.mode_size], args.seeds, 1, exploration, pipelined
+                )
+            )
+    if "part3" in args.parts and args.fleets:
+        exploration, pipelined = MODES[-1]
+        for cleaners in [1] + args.fleets:
+            results.update(
+                measure(
+                    ["part3"],
+                    [args.fleet_size],
+                    args.seeds,
+                    cleaners,
+                    exploration,
+                    pipelined,
+                )
+            )
+    results.update(measure_regressions(args.parts))
+    baseline: dict[str, Results] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    if args.update:
+        # only what was measured is replaced, the rest of the baseline is kept
+        baseline.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2)
+            file.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    found: list[str] = regressions(
+        baseline, results, args.tolerance, args.time_tolerance
+    )
+    for regression in found:
+        print(f"regressed: {regression}")
+    if found:
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
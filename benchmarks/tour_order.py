@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Cycles a lone cleaner needs to clear its dirt list when it visits the list in the
+# row-major order white sends it, against the order the tour planner gives it:
+# nearest neighbour alone, and improved with 2-opt and Or-opt.
+#
+# The cleaner walks each leg with the path planner on an empty grid and spends one
+# cycle cleaning, so the cycle counts are what the agent would actually take.
+#
+# Run from the repository root:
+#   python -m benchmarks.tour_order
+
+import random
+import time
+
+from vacuumworld.common.vworientation import VWOrientation
+
+from distanceoracle import ORIENTATIONS, DistanceOracle, get_oracle
+from pathplanner import STEPS, PathPlanner
+from tourplanner import build_tour, plan_tour
+
+
+SIZES: list[int] = [20]
+DIRT_DENSITY: float = 0.3
+SEEDS: int = 10
+
+
+def _walk(
+    n: int,
+    tour: list[tuple[int, int]],
+    start: tuple[int, int],
+    facing: VWOrientation,
+) -> int:
+    # cycles to clean every stop in the given order
+    planner: PathPlanner = PathPlanner(n)
+    cycles: int = 0
+    position: tuple[int, int] = start
+    for goal in tour:
+        # walk there one action per cycle, then clean
+        while position != goal:
+            step: VWOrientation | None = planner.next_step(position, facing, goal)
+            if step is None:
+                break
+            if step == facing:
+                position = (position[0] + STEPS[step][0], position[1] + STEPS[step][1])
+            else:
+                facing = facing.get_left() if facing.get_left() == step else facing.get_right()
+            cycles += 1
+        cycles += 1
+    return cycles
+
+
+def main() -> None:
+    print(
+        f"{'n':>4} {'dirt':>6} {'row-major':>10} {'nearest':>8} {'tour':>8}"
+        f" {'saved':>7} {'plan ms':>8}"
+    )
+    for n in SIZES:
+        oracle: DistanceOracle = get_oracle(n)
+        totals: list[float] = [0, 0, 0, 0, 0]
+        for seed in range(SEEDS):
+            rng: random.Random = random.Random(seed * 1000 + n)
+            # white lists dirt row by row
+            dirt: list[tuple[int, int]] = [
+                (x, y) for y in range(n) for x in range(n) if rng.random() < DIRT_DENSITY
+            ]
+            start: tuple[int, int] = (rng.randrange(n), rng.randrange(n))
+            facing: VWOrientation = rng.choice(ORIENTATIONS)
+
+            started: float = time.perf_counter()
+            tour: list[tuple[int, int]] = plan_tour(oracle, *start, facing, dirt)
+            totals[4] += time.perf_counter() - started
+
+            totals[0] += len(dirt)
+            totals[1] += _walk(n, dirt, start, facing)
+            totals[2] += _walk(n, build_tour(oracle, *start, facing, dirt), start, facing)
+            totals[3] += _walk(n, tour, start, facing)
+
+        print(
+            f"{n:>4} {int(totals[0]):>6} {int(totals[1]):>10} {int(totals[2]):>8}"
+            f" {int(totals[3]):>8} {(totals[1] - totals[3]) / totals[1]:>7.1%}"
+            f" {totals[4] / SEEDS * 1e3:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# Time and cycles for a cleaner to keep its tour up to date as dirt it was given is
+# cleaned by someone else and more dirt arrives, one change at a time: improving the
+# whole tour again after each change, against improving only the stops around it.
+#
+# Each seed plans a tour of the cleaner's dirt, then takes out a random stop or puts
+# in a new dirt cell, alternately, UPDATES times. The cycles are those of the final
+# tour from the cleaner's start, counting every turn.
+#
+# Run from the repository root:
+#   python -m benchmarks.tour_update
+
+import random
+import time
+from typing import Callable
+
+from vacuumworld.common.vworientation import VWOrientation
+
+from distanceoracle import ORIENTATIONS, DistanceOracle, get_oracle
+from tourplanner import (
+    improve_around,
+    improve_tour,
+    insert_stops,
+    plan_tour,
+    tour_cycles,
+)
+
+
+SIZES: list[int] = [20, 50, 100]
+DIRT_DENSITY: float = 0.1
+SEEDS: int = 3
+UPDATES: int = 40
+
+# Tour after one change: oracle, start x, y, orientation, tour, position a stop was
+# taken out at or -1, stop put in or None
+Update = Callable[
+    [
+        DistanceOracle,
+        int,
+        int,
+        VWOrientation,
+        list[tuple[int, int]],
+        int,
+        tuple[int, int] | None,
+    ],
+    list[tuple[int, int]],
+]
+
+
+def _whole(
+    oracle: DistanceOracle,
+    x: int,
+    y: int,
+    orientation: VWOrientation,
+    tour: list[tuple[int, int]],
+    removed_at: int,
+    added: tuple[int, int] | None,
+) -> list[tuple[int, int]]:
+    if added is not None:
+        tour = insert_stops(oracle, x, y, orientation, tour, [added])
+    return improve_tour(oracle, x, y, orientation, tour)
+
+
+def _window(
+    oracle: DistanceOracle,
+    x: int,
+    y: int,
+    orientation: VWOrientation,
+    tour: list[tuple[int, int]],
+    removed_at: int,
+    added: tuple[int, int] | None,
+) -> list[tuple[int, int]]:
+    if added is not None:
+        return insert_stops(oracle, x, y, orientation, tour, [added])
+    return improve_around(oracle, x, y, orientation, tour, removed_at)
+
+
+def _run(update: Update, n: int, seed: int) -> tuple[int, list[float]]:
+    # final tour cycles and seconds taken by each change
+    oracle: DistanceOracle = get_oracle(n)
+    rng: random.Random = random.Random(seed * 1000 + n)
+    cells: list[tuple[int, int]] = [(x, y) for y in range(n) for x in range(n)]
+    rng.shuffle(cells)
+    count: int = int(len(cells) * DIRT_DENSITY)
+    dirt: list[tuple[int, int]] = cells[:count]
+    arriving: list[tuple[int, int]] = cells[count:]
+    x, y = rng.randrange(n), rng.randrange(n)
+    orientation: VWOrientation = rng.choice(ORIENTATIONS)
+
+    tour: list[tuple[int, int]] = plan_tour(oracle, x, y, orientation, dirt)
+    times: list[float] = []
+    for update_index in range(UPDATES):
+        removed_at: int = -1
+        added: tuple[int, int] | None = None
+        if update_index % 2 == 0 and len(tour) > 1:
+            removed_at = rng.randrange(len(tour))
+            tour = tour[:removed_at] + tour[removed_at + 1 :]
+        else:
+            added = arriving.pop()
+        started: float = time.perf_counter()
+        tour = update(oracle, x, y, orientation, tour, removed_at, added)
+        times.append(time.perf_counter() - started)
+    return tour_cycles(oracle, x, y, orientation, tour), times
+
+
+def main() -> None:
+    print(
+        f"{'n':>4} {'stops':>6} {'mode':>7} {'cycles':>8}"
+        f" {'mean ms':>8} {'p99 ms':>8}"
+    )
+    for n in SIZES:
+        for mode, update in (("whole", _whole), ("window", _window)):
+            cycles: int = 0
+            times: list[float] = []
+            for seed in range(SEEDS):
+                seed_cycles, seed_times = _run(update, n, seed)
+                cycles += seed_cycles
+                times += seed_times
+            times.sort()
+            print(
+                f"{n:>4} {int(n * n * DIRT_DENSITY):>6} {mode:>7} {cycles:>8}"
+                f" {sum(times) / len(times) * 1e3:>8.2f}"
+                f" {times[int(len(times) * 0.99)] * 1e3:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+import json
+import struct
+from enum import IntEnum
+from typing import TypeAlias
+
+from pystarworldsturbo.common.message import BccMessage
+
+
+# Encoded message content, bytes normally or str when json debug is on
+Payload: TypeAlias = bytes | str
+
+# Version byte leading every binary payload, bump when the layout changes
+#   1: one message per payload
+#   2: batch of sections, each a list of recipient ids and the messages for them
+#   3: aboutme carries the orientation of the reporting agent
+#   4: explore and observed commands for cooperative exploration
+#   5: reserve command for planning moves around other agents
+#   6: stuck command for asking white to get an agent going again
+CODEC_VERSION: int = 6
+
+# A batch section: ids it is addressed to (empty means every recipient) and its messages
+Section: TypeAlias = tuple[list[str], list["AgentMessage"]]
+
+# Colours in the fixed order they are written in, index is the colour code
+COLOURS: list[str] = ["orange", "green", "white", "user"]
+# Dirt colours carried by a clean command, in order
+DIRT_COLOURS: list[str] = ["orange", "green"]
+# Orientations in the fixed order they are written in, "" when not known
+ORIENTATIONS: list[str] = ["", "north", "east", "south", "west"]
+
+
+class Command(IntEnum):
+    rollcall = 1
+    clean = 2
+    getout = 3
+    ignore = 4
+    aboutme = 5
+    moverequest = 6
+    explore = 7
+    observed = 8
+    reserve = 9
+    stuck = 10
+
+
+# What a message is told apart by: command, colour, coord, dirt coords by colour,
+# orientation, size, empty coords, cycle and path
+MessageKey = tuple[
+    Command,
+    str,
+    tuple[int, int],
+    tuple[tuple[str, tuple[tuple[int, int], ...]], ...],
+    str,
+    int,
+    tuple[tuple[int, int], ...],
+    int,
+    tuple[tuple[int, int], ...],
+]
+
+
+class AgentMessage:
+    def __init__(
+        self,
+        command: Command,
+        colour: str = "",
+        coord: tuple[int, int] = (-1, -1),
+        dirt: dict[str, list[tuple[int, int]]] | None = None,
+        orientation: str = "",
+        size: int = -1,
+        empty: list[tuple[int, int]] | None = None,
+        cycle: int = -1,
+        path: list[tuple[int, int]] | None = None,
+    ) -> None:
+        # What the message asks or reports
+        self.__command: Command = command
+        # Colour of reporting agent (aboutme)
+        self.__colour: str = colour
+        # Single coord: where to go (getout), what to skip (ignore), where I am
+        # (aboutme, stuck), top and bottom row of the band to explore (explore)
+        self.__coord: tuple[int, int] = coord
+        # Dirt coords per colour (clean, observed)
+        self.__dirt: dict[str, list[tuple[int, int]]] = dict(dirt or {})
+        # Orientation of reporting agent (aboutme)
+        self.__orientation: str = orientation
+        # Grid size (explore)
+        self.__size: int = size
+        # Coords seen without dirt (observed)
+        self.__empty: list[tuple[int, int]] = list(empty or [])
+        # Cycle the path starts on, as counted by every agent from the first (reserve)
+        self.__cycle: int = cycle
+        # Cell the sender will be on at the start of each cycle from then (reserve)
+        self.__path: list[tuple[int, int]] = list(path or [])
+        # Id of sending agent, filled in on decode
+        self.__sender_id: str = ""
+
+    def get_command(self) -> Command:
+        return self.__command
+
+    def get_colour(self) -> str:
+        return self.__colour
+
+    def get_coord(self) -> tuple[int, int]:
+        return self.__coord
+
+    def get_dirt(self, colour: str) -> list[tuple[int, int]]:
+        return self.__dirt.get(colour, [])
+
+    def get_orientation(self) -> str:
+        return self.__orientation
+
+    def get_size(self) -> int:
+        return self.__size
+
+    def get_empty(self) -> list[tuple[int, int]]:
+        return self.__empty
+
+    def get_cycle(self) -> int:
+        return self.__cycle
+
+    def get_path(self) -> list[tuple[int, int]]:
+        return self.__path
+
+    def get_sender_id(self) -> str:
+        return self.__sender_id
+
+    def set_sender_id(self, sender_id: str) -> None:
+        self.__sender_id = sender_id
+
+    def key(self) -> MessageKey:
+        # every field but the sender, dirt by colour in colour order
+        return (
+            self.__command,
+            self.__colour,
+            self.__coord,
+            tuple(sorted((c, tuple(coords)) for c, coords in self.__dirt.items())),
+            self.__orientation,
+            self.__size,
+            tuple(self.__empty),
+            self.__cycle,
+            tuple(self.__path),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        # same command with same fields, whoever sent it
+        return isinstance(other, AgentMessage) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def __str__(self) -> str:
+        return f"{self.__command.name}(colour={self.__colour}, coord={self.__coord}, dirt={self.__dirt}, orientation={self.__orientation}, size={self.__size}, empty={self.__empty}, cycle={self.__cycle}, path={self.__path})"
+
+
+### MESSAGE CONSTRUCTORS ###
+
+
+def rollcall() -> AgentMessage:
+    return AgentMessage(Command.rollcall)
+
+
+def clean(dirt: dict[str, list[tuple[int, int]]]) -> AgentMessage:
+    return AgentMessage(Command.clean, dirt=dirt)
+
+
+def getout(x: int, y: int) -> AgentMessage:
+    return AgentMessage(Command.getout, coord=(x, y))
+
+
+def ignore(x: int, y: int) -> AgentMessage:
+    return AgentMessage(Command.ignore, coord=(x, y))
+
+
+def aboutme(colour: str, x: int, y: int, orientation: str = "") -> AgentMessage:
+    return AgentMessage(
+        Command.aboutme, colour=colour, coord=(x, y), orientation=orientation
+    )
+
+
+def moverequest() -> AgentMessage:
+    return AgentMessage(Command.moverequest)
+
+
+def explore(n: int, top: int, bottom: int) -> AgentMessage:
+    return AgentMessage(Command.explore, coord=(top, bottom), size=n)
+
+
+def observed(
+    empty: list[tuple[int, int]], dirt: dict[str, list[tuple[int, int]]]
+) -> AgentMessage:
+    return AgentMessage(Command.observed, dirt=dirt, empty=empty)
+
+
+def reserve(cycle: int, path: list[tuple[int, int]]) -> AgentMessage:
+    return AgentMessage(Command.reserve, cycle=cycle, path=path)
+
+
+def stuck(x: int, y: int) -> AgentMessage:
+    return AgentMessage(Command.stuck, coord=(x, y))
+
+
+### JSON DEBUG FALLBACK ###
+
+# If true, encode writes readable json instead of binary
+_json_debug: bool = False
+
+
+def set_json_debug(enabled: bool) -> None:
+    global _json_debug
+    _json_debug = enabled
+
+
+def _message_to_json(message: AgentMessage) -> dict:
+    return {
+        "command": message.get_command().name,
+        "colour": message.get_colour(),
+        "coord": list(message.get_coord()),
+        "dirt": {colour: message.get_dirt(colour) for colour in DIRT_COLOURS},
+        "orientation": message.get_orientation(),
+        "size": message.get_size(),
+        "empty": message.get_empty(),
+        "cycle": message.get_cycle(),
+        "path": message.get_path(),
+    }
+
+
+def _message_from_json(fields: dict) -> AgentMessage:
+    return AgentMessage(
+        Command[fields["command"]],
+        colour=fields["colour"],
+        coord=(fields["coord"][0], fields["coord"][1]),
+        dirt={
+            colour: [(x, y) for x, y in coords]
+            for colour, coords in fields["dirt"].items()
+            if coords
+        },
+        orientation=fields["orientation"],
+        size=fields["size"],
+        empty=[(x, y) for x, y in fields["empty"]],
+        cycle=fields["cycle"],
+        path=[(x, y) for x, y in fields["path"]],
+    )
+
+
+def _encode_json(sections: list[Section]) -> str:
+    return json.dumps(
+        {
+            "v": CODEC_VERSION,
+            "sections": [
+                {"to": ids, "messages": [_message_to_json(m) for m in messages]}
+                for ids, messages in sections
+            ],
+        }
+    )
+
+
+def _decode_json(content: str, recipient_id: str) -> list[AgentMessage]:
+    fields = json.loads(content)
+    if fields.get("v") != CODEC_VERSION:
+        raise ValueError(f"Unsupported message version: {fields.get('v')}.")
+    return [
+        _message_from_json(message)
+        for section in fields["sections"]
+        if not section["to"] or recipient_id in section["to"]
+        for message in section["messages"]
+    ]
+
+
+### BINARY CODEC ###
+
+
+def _write_uvarint(out: bytearray, value: int) -> None:
+    # 7 bits per byte, high bit set while more bytes follow
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_uvarint(data: bytes, i: int) -> tuple[int, int]:
+    # return decoded value and index of next unread byte
+    value: int = 0
+    shift: int = 0
+    while True:
+        byte: int = data[i]
+        i += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, i
+
+
+def _write_svarint(out: bytearray, value: int) -> None:
+    # zigzag first so small negative coords (just off the grid) stay one byte
+    _write_uvarint(out, (value << 1) ^ (value >> 63))
+
+
+def _read_svarint(data: bytes, i: int) -> tuple[int, int]:
+    value, i = _read_uvarint(data, i)
+    return (value >> 1) ^ -(value & 1), i
+
+
+def _write_coords(out: bytearray, coords: list[tuple[int, int]]) -> None:
+    # count then x y of each coord, dirt coords are never negative
+    _write_uvarint(out, len(coords))
+    flat: list[int] = [value for coord in coords for value in coord]
+    if not flat or max(flat) <= 0x7F:
+        # every value fits one byte, grids up to 128 wide
+        out += bytes(flat)
+    else:
+        for value in flat:
+            _write_uvarint(out, value)
+
+
+def _read_coords(data: bytes, i: int) -> tuple[list[tuple[int, int]], int]:
+    count, i = _read_uvarint(data, i)
+    chunk: bytes = data[i : i + 2 * count]
+    if not chunk or max(chunk) <= 0x7F:
+        # no continuation bit in the next 2 * count bytes, so one byte per value
+        return list(zip(chunk[0::2], chunk[1::2])), i + 2 * count
+    coords: list[tuple[int, int]] = []
+    for _ in range(count):
+        x, i = _read_uvarint(data, i)
+        y, i = _read_uvarint(data, i)
+        coords.append((x, y))
+    return coords, i
+
+
+def _write_message(out: bytearray, message: AgentMessage) -> None:
+    # opcode byte then the fields that command carries
+    command: Command = message.get_command()
+    out.append(command)
+
+    if command in (
+        Command.getout,
+        Command.ignore,
+        Command.aboutme,
+        Command.explore,
+        Command.stuck,
+    ):
+        if command == Command.aboutme:
+            out.append(COLOURS.index(message.get_colour()))
+            out.append(ORIENTATIONS.index(message.get_orientation()))
+        if command == Command.explore:
+            _write_uvarint(out, message.get_size())
+        _write_svarint(out, message.get_coord()[0])
+        _write_svarint(out, message.get_coord()[1])
+    elif command in (Command.clean, Command.observed):
+        if command == Command.observed:
+            _write_coords(out, message.get_empty())
+        for colour in DIRT_COLOURS:
+            _write_coords(out, message.get_dirt(colour))
+    elif command == Command.reserve:
+        _write_uvarint(out, message.get_cycle())
+        _write_coords(out, message.get_path())
+
+
+def _read_message(data: bytes, i: int) -> tuple[AgentMessage, int]:
+    command: Command = Command(data[i])
+    i += 1
+
+    if command in (
+        Command.getout,
+        Command.ignore,
+        Command.aboutme,
+        Command.explore,
+        Command.stuck,
+    ):
+        colour: str = ""
+        orientation: str = ""
+        size: int = -1
+        if command == Command.aboutme:
+            colour = COLOURS[data[i]]
+            orientation = ORIENTATIONS[data[i + 1]]
+            i += 2
+        if command == Command.explore:
+            size, i = _read_uvarint(data, i)
+        x, i = _read_svarint(data, i)
+        y, i = _read_svarint(data, i)
+        return (
+            AgentMessage(
+                command, colour=colour, coord=(x, y), orientation=orientation, size=size
+            ),
+            i,
+        )
+    elif command in (Command.clean, Command.observed):
+        empty: list[tuple[int, int]] = []
+        if command == Command.observed:
+            empty, i = _read_coords(data, i)
+        dirt: dict[str, list[tuple[int, int]]] = {}
+        for colour in DIRT_COLOURS:
+            coords, i = _read_coords(data, i)
+            if coords:
+                dirt[colour] = coords
+        return AgentMessage(command, dirt=dirt, empty=empty), i
+    elif command == Command.reserve:
+        cycle, i = _read_uvarint(data, i)
+        path, i = _read_coords(data, i)
+        return AgentMessage(command, cycle=cycle, path=path), i
+
+    return AgentMessage(command), i
+
+
+def _encode_binary(sections: list[Section]) -> bytes:
+    out: bytearray = bytearray(struct.pack("B", CODEC_VERSION))
+    _write_uvarint(out, len(sections))
+    for ids, messages in sections:
+        _write_uvarint(out, len(ids))
+        for actor_id in ids:
+            encoded_id: bytes = actor_id.encode()
+            _write_uvarint(out, len(encoded_id))
+            out += encoded_id
+        _write_uvarint(out, len(messages))
+        for message in messages:
+            _write_message(out, message)
+    return bytes(out)
+
+
+def _decode_binary(data: bytes, recipient_id: str) -> list[AgentMessage]:
+    if data[0] != CODEC_VERSION:
+        raise ValueError(f"Unsupported message version: {data[0]}.")
+    decoded: list[AgentMessage] = []
+    section_count, i = _read_uvarint(data, 1)
+    for _ in range(section_count):
+        id_count, i = _read_uvarint(data, i)
+        ids: list[str] = []
+        for _ in range(id_count):
+            length, i = _read_uvarint(data, i)
+            ids.append(data[i : i + length].decode())
+            i += length
+        message_count, i = _read_uvarint(data, i)
+        # sections for other recipients still need reading to find where the next starts
+        for _ in range(message_count):
+            message, i = _read_message(data, i)
+            if not ids or recipient_id in ids:
+                decoded.append(message)
+    return decoded
+
+
+### PUBLIC API ###
+
+
+def encode_batch(sections: list[Section]) -> Payload:
+    # pack sections of messages into one payload, binary or json
+    if _json_debug:
+        return _encode_json(sections)
+    return _encode_binary(sections)
+
+
+def encode(message: AgentMessage) -> Payload:
+    # one message for every recipient of the payload
+    return encode_batch([([], [message])])
+
+
+def decode(message: BccMessage) -> list[AgentMessage]:
+    # decode received payload once, binary or json, keeping the messages addressed
+    # to its recipient and tagging each with its sender
+    content = message.get_content()
+    recipient_id: str = message.get_recipients_ids()[0]
+    decoded: list[AgentMessage] = (
+        _decode_binary(content, recipient_id)
+        if isinstance(content, bytes)
+        else _decode_json(str(content), recipient_id)
+    )
+    for m in decoded:
+        m.set_sender_id(message.get_sender_id())
+    return decoded
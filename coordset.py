@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from typing import Iterable, Iterator
+
+
+# Stride used to pack coords when grid size is not known, any x below it is safe
+DEFAULT_STRIDE: int = 1 << 16
+
+
+class CoordSet:
+    def __init__(
+        self, stride: int = DEFAULT_STRIDE, coords: Iterable[tuple[int, int]] = ()
+    ) -> None:
+        # Row width used to pack x y into y * stride + x, grid size n when known
+        self.__stride: int = stride if stride > 0 else DEFAULT_STRIDE
+        # Packed coords in insertion order, ordered dict keeps first() O(1) under removal
+        self.__coords: OrderedDict[int, None] = OrderedDict()
+
+        for x, y in coords:
+            self.add(x, y)
+
+    def pack(self, x: int, y: int) -> int:
+        return y * self.__stride + x
+
+    def unpack(self, key: int) -> tuple[int, int]:
+        y, x = divmod(key, self.__stride)
+        return x, y
+
+    def add(self, x: int, y: int) -> bool:
+        # add coord at the end, return whether it was new
+        key: int = self.pack(x, y)
+        if key in self.__coords:
+            return False
+        self.__coords[key] = None
+        return True
+
+    def remove(self, x: int, y: int) -> bool:
+        # remove coord, return whether it was held
+        key: int = self.pack(x, y)
+        if key not in self.__coords:
+            return False
+        del self.__coords[key]
+        return True
+
+    def first(self) -> tuple[int, int]:
+        # oldest coord still held, raises IndexError if empty
+        if not self.__coords:
+            raise IndexError("first() on empty CoordSet")
+        return self.unpack(next(iter(self.__coords)))
+
+    def __contains__(self, coord: tuple[int, int]) -> bool:
+        return self.pack(*coord) in self.__coords
+
+    def __len__(self) -> int:
+        return len(self.__coords)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return (self.unpack(key) for key in self.__coords)
+
+    def __str__(self) -> str:
+        return str([f"({x}, {y})" for x, y in self])
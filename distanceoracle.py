@@ -0,0 +1,101 @@
+from array import array
+
+import numpy as np
+
+from vacuumworld.common.vworientation import VWOrientation
+
+
+# Orientations in the order their costs are stored
+ORIENTATIONS: list[VWOrientation] = [
+    VWOrientation.north,
+    VWOrientation.east,
+    VWOrientation.south,
+    VWOrientation.west,
+]
+# Index of each orientation in the order above
+ORIENTATION_INDEX: dict[VWOrientation, int] = {
+    orientation: i for i, orientation in enumerate(ORIENTATIONS)
+}
+
+
+class DistanceOracle:
+    def __init__(self, n: int) -> None:
+        # Grid size, offsets between any two cells run from -(n - 1) to n - 1
+        self.__n: int = n
+        # Number of offsets along each axis
+        self.__span: int = 2 * n - 1
+
+        # Cycles to reach a cell from an agent, per x offset, y offset and
+        # orientation, flat index ((dx + n - 1) * span + dy + n - 1) * 4 + orientation
+        self.__cycles: array = array("H", self.__build().tobytes())
+
+    def __build(self) -> np.ndarray:
+        # on an empty grid the fastest way is one straight leg per axis,
+        # so cycles are the manhattan distance plus the turns before each leg
+        offsets: np.ndarray = np.arange(-(self.__n - 1), self.__n)
+        dx: np.ndarray = offsets[:, None, None]
+        dy: np.ndarray = offsets[None, :, None]
+        # orientation index 0 north, 1 east, 2 south, 3 west
+        o: np.ndarray = np.arange(4)[None, None, :]
+
+        # turns to face east (1) or west (3) for x leg, south (2) or north (0) for y leg
+        x_turns: np.ndarray = self.__turns(o, np.where(dx > 0, 1, 3))
+        y_turns: np.ndarray = self.__turns(o, np.where(dy > 0, 2, 0))
+
+        turns: np.ndarray = np.where(
+            dx == 0,
+            np.where(dy == 0, 0, y_turns),
+            # both legs needed: face one, then one more turn onto the other
+            np.where(dy == 0, x_turns, np.minimum(x_turns, y_turns) + 1),
+        )
+        return (np.abs(dx) + np.abs(dy) + turns).astype(np.uint16)
+
+    def __turns(self, facing: np.ndarray, to: np.ndarray) -> np.ndarray:
+        # 0 if already facing, 2 if facing away, 1 otherwise
+        difference: np.ndarray = (to - facing) % 4
+        return np.where(difference == 0, 0, np.where(difference == 2, 2, 1))
+
+    def get_n(self) -> int:
+        return self.__n
+
+    def cycles(
+        self, x: int, y: int, orientation: VWOrientation, to_x: int, to_y: int
+    ) -> int:
+        # move and turn actions an agent at x y facing orientation needs to reach to_x to_y
+        return self.__cycles[
+            (
+                (to_x - x + self.__n - 1) * self.__span + to_y - y + self.__n - 1
+            ) * 4
+            + ORIENTATION_INDEX[orientation]
+        ]
+
+    def arrival(
+        self, x: int, y: int, orientation: VWOrientation, to_x: int, to_y: int
+    ) -> VWOrientation:
+        # orientation an agent ends up facing after the fastest way to to_x to_y,
+        # one straight leg per axis, starting with the one needing fewer turns
+        horizontal: VWOrientation = VWOrientation.east if to_x > x else VWOrientation.west
+        vertical: VWOrientation = VWOrientation.south if to_y > y else VWOrientation.north
+        if to_x == x and to_y == y:
+            return orientation
+        if to_y == y:
+            return horizontal
+        if to_x == x:
+            return vertical
+        turns: list[int] = [
+            (ORIENTATION_INDEX[leg] - ORIENTATION_INDEX[orientation]) % 4
+            for leg in (horizontal, vertical)
+        ]
+        # 0 turns if facing, 1 either side, 2 if facing away
+        return vertical if min(turns[0], 4 - turns[0]) <= min(turns[1], 4 - turns[1]) else horizontal
+
+
+# Oracles already built, one per grid size, shared by every mind in the process
+_oracles: dict[int, DistanceOracle] = {}
+
+
+def get_oracle(n: int) -> DistanceOracle:
+    # build the table for a grid size the first time it is asked for
+    if n not in _oracles:
+        _oracles[n] = DistanceOracle(n)
+    return _oracles[n]
@@ -0,0 +1,306 @@
+from enum import Enum
+
+import numpy as np
+
+from vacuumworld.common.vworientation import VWOrientation
+
+from assignment import hungarian
+from distanceoracle import ORIENTATION_INDEX, ORIENTATIONS, DistanceOracle
+from gridmodel import UNEXPLORED, GridModel
+
+
+class Exploration(Enum):
+    # zigzag from the corner cheapest to get to
+    zigzag = "zigzag"
+    # greedy viewpoints revealing the most unexplored cells per cycle
+    frontier = "frontier"
+    # grid split into bands of rows, each zigzagged by one agent (parts 2 and 3)
+    cooperative = "cooperative"
+
+
+# A viewpoint: x, y and orientation to face there
+Pose = tuple[int, int, VWOrientation]
+# A band of rows to explore, top and bottom y inclusive
+Region = tuple[int, int]
+
+
+def _turns(facing: np.ndarray | int, to: np.ndarray | int) -> np.ndarray:
+    # 0 if already facing, 2 if facing away, 1 otherwise, orientation indices,
+    # either of which may be a single one
+    difference: np.ndarray = np.subtract(to, facing) % 4
+    return np.minimum(difference, 4 - difference)
+
+
+class FrontierExplorer:
+    def __init__(self, n: int) -> None:
+        # Grid size
+        self.__n: int = n
+        # Viewpoint being headed for, None when a new one is needed
+        self.__target: Pose | None = None
+
+        # x, y and orientation index of every pose, shaped n x n x 4
+        self.__xs: np.ndarray = np.arange(n)[:, None, None]
+        self.__ys: np.ndarray = np.arange(n)[None, :, None]
+        self.__os: np.ndarray = np.arange(4)[None, None, :]
+
+    def __gains(self, unexplored: np.ndarray) -> np.ndarray:
+        # unexplored cells each pose would reveal, n x n x 4 by orientation index,
+        # the observation is 3 cells across, on the agent's row and the one ahead
+        padded: np.ndarray = np.pad(unexplored.astype(np.int32), 1)
+        # 3 cells across x at each x y, and 3 across y
+        across_x: np.ndarray = padded[:-2, 1:-1] + padded[1:-1, 1:-1] + padded[2:, 1:-1]
+        across_y: np.ndarray = padded[1:-1, :-2] + padded[1:-1, 1:-1] + padded[1:-1, 2:]
+        across_x = np.pad(across_x, 1)
+        across_y = np.pad(across_y, 1)
+
+        gains: np.ndarray = np.empty((self.__n, self.__n, 4), dtype=np.int32)
+        # north looks at y - 1, east at x + 1, south at y + 1, west at x - 1
+        gains[:, :, 0] = across_x[1:-1, 1:-1] + across_x[1:-1, :-2]
+        gains[:, :, 1] = across_y[1:-1, 1:-1] + across_y[2:, 1:-1]
+        gains[:, :, 2] = across_x[1:-1, 1:-1] + across_x[1:-1, 2:]
+        gains[:, :, 3] = across_y[1:-1, 1:-1] + across_y[:-2, 1:-1]
+        return gains
+
+    def __cycles(self, x: int, y: int, orientation: VWOrientation) -> np.ndarray:
+        # cycles from x y facing orientation to every pose on an empty grid,
+        # one straight leg per axis taken in the cheaper order, then turns to face
+        o: int = ORIENTATION_INDEX[orientation]
+        dx: np.ndarray = self.__xs - x
+        dy: np.ndarray = self.__ys - y
+        # orientation index of the x leg (east 1 or west 3) and y leg (south 2 or north 0)
+        horizontal: np.ndarray = np.where(dx > 0, 1, 3)
+        vertical: np.ndarray = np.where(dy > 0, 2, 0)
+
+        turns: np.ndarray = np.where(
+            dx == 0,
+            np.where(
+                dy == 0,
+                _turns(o, self.__os),
+                _turns(o, vertical) + _turns(vertical, self.__os),
+            ),
+            np.where(
+                dy == 0,
+                _turns(o, horizontal) + _turns(horizontal, self.__os),
+                np.minimum(
+                    _turns(o, horizontal) + 1 + _turns(vertical, self.__os),
+                    _turns(o, vertical) + 1 + _turns(horizontal, self.__os),
+                ),
+            ),
+        )
+        return np.abs(dx) + np.abs(dy) + turns
+
+    def __gain(self, unexplored: np.ndarray, pose: Pose) -> int:
+        return int(self.__gains(unexplored)[pose[0], pose[1], ORIENTATION_INDEX[pose[2]]])
+
+    def next_pose(
+        self, model: GridModel, x: int, y: int, orientation: VWOrientation
+    ) -> Pose | None:
+        # viewpoint to head for, kept while it still has something to reveal,
+        # otherwise the one revealing most unexplored cells per cycle to get there,
+        # None once the grid is fully explored
+        unexplored: np.ndarray = model.get_unexplored_mask()
+        if self.__target is not None and self.__gain(unexplored, self.__target) > 0:
+            return self.__target
+
+        gains: np.ndarray = self.__gains(unexplored)
+        if not gains.any():
+            self.__target = None
+            return None
+        cycles: np.ndarray = np.maximum(self.__cycles(x, y, orientation), 1)
+        # ties go to the nearest pose
+        score: np.ndarray = gains / cycles - cycles * 1e-6
+        score[gains == 0] = -np.inf
+        tx, ty, to = np.unravel_index(int(np.argmax(score)), score.shape)
+        self.__target = (int(tx), int(ty), ORIENTATIONS[int(to)])
+        return self.__target
+
+
+### START CORNER ###
+
+
+def corner_cell(n: int, far: bool) -> int:
+    # x or y of the cell one in from the west or north wall, or from the east or
+    # south wall if far, where a zigzag starting in that corner begins
+    return max(n - 2, 0) if far else min(1, n - 1)
+
+
+def start_corner(
+    model: GridModel, n: int, x: int, y: int, orientation: VWOrientation
+) -> tuple[bool, bool]:
+    # corner for a zigzag to start from, as from east and from south, the one
+    # cheapest to get to going north or south first, then east or west so as to
+    # face the wall the first pass starts from, and to make the first pass from,
+    # unless the rest of its rows, behind the agent on the way there, are explored
+    # already, the zigzag then skips it, while n is not known it is guessed,
+    # no wall east or south in view puts it at least 2 past the agent, and for an
+    # agent dropped anywhere x + y averages n - 1
+    if n <= 0:
+        n = max(x + y + 1, max(x, y) + 2, 3)
+
+    def is_explored(cell_x: int, cell_y: int) -> bool:
+        return (
+            max(cell_x, cell_y) < model.get_n()
+            and model.get_cell(cell_x, cell_y) != UNEXPLORED
+        )
+
+    def cycles(from_east: bool, from_south: bool) -> int:
+        to_x: int = corner_cell(n, from_east)
+        to_y: int = corner_cell(n, from_south)
+        facing: int = ORIENTATION_INDEX[orientation]
+        turns: int = 0
+        for leg, distance in (
+            (2 if to_y > y else 0, abs(to_y - y)),
+            (1 if to_x > x else 3, abs(to_x - x)),
+        ):
+            if distance > 0:
+                turns += int(_turns(facing, leg))
+                facing = leg
+        turns += int(_turns(facing, 1 if from_east else 3))
+
+        # the first pass turns round and goes across to the opposite side,
+        # the column next to the agent is seen on the way to the corner row
+        behind: range = range(0, x - 1) if from_east else range(x + 2, n)
+        rows: range = range(max(to_y - 1, 0), min(to_y + 2, n))
+        first_pass: int = 0
+        if not all(is_explored(bx, by) for bx in behind for by in rows):
+            first_pass = 2 + abs(corner_cell(n, True) - corner_cell(n, False))
+        return abs(to_x - x) + abs(to_y - y) + turns + first_pass
+
+    # ties go to the north west, whose corner cell is known before n is
+    return min(
+        (
+            (from_east, from_south)
+            for from_south in (False, True)
+            for from_east in (False, True)
+        ),
+        key=lambda corner: cycles(*corner),
+    )
+
+
+### COOPERATIVE EXPLORATION ###
+
+
+def split_rows(n: int, parts: int) -> list[Region]:
+    # bands of whole 3 row passes from north to south, as even as the passes allow
+    passes: int = -(-n // 3)
+    regions: list[Region] = []
+    top: int = 0
+    for part in range(parts):
+        count: int = passes // parts + (1 if part < passes % parts else 0)
+        if count == 0:
+            continue
+        bottom: int = min(n - 1, top + 3 * count - 1)
+        regions.append((top, bottom))
+        top = bottom + 1
+    return regions
+
+
+def zigzag_poses(
+    n: int, region: Region, from_east: bool, from_south: bool
+) -> list[Pose]:
+    # viewpoints sweeping a band the way the zigzag does, along rows 3 apart,
+    # each row seeing the one either side, starting from the given corner
+    top, bottom = region
+    rows: list[int] = []
+    y: int = bottom - 1 if bottom > top else bottom
+    while True:
+        rows.append(y)
+        if y - 1 <= top:
+            break
+        y = max(y - 3, top + 1)
+    if not from_south:
+        rows = [top + bottom - y for y in rows]
+
+    poses: list[Pose] = []
+    east: bool = from_east
+    for y in rows:
+        # facing along the row from one edge column, seeing the edge and the next
+        # column, then along to the far side, seeing the far edge ahead
+        if east:
+            ends: list[Pose] = [
+                (n - 1, y, VWOrientation.west),
+                (min(1, n - 1), y, VWOrientation.west),
+            ]
+        else:
+            ends = [(0, y, VWOrientation.east), (max(n - 2, 0), y, VWOrientation.east)]
+        for pose in ends:
+            if not poses or poses[-1] != pose:
+                poses.append(pose)
+        east = not east
+    return poses
+
+
+def sweep_cycles(oracle: DistanceOracle, poses: list[Pose]) -> int:
+    # cycles to visit the viewpoints in order once at the first
+    total: int = 0
+    for (x, y, orientation), (to_x, to_y, _) in zip(poses, poses[1:]):
+        total += oracle.cycles(x, y, orientation, to_x, to_y) + 1
+    return total
+
+
+def best_sweep(
+    oracle: DistanceOracle, x: int, y: int, orientation: VWOrientation, region: Region
+) -> tuple[int, list[Pose]]:
+    # sweep of a band starting from the corner cheapest to finish from x y facing
+    # orientation, with its cycles counting the way to the first viewpoint
+    n: int = oracle.get_n()
+    sweeps: list[list[Pose]] = [
+        zigzag_poses(n, region, from_east, from_south)
+        for from_east in (True, False)
+        for from_south in (True, False)
+    ]
+    return min(
+        (
+            (
+                oracle.cycles(x, y, orientation, sweep[0][0], sweep[0][1])
+                + sweep_cycles(oracle, sweep),
+                sweep,
+            )
+            for sweep in sweeps
+        ),
+        key=lambda option: option[0],
+    )
+
+
+def assign_regions(
+    oracle: DistanceOracle, agents: list[Pose], regions: list[Region]
+) -> list[Region | None]:
+    # band for each agent, None if there are more agents than bands, handed out
+    # so the last agent to finish its sweep finishes soonest, then so the sweeps
+    # take fewest cycles in all
+    cycles: list[list[int]] = [
+        [best_sweep(oracle, *agent, region)[0] for region in regions]
+        for agent in agents
+    ]
+    if not agents or not regions:
+        return [None] * len(agents)
+    # agents past the number of bands take one of these, of no cycles
+    spare: int = max(len(agents) - len(regions), 0)
+    # costs more than every sweep put together, so only taken if there is no way
+    # around it
+    over: int = sum(map(sum, cycles)) + 1
+
+    def hand_out(limit: int) -> list[int]:
+        # fewest cycles in all with no sweep longer than limit, if there is a way
+        cost: list[list[int]] = [
+            [c if c <= limit else over for c in row] + [0] * spare for row in cycles
+        ]
+        return hungarian(cost)
+
+    def longest(chosen: list[int]) -> int:
+        return max(cycles[a][r] for a, r in enumerate(chosen) if r < len(regions))
+
+    # a whole fleet of agents is too many to try every way of handing out bands,
+    # so bisect on the longest sweep allowed, any sweep's cycles being a candidate
+    limits: list[int] = sorted({c for row in cycles for c in row})
+    low: int = 0
+    high: int = len(limits) - 1
+    best: list[int] = hand_out(limits[high])
+    while low < high:
+        middle: int = (low + high) // 2
+        chosen: list[int] = hand_out(limits[middle])
+        if longest(chosen) > limits[middle]:
+            low = middle + 1
+        else:
+            high, best = middle, chosen
+    return [regions[r] if r < len(regions) else None for r in best]
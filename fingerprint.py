@@ -0,0 +1,38 @@
+# Cheap key for what an agent sees in a cycle, so a mind left with nothing to do
+# can tell nothing in view has changed since and skip revising it all again
+
+from vacuumworld.common.vwcoordinates import VWCoord
+from vacuumworld.common.vwobservation import VWObservation
+from vacuumworld.common.vworientation import VWOrientation
+from vacuumworld.model.actor.appearance.vwactor_appearance import VWActorAppearance
+from vacuumworld.model.environment.vwlocation import VWLocation
+
+
+# A cell in view: x, y, id and orientation of the actor on it, "" and None if
+# there is none, and colour of the dirt on it, "" if there is none
+CellKey = tuple[int, int, str, VWOrientation | None, str]
+# Every cell in view in the observation's order, own cell first, so own
+# position and orientation are part of it
+ObservationKey = tuple[CellKey, ...]
+
+
+def _cell_key(location: VWLocation) -> CellKey:
+    actor_id: str = ""
+    orientation: VWOrientation | None = None
+    if location.has_actor():
+        actor: VWActorAppearance = location.get_actor_appearance().or_else_raise()
+        actor_id, orientation = actor.get_id(), actor.get_orientation()
+    dirt: str = (
+        str(location.get_dirt_appearance().or_else_raise().get_colour())
+        if location.has_dirt()
+        else ""
+    )
+    coord: VWCoord = location.get_coord()
+    return coord.get_x(), coord.get_y(), actor_id, orientation, dirt
+
+
+def observation_key(observation: VWObservation) -> ObservationKey:
+    return tuple(
+        _cell_key(location.or_else_raise())
+        for location in observation.get_locations_in_order()
+    )
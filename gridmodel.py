@@ -0,0 +1,126 @@
+from typing import Sequence
+
+import numpy as np
+
+
+# Cell values stored in the grid model
+EMPTY: int = 0
+ORANGE: int = 1
+GREEN: int = 2
+UNEXPLORED: int = 255
+
+# Dirt colour name to cell value
+DIRT_COLOURS: dict[str, int] = {"orange": ORANGE, "green": GREEN}
+
+
+class GridModel:
+    def __init__(self, n: int) -> None:
+        # Grid size
+        self.__n: int = n
+
+        # Cell values as one uint8 per cell, flat index x * n + y
+        self.__cells: bytearray = bytearray([UNEXPLORED]) * (n * n)
+        # One byte mask per dirt colour, same indexing as cells
+        self.__dirt_masks: dict[str, bytearray] = {
+            colour: bytearray(n * n) for colour in DIRT_COLOURS
+        }
+
+        # Number of cells still unexplored, in total and per row (y) / column (x)
+        self.__unexplored_count: int = n * n
+        self.__unexplored_in_row: list[int] = [n] * n
+        self.__unexplored_in_col: list[int] = [n] * n
+
+    def get_n(self) -> int:
+        return self.__n
+
+    def get_cell(self, x: int, y: int) -> int:
+        return self.__cells[x * self.__n + y]
+
+    def __as_array(self, buffer: bytearray) -> np.ndarray:
+        # zero copy n x n view of a buffer, indexed [x, y]
+        return np.frombuffer(buffer, dtype=np.uint8).reshape(self.__n, self.__n)
+
+    def update(self, xs: Sequence[int], ys: Sequence[int], values: Sequence[int]) -> None:
+        # write observed cell values straight into the buffers,
+        # an observation is a handful of cells so this beats numpy fancy indexing
+        cells: bytearray = self.__cells
+        orange: bytearray = self.__dirt_masks["orange"]
+        green: bytearray = self.__dirt_masks["green"]
+        for x, y, value in zip(xs, ys, values):
+            i: int = x * self.__n + y
+            # cells seen for the first time come off the unexplored counts
+            if cells[i] == UNEXPLORED:
+                self.__unexplored_count -= 1
+                self.__unexplored_in_row[y] -= 1
+                self.__unexplored_in_col[x] -= 1
+            cells[i] = value
+            orange[i] = value == ORANGE
+            green[i] = value == GREEN
+
+    def resize(self, n: int) -> None:
+        # resize to n x n keeping every cell recorded below n, so cells can be
+        # recorded before the grid size is known, the map is grown to fit them
+        # and cut down to size once it is
+        keep: int = min(self.__n, n)
+        cells: np.ndarray = np.full((n, n), UNEXPLORED, dtype=np.uint8)
+        cells[:keep, :keep] = self.__as_array(self.__cells)[:keep, :keep]
+        for colour, mask in self.__dirt_masks.items():
+            resized: np.ndarray = np.zeros((n, n), dtype=np.uint8)
+            resized[:keep, :keep] = self.__as_array(mask)[:keep, :keep]
+            self.__dirt_masks[colour] = bytearray(resized.tobytes())
+
+        self.__n = n
+        self.__cells = bytearray(cells.tobytes())
+        unexplored: np.ndarray = cells == UNEXPLORED
+        self.__unexplored_count = int(np.count_nonzero(unexplored))
+        self.__unexplored_in_row = np.count_nonzero(unexplored, axis=0).tolist()
+        self.__unexplored_in_col = np.count_nonzero(unexplored, axis=1).tolist()
+
+    def is_fully_explored(self) -> bool:
+        return self.__unexplored_count == 0
+
+    def get_unexplored_count(self) -> int:
+        return self.__unexplored_count
+
+    def is_row_explored(self, y: int) -> bool:
+        return self.__unexplored_in_row[y] == 0
+
+    def get_unexplored_cells(self) -> list[tuple[int, int]]:
+        # x y of every unexplored cell, only looking at rows that still hold some
+        rows: np.ndarray = np.flatnonzero(self.__unexplored_in_row)
+        if rows.size == 0:
+            return []
+        xs, row_idx = np.nonzero(self.__as_array(self.__cells)[:, rows] == UNEXPLORED)
+        return list(zip(xs.tolist(), rows[row_idx].tolist()))
+
+    def get_unexplored_mask(self) -> np.ndarray:
+        # n x n boolean array, indexed [x, y], true where the cell is unexplored
+        return self.__as_array(self.__cells) == UNEXPLORED
+
+    def get_dirt_coords(self, colour: str) -> list[tuple[int, int]]:
+        # x y of every dirt of given colour, ordered by x then y
+        xs, ys = np.nonzero(self.__as_array(self.__dirt_masks[colour]))
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def count_dirt(self, colour: str) -> int:
+        return int(np.count_nonzero(self.__as_array(self.__dirt_masks[colour])))
+
+    def copy(self) -> "GridModel":
+        # cheap snapshot, each buffer is copied in one go
+        snapshot: GridModel = GridModel(0)
+        snapshot.__n = self.__n
+        snapshot.__cells = self.__cells[:]
+        snapshot.__dirt_masks = {
+            colour: mask[:] for colour, mask in self.__dirt_masks.items()
+        }
+        snapshot.__unexplored_count = self.__unexplored_count
+        snapshot.__unexplored_in_row = self.__unexplored_in_row[:]
+        snapshot.__unexplored_in_col = self.__unexplored_in_col[:]
+        return snapshot
+
+    def __str__(self) -> str:
+        # one line per row (y), cells left to right (x)
+        return "".join(
+            " ".join(str(value) for value in row) + " \n"
+            for row in self.__as_array(self.__cells).T.tolist()
+        )
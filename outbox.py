@@ -0,0 +1,72 @@
+from vacuumworld.model.actions.vwactions import VWAction
+from vacuumworld.model.actions.vwbroadcast_action import VWBroadcastAction
+from vacuumworld.model.actions.vwspeak_action import VWSpeakAction
+
+import codec
+from codec import AgentMessage, MessageKey, Section
+
+
+class Outbox:
+    def __init__(self) -> None:
+        # Messages for every agent, in the order they were announced
+        self.__announcements: list[AgentMessage] = []
+        # Messages queued per recipient id, in the order they were added
+        self.__queued: dict[str, list[AgentMessage]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__announcements) + sum(len(q) for q in self.__queued.values())
+
+    def __is_pending(self, pending: list[AgentMessage], message: AgentMessage) -> bool:
+        # same command with same fields already waiting to be sent
+        return message in pending
+
+    def add(self, recipient_id: str, message: AgentMessage) -> None:
+        # queue message behind anything else pending for recipient,
+        # skipping it if an identical one has not been sent yet
+        if not recipient_id:
+            return
+        queue: list[AgentMessage] = self.__queued.setdefault(recipient_id, [])
+        if not self.__is_pending(queue, message):
+            queue.append(message)
+
+    def announce(self, message: AgentMessage) -> None:
+        # queue message for every agent
+        if not self.__is_pending(self.__announcements, message):
+            self.__announcements.append(message)
+
+    def __sections(self) -> list[Section]:
+        # recipients with identical queues share one multicast section
+        grouped: dict[tuple[MessageKey, ...], Section] = {}
+        for recipient_id, queue in self.__queued.items():
+            key: tuple[MessageKey, ...] = tuple(m.key() for m in queue)
+            grouped.setdefault(key, ([], queue))[0].append(recipient_id)
+        return list(grouped.values())
+
+    def flush(self, sender_id: str) -> list[VWAction]:
+        # pack everything pending into at most one speak or broadcast action,
+        # empty list if nothing is pending
+        if not self.__announcements and not self.__queued:
+            return []
+
+        sections: list[Section] = self.__sections()
+        action: VWAction
+        if self.__announcements:
+            # one broadcast carries the announcements and the directed sections
+            sections.insert(0, ([], self.__announcements))
+            action = VWBroadcastAction(
+                message=codec.encode_batch(sections), sender_id=sender_id
+            )
+        else:
+            recipients: list[str] = [r for ids, _ in sections for r in ids]
+            # a lone section needs no ids, the speak action already addresses it
+            if len(sections) == 1:
+                sections = [([], sections[0][1])]
+            action = VWSpeakAction(
+                message=codec.encode_batch(sections),
+                recipients=recipients,
+                sender_id=sender_id,
+            )
+
+        self.__announcements = []
+        self.__queued = {}
+        return [action]
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 from typing import Iterable
-from pyoptional.pyoptional import PyOptional
 
 from vacuumworld import run
 from vacuumworld.common.vworientation import VWOrientation
@@ -15,45 +14,71 @@ from vacuumworld.model.actor.mind.surrogate.vwactor_mind_surrogate import (
     VWActorMindSurrogate,
 )
 
+from gridmodel import DIRT_COLOURS, EMPTY, GridModel
+from pathplanner import PathPlanner
+from tracelog import Level, trace
+from explorer import (
+    Exploration,
+    FrontierExplorer,
+    Pose,
+    corner_cell,
+    start_corner,
+)
+
 
 class ZigZagMind(VWActorMindSurrogate):
-    def __init__(self) -> None:
+    def __init__(self, exploration: Exploration = Exploration.zigzag) -> None:
         super(ZigZagMind, self).__init__()
 
         # Variable to store current stage:
         #  -1: just dropped onto grid
-        #   0: go to bottom right corner,
-        #   1: zigzag leftwards and upwards until top left corner
+        #   0: go to the corner cheapest to start the zigzag from,
+        #   1: zigzag away from that corner until the opposite one,
+        #      or visit frontier viewpoints until every cell is seen
         #   2: idle after complete exploration
         self.__stage: int = -1
 
-        # True if agent is found to be at east edge
-        self.__start_at_east_edge: bool = False
-        self.__start_at_south_edge: bool = False
+        # Corner the zigzag starts from, passes and intermissions run away from
+        # its walls, picked as the one cheapest to get to
+        self.__from_east: bool = True
+        self.__from_south: bool = True
 
-        # Agent self map: n x n array
-        #  -1: unexplored cell
+        # Agent self map: n x n grid model, grown to fit what is seen until n is known
+        # 255: unexplored cell
         #   0: empty cell
         #   1: orange dirt cell
         #   2: green dirt cell
-        self.__map: list[list[int]] = []
+        self.__map: GridModel = GridModel(0)
 
         # Grid size
         self.__n: int = -1
 
-        # Check booleans if at correct spot to start scan
-        self.__at_one_cell_from_east_edge: bool = False
-        self.__at_one_cell_from_south_edge: bool = False
+        # Whether the scan has started from the corner
         self.__started_scan: bool = False
 
         # Zigzag scan control variable
         #   -1: not started
-        # even: scan west
-        #  odd: scan east
+        # even: scan away from the side of the start corner
+        #  odd: scan back
         self.__scan_pass: int = -1
-        # Intermission scan (scan north between west/east scans)
+        # Intermission scan (scan north or south between west/east scans)
         self.__scan_inter: bool = False
 
+        # How to explore once grid size is known, alone there is nobody to split
+        # the grid into bands with, so exploring cooperatively is by frontier
+        self.__exploration: Exploration = exploration
+        if exploration == Exploration.cooperative:
+            self.__exploration = Exploration.frontier
+        # Picks viewpoints when exploring by frontier, sized once n is known
+        self.__explorer: FrontierExplorer = FrontierExplorer(0)
+        # Plans paths to frontier viewpoints, sized once n is known
+        self.__planner: PathPlanner = PathPlanner()
+        # Orientation to face and go
+        self.__direction_to_go: VWOrientation = VWOrientation.north
+
+    def get_stage(self) -> int:
+        return self.__stage
+
     ### REVISE FUNCTIONS ###
 
     def __is_one_step_from_wall(self, orientation: VWOrientation) -> bool:
@@ -62,143 +87,240 @@ class ZigZagMind(VWActorMindSurrogate):
             and self.get_latest_observation().is_wall_one_step_ahead()
         )
 
-    def __revise_stage_n1(self) -> None:
-        # if just dropped on grid
-        # first, check if agent is at east edge
-        if (
-            self.get_latest_observation()
-            .get_center()
-            .or_else_raise()
-            .has_wall_on_east()
-        ):
-            # if at east edge, size n is found
-            self.__n = self.get_own_position().get_x() + 1
-            self.__start_at_east_edge = True
-
-        # second, check if agent is at south edge
-        if (
-            self.get_latest_observation()
-            .get_center()
-            .or_else_raise()
-            .has_wall_on_south()
-        ):
-            # if at south edge, size n is found
-            self.__n = self.get_own_position().get_y() + 1
-            self.__start_at_south_edge = True
+    def __infer_n(self) -> None:
+        # any cell in view with a wall on its east or south gives n,
+        # the wall one step ahead included
+        for location in self.get_latest_observation().get_locations_in_order():
+            cell: VWLocation = location.or_else_raise()
+            if cell.has_wall_on_east():
+                self.__n = cell.get_coord().get_x() + 1
+            elif cell.has_wall_on_south():
+                self.__n = cell.get_coord().get_y() + 1
+
+    def __pick_corner(self) -> None:
+        # corner cheapest to get to and make the first pass from, given what is
+        # explored already, n is guessed if not known yet
+        self.__from_east, self.__from_south = start_corner(
+            self.__map,
+            self.__n,
+            self.get_own_position().get_x(),
+            self.get_own_position().get_y(),
+            self.get_own_orientation(),
+        )
 
-        # move to stage 0
-        self.__stage = 0
+    def __way_to_corner(self) -> VWOrientation | None:
+        # way to the corner the zigzag starts from, north or south first, then east
+        # or west, an east or south wall is headed for until n is known,
+        # None once there
+        legs: list[tuple[int, bool, VWOrientation, VWOrientation]] = [
+            (
+                self.get_own_position().get_y(),
+                self.__from_south,
+                VWOrientation.south,
+                VWOrientation.north,
+            ),
+            (
+                self.get_own_position().get_x(),
+                self.__from_east,
+                VWOrientation.east,
+                VWOrientation.west,
+            ),
+        ]
+        for position, far, forward, back in legs:
+            if far and self.__n <= 0:
+                return forward
+            target: int = corner_cell(self.__n, far) if self.__n > 0 else 1
+            if position < target:
+                return forward
+            if position > target:
+                return back
+        return None
 
-    def __revise_stage_0(self) -> None:
-        # if not start at east edge, should be going east until one cell away from east edge
-        if not self.__start_at_east_edge:
-            if self.__is_one_step_from_wall(VWOrientation.east):
-                self.__n = self.get_own_position().get_x() + 2
-                self.__at_one_cell_from_east_edge = True
-        else:
-            if self.get_own_position().get_x() == (self.__n - 2):
-                self.__at_one_cell_from_east_edge = True
+    def __revise_stage_n1(self) -> None:
+        # if just dropped on grid, keep what is in view and look for walls giving n
+        self.__observe_view()
+        self.__infer_n()
+
+        # pick corner to start the zigzag from
+        self.__pick_corner()
 
-        # if not start at south edge, should be going north until one cell away from south edge
-        if not self.__start_at_south_edge:
-            if self.__is_one_step_from_wall(VWOrientation.south):
-                self.__at_one_cell_from_south_edge = True
+        # move to stage 0, exploring by frontier only needs n,
+        # so go straight on to stage 1 if it is known already
+        if self.__exploration != Exploration.zigzag and self.__n > 0:
+            self.__stage = 1
         else:
-            if self.get_own_position().get_y() == (self.__n - 2):
-                self.__at_one_cell_from_south_edge = True
+            self.__stage = 0
 
-        # if current at bottom right, go to stage 1
-        if self.__at_one_cell_from_east_edge and self.__at_one_cell_from_south_edge:
+    def __revise_stage_0(self) -> None:
+        # keep what is seen on the way to the corner, looking for walls giving n
+        self.__observe_view()
+        n_known: bool = self.__n > 0
+        self.__infer_n()
+
+        # exploring by frontier only needs n
+        if self.__exploration != Exploration.zigzag:
+            if self.__n > 0:
+                self.__stage = 1
+            return
+
+        # corner was picked on a guess of n, pick again once n is known
+        if not n_known and self.__n > 0:
+            self.__pick_corner()
+
+        # if at corner, go to stage 1, n is not known yet if the corner is in the
+        # north west, the first pass finds it
+        if self.__way_to_corner() is None:
             self.__stage = 1
-            print(f"Grid size n={self.__n}")
 
     def __is_map_populated(self) -> bool:
-        # loop through agent self map, return if all cells explored (no -1 values in 2d array)
-        for x in range(self.__n):
-            for y in range(self.__n):
-                if self.__map and self.__map[x][y] == -1:
-                    return False
-        return True
-
-    def __observe_cell(self, cell: VWLocation) -> None:
-        # get x y coord of cell
-        cell_x: int = cell.get_coord().get_x()
-        cell_y: int = cell.get_coord().get_y()
-
-        # check if cell has dirt, if so, find its colour and save to map
-        if cell.has_dirt():
-            dirt_colour: str = str(
-                cell.get_dirt_appearance().or_else_raise().get_colour()
-            )
-            if dirt_colour == "orange":
-                self.__map[cell_x][cell_y] = 1
-            elif dirt_colour == "green":
-                self.__map[cell_x][cell_y] = 2
-        # if no dirt, save to map as empty
-        else:
-            self.__map[cell_x][cell_y] = 0
+        # all cells explored when grid model, cut down to n x n, has no unexplored
+        # cells left
+        return self.__map.get_n() == self.__n and self.__map.is_fully_explored()
+
+    def __observe_cells(self, cells: list[VWLocation]) -> None:
+        # read x y and value of each observed cell, then save them to map in one go
+        xs: list[int] = []
+        ys: list[int] = []
+        values: list[int] = []
+        for cell in cells:
+            xs.append(cell.get_coord().get_x())
+            ys.append(cell.get_coord().get_y())
+
+            # check if cell has dirt, if so, find its colour, else it is empty
+            if cell.has_dirt():
+                dirt_colour: str = str(
+                    cell.get_dirt_appearance().or_else_raise().get_colour()
+                )
+                values.append(DIRT_COLOURS.get(dirt_colour, EMPTY))
+            else:
+                values.append(EMPTY)
+
+        # grid size may not be known yet, so grow map to fit whatever is seen,
+        # doubling to keep regrowth rare
+        largest: int = max(xs + ys, default=-1)
+        if largest >= self.__map.get_n():
+            self.__map.resize(max(largest + 1, 2 * self.__map.get_n()))
+        self.__map.update(xs, ys, values)
+
+    def __observe_view(self) -> None:
+        # observe the 6 cells in view
+        self.__observe_cells(
+            [
+                cell.or_else_raise()
+                for cell in self.get_latest_observation().get_locations_in_order()
+            ]
+        )
 
-    def __scan_grid(self) -> None:
-        # if scanning west and one step from west wall, start going north for at most 3 cells
-        if self.__scan_pass % 2 == 0 and self.__is_one_step_from_wall(
-            VWOrientation.west
-        ):
-            self.__scan_inter = True
-            self.__scan_inter_start = self.get_own_position().get_y()
+    def __is_pass_known(self) -> bool:
+        # whether a pass along own row would see nothing new, the row and the one
+        # either side being explored already, never so before n is known
+        y: int = self.get_own_position().get_y()
+        return self.__n > 0 and all(
+            self.__map.is_row_explored(row)
+            for row in range(max(y - 1, 0), min(y + 2, self.__n))
+        )
 
-        # similar to west wall condition above, start going north for at most 3 cells
-        if self.__scan_pass % 2 == 1 and self.__is_one_step_from_wall(
-            VWOrientation.east
-        ):
+    def __pass_orientation(self, scan_pass: int) -> VWOrientation:
+        # even passes go away from the side the zigzag started on, odd ones back
+        if (scan_pass % 2 == 0) == self.__from_east:
+            return VWOrientation.west
+        return VWOrientation.east
+
+    def __onward(self) -> VWOrientation:
+        # intermissions go away from the end the zigzag started on
+        return VWOrientation.north if self.__from_south else VWOrientation.south
+
+    def __scan_grid(self) -> None:
+        # if one step from the wall the pass is heading for, start going onward
+        # for at most 3 cells
+        if self.__is_one_step_from_wall(self.__pass_orientation(self.__scan_pass)):
             self.__scan_inter = True
             self.__scan_inter_start = self.get_own_position().get_y()
 
-        # if need to go north, stop if one step away from north wall or 3 cells above last pass
+        # if need to go onward, stop if one step away from the wall ahead or 3 cells
+        # past last pass, going on past passes that would see nothing new
         if self.__scan_inter and (
-            self.__scan_inter_start - self.get_own_position().get_y() > 2
-            or self.__is_one_step_from_wall(VWOrientation.north)
+            (
+                abs(self.__scan_inter_start - self.get_own_position().get_y()) > 2
+                and not self.__is_pass_known()
+            )
+            or self.__is_one_step_from_wall(self.__onward())
         ):
             self.__scan_inter = False
             self.__scan_pass += 1
 
-        # each pass, get a list of 6 cells ahead of agent
-        observed_cells: list[
-            PyOptional[VWLocation]
-        ] = self.get_latest_observation().get_locations_in_order()
-        # observe the 6 cells
-        for cell in observed_cells:
-            cell = cell.or_else_raise()
-            self.__observe_cell(cell)
-
-    def __revise_stage_1(self) -> None:
-        # initialise agent self map with size n x n
-        if not self.__map:
-            self.__map = [[-1 for _ in range(self.__n)] for _ in range(self.__n)]
+        # each pass, observe the 6 cells ahead of agent
+        self.__observe_view()
 
-        # start scan if oriented east at bottom right
-        if not self.__started_scan and self.get_own_appearance().is_facing_east():
-            self.__started_scan = True
-            self.__scan_pass = 0
+    def __scan_frontier(self) -> None:
+        # observe the 6 cells in view, then head for the viewpoint revealing
+        # most unexplored cells per cycle, turning to face its way once there
+        self.__observe_view()
+        position: tuple[int, int] = (
+            self.get_own_position().get_x(),
+            self.get_own_position().get_y(),
+        )
+        pose: Pose | None = self.__explorer.next_pose(
+            self.__map, *position, self.get_own_orientation()
+        )
+        if pose is None:
+            return
+
+        x, y, orientation = pose
+        planned: VWOrientation | None = None
+        if position != (x, y):
+            planned = self.__planner.next_step(
+                position, self.get_own_orientation(), (x, y)
+            )
+        self.__direction_to_go = planned if planned is not None else orientation
 
-        if self.__started_scan:
-            self.__scan_grid()
+    def __revise_stage_1(self) -> None:
+        # if the zigzag started before n was known, the first pass finds it
+        if self.__n <= 0:
+            self.__infer_n()
+
+        # cut agent self map down to size n x n, keeping what was seen before
+        if self.__n > 0 and self.__planner.get_n() != self.__n:
+            trace(Level.info, self.get_own_colour(), "grid size n={}", self.__n)
+            self.__map.resize(self.__n)
+            self.__explorer = FrontierExplorer(self.__n)
+            self.__planner = PathPlanner(self.__n)
+
+        if self.__exploration == Exploration.frontier:
+            self.__scan_frontier()
+        else:
+            # start scan once at corner facing the wall the first pass starts from
+            if not self.__started_scan and self.get_own_appearance().is_facing(
+                self.__pass_orientation(1)
+            ):
+                self.__started_scan = True
+                self.__scan_pass = 0
+                # if the first pass was all seen on the way to the corner,
+                # start going onward instead, the pass after goes the same way
+                if self.__is_pass_known():
+                    self.__scan_pass = -1
+                    self.__scan_inter = True
+                    self.__scan_inter_start = self.get_own_position().get_y()
+
+            if self.__started_scan:
+                self.__scan_grid()
 
         # move to stage 2 idle if map populated
         if self.__is_map_populated():
             self.__stage = 2
+            self.__revise_stage_2()
 
     def __revise_stage_2(self) -> None:
-        # after exploration is done print out grid size and agent's internal map
-        print(f"Grid size n = {self.__n}")
-
-        # flip horizontal and rotate -90deg to flip x y axis in array representation
-        print("Agent internal map: 0 = empty cell, 1 = orange dirt, 2 = green dirt")
-        grid_str: str = ""
-        for x in range(self.__n):
-            for y in range(self.__n):
-                grid_str += f"{self.__map[y][x]} "
-            grid_str += "\n"
-        print(grid_str)
+        # once exploration is done trace grid size and agent's internal map
+        trace(Level.info, self.get_own_colour(), "grid size n = {}", self.__n)
+
+        # grid model prints rows top to bottom, so x y axis read as on screen
+        trace(
+            Level.info,
+            self.get_own_colour(),
+            "internal map: 0 = empty cell, 1 = orange dirt, 2 = green dirt\n{}",
+            self.__map,
+        )
 
     def revise(self) -> None:
         if self.__stage == 1:
@@ -207,8 +329,6 @@ class ZigZagMind(VWActorMindSurrogate):
             self.__revise_stage_0()
         elif self.__stage == -1:
             self.__revise_stage_n1()
-        elif self.__stage == 2:
-            self.__revise_stage_2()
 
     ### DECIDE FUNCTIONS ###
 
@@ -221,38 +341,33 @@ class ZigZagMind(VWActorMindSurrogate):
             return [VWTurnAction(VWDirection.left)]
 
     def __explore(self) -> Iterable[VWAction]:
-        # after scan started, go left and start scanning
-        # if scan_pass is even go west, odd go east, if intermission scan go north
+        # exploring by frontier, go the way worked out in revise
+        if self.__exploration == Exploration.frontier:
+            return self.__go_towards(self.__direction_to_go)
+
+        # after scan started, go along the pass, or onward between passes
         if self.__started_scan:
             if self.__scan_inter:
-                return self.__go_towards(VWOrientation.north)
-            if self.__scan_pass % 2 == 0:
-                return self.__go_towards(VWOrientation.west)
-            else:
-                return self.__go_towards(VWOrientation.east)
+                return self.__go_towards(self.__onward())
+            return self.__go_towards(self.__pass_orientation(self.__scan_pass))
 
-        # if start scan criteria not met, try to turn east
-        if not self.get_own_appearance().is_facing_east():
-            return self.__go_towards(VWOrientation.east)
+        # if start scan criteria not met, face the wall the first pass starts from
+        if not self.get_own_appearance().is_facing(self.__pass_orientation(1)):
+            return self.__go_towards(self.__pass_orientation(1))
 
         return [VWIdleAction()]
 
-    def __go_bottom_right(self) -> Iterable[VWAction]:
-        # At this line robot should be one cell away from east edge
-        # now go until one cell away from south edge
-        if not self.__at_one_cell_from_south_edge:
-            if not self.__start_at_south_edge:
-                return self.__go_towards(VWOrientation.south)
-            else:
-                return self.__go_towards(VWOrientation.north)
-
-        # If this code line is reachable, robot is oriented properly
-        # now go until one cell away from east edge
-        if not self.__at_one_cell_from_east_edge:
-            if not self.__start_at_east_edge:
+    def __go_to_corner(self) -> Iterable[VWAction]:
+        # exploring by frontier, head for whichever of the east and
+        # south walls is nearer to find n, it is on the side of the larger of x and y
+        if self.__exploration != Exploration.zigzag:
+            if self.get_own_position().get_x() > self.get_own_position().get_y():
                 return self.__go_towards(VWOrientation.east)
-            else:
-                return self.__go_towards(VWOrientation.west)
+            return self.__go_towards(VWOrientation.south)
+
+        way: VWOrientation | None = self.__way_to_corner()
+        if way is not None:
+            return self.__go_towards(way)
 
         return [VWIdleAction()]
 
@@ -260,7 +375,7 @@ class ZigZagMind(VWActorMindSurrogate):
         if self.__stage == 1:
             return self.__explore()
         elif self.__stage == 0:
-            return self.__go_bottom_right()
+            return self.__go_to_corner()
 
         return [VWIdleAction()]
 
@@ -1,10 +1,8 @@
 #!/usr/bin/env python3
-import math
-import json
+import random
 from typing import Iterable
 from pyoptional.pyoptional import PyOptional
 
-from pystarworldsturbo.common.message import BccMessage
 from vacuumworld import run
 from vacuumworld.common.vwcoordinates import VWCoord
 from vacuumworld.common.vwobservation import VWObservation
@@ -14,9 +12,7 @@ from vacuumworld.model.actions.vwactions import VWAction
 from vacuumworld.model.actions.vwclean_action import VWCleanAction
 from vacuumworld.model.actions.vwidle_action import VWIdleAction
 from vacuumworld.model.actions.vwmove_action import VWMoveAction
-from vacuumworld.model.actions.vwspeak_action import VWSpeakAction
 from vacuumworld.model.actions.vwturn_action import VWTurnAction
-from vacuumworld.model.actions.vwbroadcast_action import VWBroadcastAction
 from vacuumworld.model.actor.appearance.vwactor_appearance import VWActorAppearance
 from vacuumworld.model.environment.vwlocation import VWLocation
 from vacuumworld.model.actions.vweffort import VWActionEffort
@@ -24,62 +20,121 @@ from vacuumworld.model.actor.mind.surrogate.vwactor_mind_surrogate import (
     VWActorMindSurrogate,
 )
 
+from gridmodel import DIRT_COLOURS, EMPTY, GridModel
+from spatialindex import BucketGrid
+from coordset import CoordSet
+import codec
+from codec import AgentMessage, Command
+from outbox import Outbox
+from tracelog import Level, trace
+from pathplanner import PathPlanner
+from progress import YIELD_CYCLES, ProgressMonitor, Resolution, cells_around
+from fingerprint import ObservationKey, observation_key
+from distanceoracle import DistanceOracle, get_oracle
+from explorer import (
+    Exploration,
+    FrontierExplorer,
+    Pose,
+    assign_regions,
+    best_sweep,
+    corner_cell,
+    split_rows,
+    start_corner,
+)
+from tourplanner import improve_around, insert_stops, plan_tour
+from registry import AgentRegistry
+
 
 class ZigZagMind(VWActorMindSurrogate):
-    def __init__(self) -> None:
+    def __init__(
+        self, exploration: Exploration = Exploration.zigzag, pipelined: bool = False
+    ) -> None:
         super(ZigZagMind, self).__init__()
 
         # Variable to store current stage:
         #  -1: just dropped onto grid
-        #   0: go to bottom right corner,
-        #   1: zigzag leftwards and upwards until top left corner
+        #   0: go to the corner cheapest to start the zigzag from,
+        #   1: zigzag away from that corner until the opposite one,
+        #      or visit frontier viewpoints until every cell is seen
         #   2: help clean the grid
         #   3: idle after complete cleaning
         self.__stage: int = -1
 
-        # True if agent is found to be at east/south edge
-        self.__start_at_east_edge: bool = False
-        self.__start_at_south_edge: bool = False
+        # Corner the zigzag starts from, passes and intermissions run away from
+        # its walls, picked as the one cheapest to get to
+        self.__from_east: bool = True
+        self.__from_south: bool = True
 
-        # Agent self map: n x n array
-        #  -1: unexplored cell
+        # Agent self map: n x n grid model, grown to fit what is seen until n is known
+        # 255: unexplored cell
         #   0: empty cell
         #   1: orange dirt cell
         #   2: green dirt cell
-        self.__map: list[list[int]] = []
-        self.__dirt_loc: dict[str, list[str]] = {"orange": [], "green": []}
+        self.__map: GridModel = GridModel(0)
+        self.__dirt_loc: dict[str, CoordSet] = {
+            "orange": CoordSet(),
+            "green": CoordSet(),
+        }
+        # Spatial index per dirt colour for nearest dirt queries, kept in sync with dirt loc
+        self.__dirt_index: dict[str, BucketGrid] = {}
 
         # Grid size
         self.__n: int = -1
 
-        # Check booleans if at correct spot to start scan
-        self.__at_one_cell_from_east_edge: bool = False
-        self.__at_one_cell_from_south_edge: bool = False
+        # Whether the scan has started from the corner
         self.__started_scan: bool = False
 
         # Zigzag scan control variable
         #   -1: not started
-        # even: scan west
-        #  odd: scan east
+        # even: scan away from the side of the start corner
+        #  odd: scan back
         self.__scan_pass: int = -1
-        # Intermission scan (scan north between west/east scans)
+        # Intermission scan (scan north or south between west/east scans)
         self.__scan_inter: bool = False
 
-        # Store announcement as string
-        self.__announcement: str = ""
-        # Store message to send this cycle, tuple of agent id and message
-        self.__next_message: tuple[str, str] = ("", "")
-        # Dictinoary of queued messages, agent id as key and message string as value
-        self.__queued_messages: dict[str, str] = {}
-        # List of agents to be populated by roll call
-        self.__agent_list: list[dict[str, str]] = []
+        # How to explore once grid size is known
+        self.__exploration: Exploration = exploration
+        # Picks viewpoints when exploring by frontier, sized once n is known
+        self.__explorer: FrontierExplorer = FrontierExplorer(0)
+        # Viewpoints still to visit in own band when exploring cooperatively
+        self.__poses: list[Pose] = []
+        # Whether bands have been handed out to the agents
+        self.__split_grid: bool = False
+
+        # Whether to hand dirt out as soon as it is found, so cleaning overlaps
+        # exploring, rather than all at once when the map is complete
+        self.__pipelined: bool = pipelined
+        # Dirt found this cycle and not yet handed out, by colour
+        self.__found_dirt: dict[str, list[tuple[int, int]]] = {}
+
+        # Messages waiting to be sent, batched into one payload per cycle
+        self.__outbox: Outbox = Outbox()
+        # Messages received this cycle, decoded once for every listener
+        self.__received: list[AgentMessage] = []
+        # Whether where the agents reporting this cycle are was kept already
+        self.__kept_agents: bool = False
+        # Agents answering roll call, by id and colour, kept up to date as they
+        # report where they are
+        self.__agents: AgentRegistry = AgentRegistry()
+        # Cycles since the first, to tell when each agent was last heard from
+        self.__cycle: int = -1
         # If not true then should announce dirt locations
         self.__announced_dirt_loc: bool = False
         # If asked agent, set to 2, auto decrement by one each revise.
         self.__ask_agent_cooldown: int = 0
+        # Times each cleaner getting nowhere was sent somewhere, by id
+        self.__arbitrations: dict[str, int] = {}
+        # Recent states, to tell when self is getting nowhere and what to try
+        self.__monitor: ProgressMonitor = ProgressMonitor()
+        # Picks the cell to side-step to, seeded so runs can be reproduced
+        self.__random: random.Random = random.Random(0)
 
         # Next target coordinate
         self.__coord_to_go: VWCoord = VWCoord(-1, -1)
+        # Plans paths to target coordinate, sized to grid once explored
+        self.__planner: PathPlanner = PathPlanner()
+        # Cycles needed to reach any cell, sized to grid once explored
+        self.__oracle: DistanceOracle = get_oracle(1)
         # Next target orientation
         self.__direction_to_go: VWOrientation = VWOrientation.north
         # Whether this agent should clean the current cell
@@ -87,6 +142,12 @@ class ZigZagMind(VWActorMindSurrogate):
         # Store what colour dirt this agent is looking to clean
         self.__now_cleaning_colour: str = ""
 
+    def get_stage(self) -> int:
+        return self.__stage
+
+    def get_stall_counts(self) -> dict[str, int]:
+        return self.__monitor.get_counts()
+
     ### REVISE FUNCTIONS ###
 
     def __is_one_step_from_wall(self, orientation: VWOrientation) -> bool:
@@ -95,210 +156,422 @@ class ZigZagMind(VWActorMindSurrogate):
             and self.get_latest_observation().is_wall_one_step_ahead()
         )
 
-    def __revise_stage_n1(self) -> None:
-        # if just dropped on grid
-        # first, check if agent is at east edge
-        if (
-            self.get_latest_observation()
-            .get_center()
-            .or_else_raise()
-            .has_wall_on_east()
-        ):
-            # if at east edge, size n is found
-            self.__n = self.get_own_position().get_x() + 1
-            self.__start_at_east_edge = True
+    def __infer_n(self) -> None:
+        # any cell in view with a wall on its east or south gives n,
+        # the wall one step ahead included
+        for location in self.get_latest_observation().get_locations_in_order():
+            cell: VWLocation = location.or_else_raise()
+            if cell.has_wall_on_east():
+                self.__n = cell.get_coord().get_x() + 1
+            elif cell.has_wall_on_south():
+                self.__n = cell.get_coord().get_y() + 1
+
+    def __pick_corner(self) -> None:
+        # corner cheapest to get to and make the first pass from, given what is
+        # explored already, n is guessed if not known yet
+        self.__from_east, self.__from_south = start_corner(
+            self.__map,
+            self.__n,
+            self.get_own_position().get_x(),
+            self.get_own_position().get_y(),
+            self.get_own_orientation(),
+        )
 
-        # second, check if agent is at south edge
-        if (
-            self.get_latest_observation()
-            .get_center()
-            .or_else_raise()
-            .has_wall_on_south()
-        ):
-            # if at south edge, size n is found
-            self.__n = self.get_own_position().get_y() + 1
-            self.__start_at_south_edge = True
+    def __way_to_corner(self) -> VWOrientation | None:
+        # way to the corner the zigzag starts from, north or south first, then east
+        # or west, an east or south wall is headed for until n is known,
+        # None once there
+        legs: list[tuple[int, bool, VWOrientation, VWOrientation]] = [
+            (
+                self.get_own_position().get_y(),
+                self.__from_south,
+                VWOrientation.south,
+                VWOrientation.north,
+            ),
+            (
+                self.get_own_position().get_x(),
+                self.__from_east,
+                VWOrientation.east,
+                VWOrientation.west,
+            ),
+        ]
+        for position, far, forward, back in legs:
+            if far and self.__n <= 0:
+                return forward
+            target: int = corner_cell(self.__n, far) if self.__n > 0 else 1
+            if position < target:
+                return forward
+            if position > target:
+                return back
+        return None
 
-        # move to stage 0
-        self.__stage = 0
+    def __revise_stage_n1(self) -> None:
+        # if just dropped on grid, keep what is in view and look for walls giving n
+        self.__observe_view()
+        self.__infer_n()
 
-    def __revise_stage_0(self) -> None:
-        # if not start at east edge, should be going east until one cell away from east edge
-        if not self.__start_at_east_edge:
-            if self.__is_one_step_from_wall(VWOrientation.east):
-                self.__n = self.get_own_position().get_x() + 2
-                self.__at_one_cell_from_east_edge = True
-        else:
-            if self.get_own_position().get_x() == (self.__n - 2):
-                self.__at_one_cell_from_east_edge = True
+        # pick corner to start the zigzag from
+        self.__pick_corner()
 
-        # if not start at south edge, should be going north until one cell away from south edge
-        if not self.__start_at_south_edge:
-            if self.__is_one_step_from_wall(VWOrientation.south):
-                self.__at_one_cell_from_south_edge = True
+        # move to stage 0, exploring by frontier or cooperatively only needs n,
+        # so go straight on to stage 1 if it is known already
+        if self.__exploration != Exploration.zigzag and self.__n > 0:
+            self.__stage = 1
         else:
-            if self.get_own_position().get_y() == (self.__n - 2):
-                self.__at_one_cell_from_south_edge = True
+            self.__stage = 0
 
-        # if current at bottom right, go to stage 1
-        if self.__at_one_cell_from_east_edge and self.__at_one_cell_from_south_edge:
+    def __revise_stage_0(self) -> None:
+        # keep what is seen on the way to the corner, looking for walls giving n
+        self.__observe_view()
+        n_known: bool = self.__n > 0
+        self.__infer_n()
+
+        # exploring by frontier or cooperatively only needs n
+        if self.__exploration != Exploration.zigzag:
+            if self.__n > 0:
+                self.__stage = 1
+            return
+
+        # corner was picked on a guess of n, pick again once n is known
+        if not n_known and self.__n > 0:
+            self.__pick_corner()
+
+        # if at corner, go to stage 1, n is not known yet if the corner is in the
+        # north west, the first pass finds it
+        if self.__way_to_corner() is None:
             self.__stage = 1
-            print(f"Grid size n={self.__n}")
 
     def __is_map_populated(self) -> bool:
-        # loop through agent self map, return if all cells explored (no -1 values in 2d array)
-        for x in range(self.__n):
-            for y in range(self.__n):
-                if self.__map and self.__map[x][y] == -1:
-                    return False
-        return True
+        # all cells explored when grid model, cut down to n x n, has no unexplored
+        # cells left
+        return self.__map.get_n() == self.__n and self.__map.is_fully_explored()
+
+    def __observe_cells(self, cells: list[VWLocation]) -> None:
+        # read x y and value of each observed cell, then save them to map in one go
+        xs: list[int] = []
+        ys: list[int] = []
+        values: list[int] = []
+        for cell in cells:
+            xs.append(cell.get_coord().get_x())
+            ys.append(cell.get_coord().get_y())
+
+            # check if cell has dirt, if so, find its colour, else it is empty
+            if cell.has_dirt():
+                dirt_colour: str = str(
+                    cell.get_dirt_appearance().or_else_raise().get_colour()
+                )
+                values.append(DIRT_COLOURS.get(dirt_colour, EMPTY))
+            else:
+                values.append(EMPTY)
+
+        # grid size may not be known yet, so grow map to fit whatever is seen,
+        # doubling to keep regrowth rare
+        largest: int = max(xs + ys, default=-1)
+        if largest >= self.__map.get_n():
+            self.__map.resize(max(largest + 1, 2 * self.__map.get_n()))
+        self.__map.update(xs, ys, values)
+        # dirt seen before stage 1 knows n is found once it does
+        if self.__pipelined and self.__stage == 1 and self.__n > 0:
+            self.__find_dirt(xs, ys, values)
+
+    def __find_dirt(self, xs: list[int], ys: list[int], values: list[int]) -> None:
+        # keep dirt seen for the first time, to be handed out at the end of the cycle
+        colours: dict[int, str] = {
+            value: colour for colour, value in DIRT_COLOURS.items()
+        }
+        for x, y, value in zip(xs, ys, values):
+            colour: str | None = colours.get(value)
+            if colour is not None and self.__dirt_loc[colour].add(x, y):
+                self.__dirt_index[colour].insert(x, y)
+                self.__found_dirt.setdefault(colour, []).append((x, y))
+
+    def __hand_out_dirt(self) -> None:
+        # forget dirt cleaners report cleaned, then announce dirt found this cycle,
+        # cleaners fit it into the tour they are already on
+        self.__keep_agents()
+        for message in self.__received:
+            if message.get_command() == Command.aboutme:
+                self.__listen_dirt_update(message)
+        if self.__found_dirt:
+            self.__outbox.announce(codec.clean(self.__found_dirt))
+            self.__found_dirt = {}
+
+    def __observe_view(self) -> None:
+        # observe the 6 cells in view
+        self.__observe_cells(
+            [
+                cell.or_else_raise()
+                for cell in self.get_latest_observation().get_locations_in_order()
+            ]
+        )
 
-    def __observe_cell(self, cell: VWLocation) -> None:
-        # get x y coord of cell
-        cell_x: int = cell.get_coord().get_x()
-        cell_y: int = cell.get_coord().get_y()
+    def __is_pass_known(self) -> bool:
+        # whether a pass along own row would see nothing new, the row and the one
+        # either side being explored already, never so before n is known
+        y: int = self.get_own_position().get_y()
+        return self.__n > 0 and all(
+            self.__map.is_row_explored(row)
+            for row in range(max(y - 1, 0), min(y + 2, self.__n))
+        )
 
-        # check if cell has dirt, if so, find its colour and save to map
-        if cell.has_dirt():
-            dirt_colour: str = str(
-                cell.get_dirt_appearance().or_else_raise().get_colour()
-            )
-            if dirt_colour == "orange":
-                self.__map[cell_x][cell_y] = 1
-            elif dirt_colour == "green":
-                self.__map[cell_x][cell_y] = 2
-        # if no dirt, save to map as empty
-        else:
-            self.__map[cell_x][cell_y] = 0
+    def __pass_orientation(self, scan_pass: int) -> VWOrientation:
+        # even passes go away from the side the zigzag started on, odd ones back
+        if (scan_pass % 2 == 0) == self.__from_east:
+            return VWOrientation.west
+        return VWOrientation.east
 
-    def __scan_grid(self) -> None:
-        # if scanning west and one step from west wall, start going north for at most 3 cells
-        if self.__scan_pass % 2 == 0 and self.__is_one_step_from_wall(
-            VWOrientation.west
-        ):
-            self.__scan_inter = True
-            self.__scan_inter_start = self.get_own_position().get_y()
+    def __onward(self) -> VWOrientation:
+        # intermissions go away from the end the zigzag started on
+        return VWOrientation.north if self.__from_south else VWOrientation.south
 
-        # similar to west wall condition above, start going north for at most 3 cells
-        if self.__scan_pass % 2 == 1 and self.__is_one_step_from_wall(
-            VWOrientation.east
-        ):
+    def __scan_grid(self) -> None:
+        # if one step from the wall the pass is heading for, start going onward
+        # for at most 3 cells
+        if self.__is_one_step_from_wall(self.__pass_orientation(self.__scan_pass)):
             self.__scan_inter = True
             self.__scan_inter_start = self.get_own_position().get_y()
 
-        # if need to go north, stop if one step away from north wall or 3 cells above last pass
+        # if need to go onward, stop if one step away from the wall ahead or 3 cells
+        # past last pass, going on past passes that would see nothing new
         if self.__scan_inter and (
-            self.__scan_inter_start - self.get_own_position().get_y() > 2
-            or self.__is_one_step_from_wall(VWOrientation.north)
+            (
+                abs(self.__scan_inter_start - self.get_own_position().get_y()) > 2
+                and not self.__is_pass_known()
+            )
+            or self.__is_one_step_from_wall(self.__onward())
         ):
             self.__scan_inter = False
             self.__scan_pass += 1
 
-        # each pass, get a list of 6 cells ahead of agent
-        observed_cells: list[
-            PyOptional[VWLocation]
-        ] = self.get_latest_observation().get_locations_in_order()
-        # observe the 6 cells
-        for cell in observed_cells:
-            cell = cell.or_else_raise()
-            self.__observe_cell(cell)
+        # each pass, observe the 6 cells ahead of agent
+        self.__observe_view()
+
+    def __scan_frontier(self) -> None:
+        # observe the 6 cells in view, then head for the viewpoint revealing
+        # most unexplored cells per cycle, turning to face its way once there
+        self.__observe_view()
+        position: VWCoord = self.get_own_position()
+        pose: Pose | None = self.__explorer.next_pose(
+            self.__map, position.get_x(), position.get_y(), self.get_own_orientation()
+        )
+        if pose is None:
+            return
+
+        self.__head_for(pose)
+
+    def __head_for(self, pose: Pose) -> None:
+        # go to viewpoint, then turn to face its way
+        x, y, orientation = pose
+        self.__coord_to_go = VWCoord(x, y)
+        self.__direction_to_go = (
+            orientation
+            if self.get_own_position() == self.__coord_to_go
+            else self.__calc_direction_to_go()
+        )
+
+    def __scan_region(self) -> None:
+        # observe the 6 cells in view and merge those the cleaners stream back,
+        # hand out bands of rows once cleaners have answered roll call, then sweep
+        # own band, and explore whatever is still unexplored by frontier after that
+        self.__observe_view()
+        self.__listen_observations()
+        if not self.__agents:
+            return
+        if not self.__split_grid:
+            self.__split_regions()
+
+        position: VWCoord = self.get_own_position()
+        here: Pose = (position.get_x(), position.get_y(), self.get_own_orientation())
+        while self.__poses and self.__poses[0] == here:
+            self.__poses.pop(0)
+        pose: Pose | None = (
+            self.__poses[0]
+            if self.__poses
+            else self.__explorer.next_pose(self.__map, *here)
+        )
+        if pose is not None:
+            self.__head_for(pose)
+
+    def __split_regions(self) -> None:
+        # split grid into a band of rows per agent, white included, tell each
+        # cleaner its band and sweep own band
+        position: VWCoord = self.get_own_position()
+        agents: list[Pose] = [
+            (position.get_x(), position.get_y(), self.get_own_orientation())
+        ]
+        ids: list[str] = self.__agents.get_ids()
+        for agent_id in ids:
+            _, x, y, orientation, _ = self.__agents.get(agent_id)
+            agents.append((x, y, orientation))
+
+        regions = assign_regions(
+            self.__oracle, agents, split_rows(self.__n, len(agents))
+        )
+        for agent_id, region in zip(ids, regions[1:]):
+            if region is not None:
+                self.__add_message(agent_id, codec.explore(self.__n, *region))
+        if regions[0] is not None:
+            self.__poses = best_sweep(self.__oracle, *agents[0], regions[0])[1]
+        self.__split_grid = True
+
+    def __listen_observations(self) -> None:
+        # merge cells streamed by exploring cleaners into own map,
+        # and keep track of where cleaners are
+        for message in self.__received:
+            if message.get_command() == Command.observed:
+                self.__merge_cells(message)
+        self.__keep_agents()
+
+    def __merge_cells(self, message: AgentMessage) -> None:
+        # save cells another agent observed to map in one go
+        xs: list[int] = []
+        ys: list[int] = []
+        values: list[int] = []
+        for x, y in message.get_empty():
+            xs.append(x)
+            ys.append(y)
+            values.append(EMPTY)
+        for colour, value in DIRT_COLOURS.items():
+            for x, y in message.get_dirt(colour):
+                xs.append(x)
+                ys.append(y)
+                values.append(value)
+        self.__map.update(xs, ys, values)
+        # dirt seen before stage 1 knows n is found once it does
+        if self.__pipelined and self.__stage == 1 and self.__n > 0:
+            self.__find_dirt(xs, ys, values)
 
     def __revise_stage_1(self) -> None:
-        # initialise agent self map with size n x n
-        if not self.__map:
-            self.__map = [[-1 for _ in range(self.__n)] for _ in range(self.__n)]
+        # if the zigzag started before n was known, the first pass finds it
+        if self.__n <= 0:
+            self.__infer_n()
+
+        # cut agent self map down to size n x n, keeping what was seen before
+        if self.__n > 0 and self.__planner.get_n() != self.__n:
+            trace(Level.info, self.get_own_colour(), "grid size n={}", self.__n)
+            self.__map.resize(self.__n)
+            self.__explorer = FrontierExplorer(self.__n)
+            self.__planner = PathPlanner(self.__n)
+            self.__oracle = get_oracle(self.__n)
+            # dirt is kept track of as it is found when handing it out straight away
+            # and dirt seen before n was known is found now
+            if self.__pipelined:
+                for colour in self.__dirt_loc:
+                    self.__dirt_loc[colour] = CoordSet(self.__n)
+                    self.__dirt_index[colour] = BucketGrid(self.__n)
+                for colour, value in DIRT_COLOURS.items():
+                    coords: list[tuple[int, int]] = self.__map.get_dirt_coords(colour)
+                    self.__find_dirt(
+                        [x for x, _ in coords],
+                        [y for _, y in coords],
+                        [value] * len(coords),
+                    )
+
+        if self.__exploration == Exploration.frontier:
+            self.__scan_frontier()
+        elif self.__exploration == Exploration.cooperative:
+            self.__scan_region()
+        else:
+            # start scan once at corner facing the wall the first pass starts from
+            if not self.__started_scan and self.get_own_appearance().is_facing(
+                self.__pass_orientation(1)
+            ):
+                self.__started_scan = True
+                self.__scan_pass = 0
+                # if the first pass was all seen on the way to the corner,
+                # start going onward instead, the pass after goes the same way
+                if self.__is_pass_known():
+                    self.__scan_pass = -1
+                    self.__scan_inter = True
+                    self.__scan_inter_start = self.get_own_position().get_y()
 
-        # start scan if oriented east at bottom right
-        if not self.__started_scan and self.get_own_appearance().is_facing_east():
-            self.__started_scan = True
-            self.__scan_pass = 0
+            if self.__started_scan:
+                self.__scan_grid()
 
-        if self.__started_scan:
-            self.__scan_grid()
+        if self.__pipelined and self.__n > 0:
+            self.__hand_out_dirt()
 
         # move to stage 2 idle if map populated
         if self.__is_map_populated():
             self.__stage = 2
+            self.__coord_to_go = VWCoord(-1, -1)
 
     def __revise_stage_2(self) -> None:
         # after exploration is done print out grid size and agent's internal map
-        print(f"Grid size n = {self.__n}")
+        trace(Level.info, self.get_own_colour(), "grid size n = {}", self.__n)
+
+        # grid model prints rows top to bottom, so x y axis read as on screen
+        trace(
+            Level.info,
+            self.get_own_colour(),
+            "internal map: 0 = empty cell, 1 = orange dirt, 2 = green dirt\n{}",
+            self.__map,
+        )
 
-        # flip horizontal and rotate -90deg to flip x y axis in array representation
-        print("Agent internal map: 0 = empty cell, 1 = orange dirt, 2 = green dirt")
-        grid_str: str = ""
-        for x in range(self.__n):
-            for y in range(self.__n):
-                grid_str += f"{self.__map[y][x]} "
-            grid_str += "\n"
-        print(grid_str)
+        # plan paths and rank dirt within the explored grid from now on
+        self.__planner = PathPlanner(self.__n)
+        self.__oracle = get_oracle(self.__n)
 
-        # build arrays of coloured dirt to be announced to
-        self.__prepare_dirt_dict()
+        # build arrays of coloured dirt to be announced to, unless every dirt was
+        # announced as it was found
+        if self.__pipelined:
+            self.__announced_dirt_loc = True
+        else:
+            self.__prepare_dirt_dict()
 
     def __prepare_dirt_dict(self) -> None:
-        # prepare a dictionary containing dirt locations for orange and green
-        self.__dirt_loc = {"orange": [], "green": []}
-
-        # loop through white agent self map,
-        # append dirt locations to orange or green based on dirt colour
-        for x in range(self.__n):
-            for y in range(self.__n):
-                if self.__map[x][y] == 1:
-                    self.__dirt_loc["orange"].append(f"{x},{y}")
-                if self.__map[x][y] == 2:
-                    self.__dirt_loc["green"].append(f"{x},{y}")
-
-        # prepare the announcement as a dictionary
-        announcement: dict[str, list[str]] = {
-            "command": ["clean"],
-            "orange": self.__dirt_loc["orange"],
-            "green": self.__dirt_loc["green"],
-        }
-        # set the announcement as string to self variable to be sent
-        self.__announcement = json.dumps(announcement)
+        # pull dirt locations of each colour out of white agent self map
+        # into a dictionary of coord sets for orange and green
+        for colour in self.__dirt_loc:
+            dirt_coords: list[tuple[int, int]] = self.__map.get_dirt_coords(colour)
+            self.__dirt_loc[colour] = CoordSet(self.__n, dirt_coords)
+            self.__dirt_index[colour] = BucketGrid(self.__n)
+            for x, y in dirt_coords:
+                self.__dirt_index[colour].insert(x, y)
+
+        # prepare the announcement of all dirt and queue it for every agent
+        announcement: AgentMessage = codec.clean(
+            {colour: list(self.__dirt_loc[colour]) for colour in self.__dirt_loc}
+        )
+        self.__outbox.announce(announcement)
 
         # set this flag to true so this process wouldn't happen again
         self.__announced_dirt_loc = True
 
-    def __clear_announcement(self) -> None:
-        self.__announcement = ""
-
-    def __listen_roll_call(self) -> None:
-        # loops through received messages from orange and green,
-        # add their descriptions to agent list
-        for message in self.get_latest_received_messages():
-            message_content: dict[str, str] = json.loads(str(message.get_content()))
-            # now loop through agent list,
-            # if id match update coord,
-            # if no id match, add to agent list
-            for agent in self.__agent_list:
-                if message_content["id"] == agent["id"]:
-                    agent["coord"] = message_content["coord"]
-            if message_content not in self.__agent_list:
-                self.__agent_list.append(message_content)
+    def __keep_agents(self) -> None:
+        # keep where every agent reporting this cycle is, answering roll call or
+        # not, once whichever listener gets to it first
+        if self.__kept_agents:
+            return
+        self.__kept_agents = True
+        for message in self.__received:
+            if message.get_command() == Command.aboutme:
+                self.__add_agent(message)
+
+    def __add_agent(self, message: AgentMessage) -> None:
+        # keep where reporting agent is and which way it faces, in place of
+        # anything known of it before, north if it did not say
+        x, y = message.get_coord()
+        self.__agents.update(
+            message.get_sender_id(),
+            message.get_colour(),
+            x,
+            y,
+            (
+                VWOrientation(message.get_orientation())
+                if message.get_orientation()
+                else VWOrientation.north
+            ),
+            self.__cycle,
+        )
 
     def __prepare_roll_call(self) -> None:
         # prepare an announcement that tells commands orange and green to take roll
-        announcement: dict[str, list[str]] = {
-            "command": ["rollcall"],
-        }
-        self.__announcement = json.dumps(announcement)
-
-    def __add_message(self, actor_id: str, message: str) -> None:
-        # add given message to given actor id slot in queued messages
-        self.__queued_messages[actor_id] = message
-
-    def __prepare_message(self) -> None:
-        # if there are queued messages, get first message, remove it from queue
-        # then set it as next message
-        if self.__queued_messages:
-            self.__next_message = list(self.__queued_messages.items())[0]
-            agent_id = self.__next_message[0]
-            del self.__queued_messages[agent_id]
-        # else clear next message
-        else:
-            self.__next_message = ("", "")
+        self.__outbox.announce(codec.rollcall())
+
+    def __add_message(self, actor_id: str, message: AgentMessage) -> None:
+        # queue given message for given actor id, behind anything already queued for it
+        self.__outbox.add(actor_id, message)
 
     def __find_fw_fw_coord(self) -> VWCoord:
         own_pos: VWCoord = self.get_own_position()
@@ -312,6 +585,9 @@ class ZigZagMind(VWActorMindSurrogate):
         else:
             one_step_forward_coord = VWCoord(own_pos.get_x(), (own_pos.get_y() - 2))
 
+        # past the wall is nowhere to go, an agent sent there would never leave
+        if self.__is_past_wall(one_step_forward_coord):
+            return VWCoord(-1, -1)
         return one_step_forward_coord
 
     def __find_behind_coord(self) -> VWCoord:
@@ -326,8 +602,17 @@ class ZigZagMind(VWActorMindSurrogate):
         else:
             behind_coord = VWCoord(own_pos.get_x(), (own_pos.get_y() + 1))
 
+        # past the wall is nowhere to go, self would never get there
+        if self.__is_past_wall(behind_coord):
+            return VWCoord(-1, -1)
         return behind_coord
 
+    def __is_past_wall(self, coord: VWCoord) -> bool:
+        # off the grid, past the east and south walls only once n is known
+        x: int = coord.get_x()
+        y: int = coord.get_y()
+        return x < 0 or y < 0 or (self.__n > 0 and (x >= self.__n or y >= self.__n))
+
     def __find_cell_for_agent(
         self,
         my_orient: VWOrientation,
@@ -370,12 +655,14 @@ class ZigZagMind(VWActorMindSurrogate):
         )
         # if valid cell is found, set up message to ask the agent to move
         if goto != VWCoord(-1, -1):
-            instruction: dict[str, str | list[str]] = {
-                "command": ["getout"],
-                "goto": [f"{goto.get_x()},{goto.get_y()}"],
-            }
-            print(f"asking {actor.get_colour()} to go {goto}")
-            self.__add_message(actor.get_id(), json.dumps(instruction))
+            trace(
+                Level.event,
+                self.get_own_colour(),
+                "asking {} to go {}",
+                actor.get_colour(),
+                goto,
+            )
+            self.__add_message(actor.get_id(), codec.getout(goto.get_x(), goto.get_y()))
 
     def __check_agent_in_cell(self, location: PyOptional[VWLocation]) -> bool:
         # check is cell is valid and has actor
@@ -405,22 +692,118 @@ class ZigZagMind(VWActorMindSurrogate):
 
     def __listen_messages(self) -> None:
         # check messages, see if any agents report dirt cleaned, or request self to move
-        for message in self.get_latest_received_messages():
-            message_content: dict[str, str] = json.loads(str(message.get_content()))
-            if message_content["type"] == "aboutme":
-                self.__listen_dirt_update(message_content)
-            elif message_content["type"] == "moverequest":
-                self.__coord_to_go = self.__find_cell_for_self()
+        self.__keep_agents()
+        for message in self.__received:
+            if message.get_command() == Command.aboutme:
+                self.__listen_dirt_update(message)
+            elif message.get_command() == Command.moverequest:
+                self.__make_way()
+            elif message.get_command() == Command.stuck:
+                self.__send_aside(message.get_sender_id(), message.get_coord())
         # if no more dirt left, leave revise stage 2 (stage 3 is idle)
         if not self.__dirt_loc["orange"] and not self.__dirt_loc["green"]:
             self.__stage = 3
 
-    def __listen_dirt_update(self, message_content: dict[str, str]) -> None:
-        colour: str = message_content["colour"]
-        coord = message_content["coord"]
+    def __send_aside(self, agent_id: str, coord: tuple[int, int]) -> None:
+        # send a cleaner getting nowhere, or in the way of self getting nowhere,
+        # to a cell near it nobody was last seen on, a different one each time,
+        # it comes back for its dirt from there
+        taken: set[tuple[int, int]] = {
+            (self.get_own_position().get_x(), self.get_own_position().get_y())
+        }
+        for other_id in self.__agents.get_ids():
+            _, x, y, _, _ = self.__agents.get(other_id)
+            taken.add((x, y))
+        cells: list[tuple[int, int]] = [
+            cell
+            for cell in cells_around(*coord, self.__n)
+            if cell not in taken
+        ]
+        if not cells:
+            return
+        asked: int = self.__arbitrations.get(agent_id, 0)
+        self.__arbitrations[agent_id] = asked + 1
+        cell: tuple[int, int] = cells[asked % len(cells)]
+        trace(
+            Level.event,
+            self.get_own_colour(),
+            "sending {} getting nowhere to {}",
+            agent_id,
+            cell,
+        )
+        self.__add_message(agent_id, codec.getout(*cell))
+
+    def __check_progress(self) -> None:
+        # helping clean, find out if self is getting nowhere and try whatever is
+        # due, the next thing up if that cannot be tried
+        position: VWCoord = self.get_own_position()
+        resolution: Resolution = self.__monitor.check(
+            (
+                (position.get_x(), position.get_y()),
+                self.get_own_orientation(),
+                (self.__coord_to_go.get_x(), self.__coord_to_go.get_y()),
+            ),
+            self.__resolve,
+        )
+        if resolution != Resolution.none:
+            trace(
+                Level.event,
+                self.get_own_colour(),
+                "getting nowhere at {} going {}, {}",
+                position,
+                self.__coord_to_go,
+                resolution.name,
+            )
+
+    def __resolve(self, resolution: Resolution) -> bool:
+        # try a resolution, false if it cannot be tried, white has priority over
+        # every cleaner and nobody above it to arbitrate
+        observation: VWObservation = self.get_latest_observation()
+
+        # the agent in the way gives way, to a cell near it nobody is on
+        if resolution == Resolution.yielding:
+            forward_location: PyOptional[VWLocation] = observation.get_forward()
+            if not self.__check_agent_in_cell(forward_location):
+                return False
+            actor: VWActorAppearance = (
+                forward_location.or_else_raise().get_actor_appearance().or_else_raise()
+            )
+            forward: VWCoord = forward_location.or_else_raise().get_coord()
+            self.__send_aside(actor.get_id(), (forward.get_x(), forward.get_y()))
+            return True
+
+        # step to any empty cell beside or ahead, coming back for the target after
+        if resolution == Resolution.side_step:
+            cells: list[VWCoord] = [
+                location.or_else_raise().get_coord()
+                for location in (
+                    observation.get_left(),
+                    observation.get_right(),
+                    observation.get_forward(),
+                )
+                if self.__check_valid_empty_cell(location)
+            ]
+            if not cells:
+                return False
+            self.__coord_to_go = self.__random.choice(cells)
+            self.__direction_to_go = self.__calc_direction_to_go()
+            return True
+
+        return False
+
+    def __listen_dirt_update(self, message: AgentMessage) -> None:
+        # reporting agent is on the cell it cleaned, its position is kept already
+        colour: str = message.get_colour()
+        x, y = message.get_coord()
         # if agent reports dirt cleaned, remove from own list of dirt location
-        if coord in self.__dirt_loc[colour]:
-            self.__dirt_loc[colour].remove(coord)
+        self.__forget_dirt(colour, int(x), int(y))
+
+    def __make_way(self) -> None:
+        # go to an empty cell in view or behind, with none, keep going where self
+        # was going rather than dropping it, which would only bring self back here
+        cell: VWCoord = self.__find_cell_for_self()
+        if cell != VWCoord(-1, -1):
+            self.__coord_to_go = cell
 
     def __find_cell_for_self(self) -> VWCoord:
         # tries to find and return an empty spot for self to go when requested
@@ -439,8 +822,44 @@ class ZigZagMind(VWActorMindSurrogate):
         else:
             return self.__find_behind_coord()
 
+    def __observe_surroundings(self) -> None:
+        # cells in view bound the path planner to the grid,
+        # other actors on them are soft obstacles for it
+        locations: list[VWLocation] = [
+            cell.or_else_raise()
+            for cell in self.get_latest_observation().get_locations_in_order()
+        ]
+        seen: list[tuple[int, int]] = [
+            (location.get_coord().get_x(), location.get_coord().get_y())
+            for location in locations
+        ]
+        for x, y in seen:
+            self.__planner.observe(x, y)
+        self.__planner.set_obstacles(
+            seen,
+            (
+                (location.get_coord().get_x(), location.get_coord().get_y())
+                for location in locations
+                if location.has_actor()
+                and location.get_coord() != self.get_own_position()
+            ),
+        )
+
     def __calc_direction_to_go(self) -> VWOrientation:
         now_coord: VWCoord = self.get_own_position()
+
+        # follow planned path around other actors, one cached step per cycle
+        if self.__coord_to_go != VWCoord(-1, -1):
+            self.__observe_surroundings()
+            planned: VWOrientation | None = self.__planner.next_step(
+                (now_coord.get_x(), now_coord.get_y()),
+                self.get_own_orientation(),
+                (self.__coord_to_go.get_x(), self.__coord_to_go.get_y()),
+            )
+            if planned is not None:
+                return planned
+
+        # otherwise head straight for target
         delta_x: int = self.__coord_to_go.get_x() - now_coord.get_x()
         delta_y: int = self.__coord_to_go.get_y() - now_coord.get_y()
 
@@ -461,16 +880,13 @@ class ZigZagMind(VWActorMindSurrogate):
         else:
             return VWOrientation.south
 
-    def __get_coord_distance(
-        self,
-        agent_coord: VWCoord,
-        target_coord: VWCoord,
-    ) -> float:
-        # use pythagorean theorem to get distance between agent and target cell
-        delta_x: int = agent_coord.get_x() - target_coord.get_x()
-        delta_y: int = agent_coord.get_y() - target_coord.get_y()
-        distance = math.sqrt(delta_x**2 + delta_y**2)
-        return distance
+    def __forget_dirt(self, colour: str, x: int, y: int) -> bool:
+        # remove dirt from own set of dirt location and its spatial index,
+        # return whether it was there
+        if not self.__dirt_loc[colour].remove(x, y):
+            return False
+        self.__dirt_index[colour].remove(x, y)
+        return True
 
     def __calc_colour_to_clean(self) -> None:
         # choose colour to clean based on number of remaining dirt of each colour
@@ -483,21 +899,25 @@ class ZigZagMind(VWActorMindSurrogate):
     def __get_nearest_coord(self) -> VWCoord:
         # find and return the nearest dirt of the colour currently cleaning
         nearest_coord: VWCoord = VWCoord(-1, -1)
-        nearest_distance: float = math.inf
 
         agent_coord = self.get_own_position()
 
         # choose a colour to clean
         self.__calc_colour_to_clean()
 
-        # loop through all dirt currently cleaning, find the nearest dirt coord
-        for dirt_coord in self.__dirt_loc[self.__now_cleaning_colour]:
-            x, y = dirt_coord.split(",")
-            dirt_vwcoord: VWCoord = VWCoord(int(x), int(y))
-            dirt_distance: float = self.__get_coord_distance(agent_coord, dirt_vwcoord)
-            if dirt_distance < nearest_distance:
-                nearest_distance = dirt_distance
-                nearest_coord = dirt_vwcoord
+        # ask spatial index of that colour for the dirt reachable in fewest cycles
+        orientation: VWOrientation = self.get_own_orientation()
+        nearest: list[tuple[int, int]] = self.__dirt_index[
+            self.__now_cleaning_colour
+        ].nearest(
+            agent_coord.get_x(),
+            agent_coord.get_y(),
+            cost=lambda x, y: self.__oracle.cycles(
+                agent_coord.get_x(), agent_coord.get_y(), orientation, x, y
+            ),
+        )
+        if nearest:
+            nearest_coord = VWCoord(*nearest[0])
 
         return nearest_coord
 
@@ -522,9 +942,13 @@ class ZigZagMind(VWActorMindSurrogate):
             # tell master this place is cleaned, then
             # find another place to go
             else:
-                self_coord = f"{self.get_own_position().get_x()},{self.get_own_position().get_y()}"
-                if self_coord in self.__dirt_loc[self.__now_cleaning_colour]:
-                    self.__dirt_loc[self.__now_cleaning_colour].remove(self_coord)
+                # no colour chosen yet when moved out of the way before any dirt
+                if self.__now_cleaning_colour:
+                    self.__forget_dirt(
+                        self.__now_cleaning_colour,
+                        self.get_own_position().get_x(),
+                        self.get_own_position().get_y(),
+                    )
                 self.__should_clean = False
                 self.__find_coord_to_go()
 
@@ -537,27 +961,30 @@ class ZigZagMind(VWActorMindSurrogate):
     def __ask_agent_to_ignore(self) -> None:
         # after deciding a dirt to clean,
         # tell the cooresponding colour agent to ignore that spot
-        instruction: dict[str, str | list[str]] = {
-            "command": ["ignore"],
-            "coord": [f"{self.__coord_to_go.get_x()},{self.__coord_to_go.get_y()}"],
-        }
+        instruction: AgentMessage = codec.ignore(
+            self.__coord_to_go.get_x(), self.__coord_to_go.get_y()
+        )
         # prepare to send the instruction to the agents of said colour
-        for agent in self.__agent_list:
-            if agent["colour"] == self.__now_cleaning_colour:
-                self.__add_message(agent["id"], json.dumps(instruction))
+        for agent_id in self.__agents.get_colour_ids(self.__now_cleaning_colour):
+            self.__add_message(agent_id, instruction)
 
     def revise(self) -> None:
-        # clear announcement for each revise
-        self.__clear_announcement()
-
-        # if agent list not populated, start roll call and listen for response
-        if not self.__agent_list:
+        self.__cycle += 1
+        # decode what was received once, every listener reads it from the list
+        self.__received = [
+            message
+            for m in self.get_latest_received_messages()
+            for message in codec.decode(m)
+        ]
+        self.__kept_agents = False
+
+        # if no agent known yet, start roll call and listen for response
+        if not self.__agents:
             self.__prepare_roll_call()
-            self.__listen_roll_call()
-        # if agent list populated, detect obstacle and ask them to move if needed
+            self.__keep_agents()
+        # if agents known, detect obstacle and ask them to move if needed
         else:
             self.__detect_obstacle()
-            self.__prepare_message()
 
         if self.__stage == 1:
             self.__revise_stage_1()
@@ -579,40 +1006,33 @@ class ZigZagMind(VWActorMindSurrogate):
             # if requested to move find where to go
             self.__prepare_move()
 
+            # on the way somewhere, make sure self is getting there
+            if self.__coord_to_go not in (self.get_own_position(), VWCoord(-1, -1)):
+                self.__check_progress()
+
             # ask agent to ignore cleaned dirt if needed
             self.__ask_agent_to_ignore()
 
-            print(
-                f"white at {self.get_own_position()} facing {self.get_own_orientation()} going {self.__coord_to_go} towards {self.__direction_to_go}, now cleaning {self.__now_cleaning_colour}, should clean={self.__should_clean}"
+            trace(
+                Level.cycle,
+                self.get_own_colour(),
+                "at {} facing {} going {} towards {}, now cleaning {}, should clean={}",
+                self.get_own_position(),
+                self.get_own_orientation(),
+                self.__coord_to_go,
+                self.__direction_to_go,
+                self.__now_cleaning_colour,
+                self.__should_clean,
             )
 
     ### DECIDE FUNCTIONS ###
 
-    def __shout(self) -> VWAction:
-        return VWBroadcastAction(
-            message=self.__announcement, sender_id=self.get_own_id()
-        )
-
-    def __whisper(self, recipient_id: str, message: str) -> VWAction:
-        return VWSpeakAction(
-            message=message,
-            recipients=[recipient_id],
-            sender_id=self.get_own_id(),
-        )
+    def __speak(self) -> list[VWAction]:
+        # everything queued this cycle as one speak or broadcast action, if any
+        return self.__outbox.flush(self.get_own_id())
 
     def __go_and_speak(self, orientation: VWOrientation) -> Iterable[VWAction]:
-        action: list[VWAction] = [self.__go_towards(orientation)]
-
-        # check if anything to broadcast
-        if self.__announcement:
-            action.append(self.__shout())
-        else:
-            # check if anything to speak to agents
-            if self.__next_message:
-                agent_id, message = self.__next_message
-                action.append(self.__whisper(agent_id, message))
-
-        return action
+        return [self.__go_towards(orientation), *self.__speak()]
 
     def __go_towards(self, orientation: VWOrientation) -> VWAction:
         # if oriented same as passed in orientation, move ahead
@@ -636,38 +1056,36 @@ class ZigZagMind(VWActorMindSurrogate):
         return VWCleanAction()
 
     def __explore(self) -> Iterable[VWAction]:
-        # after scan started, go left and start scanning
-        # if scan_pass is even go west, odd go east, if intermission scan go north
+        # exploring by frontier or cooperatively, go the way worked out in revise,
+        # or wait for cleaners to answer roll call before handing out bands
+        if self.__exploration != Exploration.zigzag:
+            if self.__coord_to_go == VWCoord(-1, -1):
+                return [VWIdleAction(), *self.__speak()]
+            return self.__go_and_speak(self.__direction_to_go)
+
+        # after scan started, go along the pass, or onward between passes
         if self.__started_scan:
             if self.__scan_inter:
-                return self.__go_and_speak(VWOrientation.north)
-            if self.__scan_pass % 2 == 0:
-                return self.__go_and_speak(VWOrientation.west)
-            else:
-                return self.__go_and_speak(VWOrientation.east)
+                return self.__go_and_speak(self.__onward())
+            return self.__go_and_speak(self.__pass_orientation(self.__scan_pass))
 
-        # if start scan criteria not met, try to turn east
-        if not self.get_own_appearance().is_facing_east():
-            return self.__go_and_speak(VWOrientation.east)
+        # if start scan criteria not met, face the wall the first pass starts from
+        if not self.get_own_appearance().is_facing(self.__pass_orientation(1)):
+            return self.__go_and_speak(self.__pass_orientation(1))
 
         return [VWIdleAction()]
 
-    def __go_bottom_right(self) -> Iterable[VWAction]:
-        # At this line robot should be one cell away from east edge
-        # now go until one cell away from south edge
-        if not self.__at_one_cell_from_south_edge:
-            if not self.__start_at_south_edge:
-                return self.__go_and_speak(VWOrientation.south)
-            else:
-                return self.__go_and_speak(VWOrientation.north)
-
-        # If this code line is reachable, robot is oriented properly
-        # now go until one cell away from east edge
-        if not self.__at_one_cell_from_east_edge:
-            if not self.__start_at_east_edge:
+    def __go_to_corner(self) -> Iterable[VWAction]:
+        # exploring by frontier or cooperatively, head for whichever of the east and
+        # south walls is nearer to find n, it is on the side of the larger of x and y
+        if self.__exploration != Exploration.zigzag:
+            if self.get_own_position().get_x() > self.get_own_position().get_y():
                 return self.__go_and_speak(VWOrientation.east)
-            else:
-                return self.__go_and_speak(VWOrientation.west)
+            return self.__go_and_speak(VWOrientation.south)
+
+        way: VWOrientation | None = self.__way_to_corner()
+        if way is not None:
+            return self.__go_and_speak(way)
 
         return [VWIdleAction()]
 
@@ -682,14 +1100,8 @@ class ZigZagMind(VWActorMindSurrogate):
         elif self.__coord_to_go != VWCoord(-1, -1):
             action.append(self.__goto_coord(self.__coord_to_go))
 
-        # check if anything to broadcast
-        if self.__announcement:
-            action.append(self.__shout())
-        else:
-            # check if anything to speak to agents
-            if self.__next_message:
-                agent_id, message = self.__next_message
-                action.append(self.__whisper(agent_id, message))
+        # send anything queued for other agents
+        action += self.__speak()
 
         return action
 
@@ -699,9 +1111,9 @@ class ZigZagMind(VWActorMindSurrogate):
         elif self.__stage == 1:
             return self.__explore()
         elif self.__stage == 0:
-            return self.__go_bottom_right()
+            return self.__go_to_corner()
 
-        return [VWIdleAction()]
+        return [VWIdleAction(), *self.__speak()]
 
 
 class CleanerMind(VWActorMindSurrogate):
@@ -711,44 +1123,78 @@ class CleanerMind(VWActorMindSurrogate):
         # Store id of white agent
         self.__master_id: str = ""
 
-        # whether this agent should report location to white mind
-        self.__should_take_roll: bool = False
+        # whether to stay put this cycle, giving an agent asked to move time to clear
+        self.__should_hold: bool = False
         # target coordinates
         self.__coord_to_go: VWCoord = VWCoord(-1, -1)
         # orientation to face and go
         self.__direction_to_go: VWOrientation = VWOrientation.north
+        # plans paths to target coordinates, grid size is not known to cleaners
+        self.__planner: PathPlanner = PathPlanner()
 
         # if the agent should clean current cell
         self.__should_clean: bool = False
-        # list of dirt locations to clean
-        self.__coords_to_clean: list[VWCoord] = []
-
-        # Store message to send this cycle, tuple of agent id and message
-        self.__next_message: tuple[str, str] = ("", "")
-        # Dictinoary of queued messages, agent id as key and message string as value
-        self.__queued_messages: dict[str, str] = {}
+        # list of dirt locations to clean, kept in the order to visit them
+        self.__coords_to_clean: CoordSet = CoordSet()
+        # cycle costs for ordering the cleaning list, sized to the largest coord known
+        self.__oracle: DistanceOracle = get_oracle(1)
+
+        # viewpoints still to visit while exploring a band of rows for white
+        self.__poses: list[Pose] = []
+        # cells in view already reported to white while exploring
+        self.__reported: CoordSet = CoordSet()
+
+        # Messages waiting to be sent, batched into one payload per cycle
+        self.__outbox: Outbox = Outbox()
         # If requested agent to move, set to 2, auto decrement by one each revise.
         self.__request_cooldown: int = 0
 
+        # Recent states, to tell when self is getting nowhere and what to try
+        self.__monitor: ProgressMonitor = ProgressMonitor()
+        # Cycles left to hold still for, letting an agent with priority by
+        self.__yield_cycles: int = 0
+        # Picks the cell to side-step to, seeded so runs can be reproduced
+        self.__random: random.Random = random.Random(0)
+
+        # What self saw when last left with nothing to do but wait, None if not,
+        # seeing the same and hearing nothing means there is nothing to revise
+        self.__settled_on: ObservationKey | None = None
+
+    def get_stall_counts(self) -> dict[str, int]:
+        return self.__monitor.get_counts()
+
     def __listen_for_command(self) -> None:
-        # loop through all received messages
+        # loop through all received payloads, decoding each once into its messages
         for m in self.get_latest_received_messages():
-            message_content: dict[str, str | list[str]] = json.loads(
-                str(m.get_content())
-            )
-            # check if message contains command, then pass message to function
-            if message_content.get("command") and message_content["command"]:
-                self.__understand_command(m)
-            # if requested to move, find a cell to go and set as target
-            elif (
-                message_content.get("type") and message_content["type"] == "moverequest"
-            ):
-                self.__coord_to_go = self.__find_cell_for_self()
+            for message in codec.decode(m):
+                # if requested to move, find a cell to go and set as target,
+                # unless exploring, which keeps moving anyway
+                if message.get_command() == Command.moverequest:
+                    if not self.__poses and self.__should_yield(message):
+                        self.__make_way()
+                # otherwise pass command to function
+                elif message.get_command() != Command.aboutme:
+                    self.__understand_command(message)
+
+    def __should_yield(self, message: AgentMessage) -> bool:
+        # two cleaners asking each other to move would both step aside and come
+        # back forever, so only the one with the greater id gives way
+        return (
+            self.__request_cooldown <= 0
+            or self.get_own_appearance().get_id() > message.get_sender_id()
+        )
 
     def __check_valid_empty_cell(self, location: PyOptional[VWLocation]) -> bool:
         # check is cell is valid and has no actor
         return not location.is_empty() and not location.or_else_raise().has_actor()
 
+    def __make_way(self) -> None:
+        # go to an empty cell in view, with none, keep going where self was going
+        # rather than dropping it, which would only bring self back here
+        cell: VWCoord = self.__find_cell_for_self()
+        if cell != VWCoord(-1, -1):
+            self.__coord_to_go = cell
+
     def __find_cell_for_self(self) -> VWCoord:
         # tries to find and return an empty spot for self to go
 
@@ -766,55 +1212,201 @@ class CleanerMind(VWActorMindSurrogate):
         else:
             return VWCoord(-1, -1)
 
-    def __understand_command(self, m: BccMessage) -> None:
+    def __understand_command(self, message: AgentMessage) -> None:
         # check what type of command message
-        message_content: dict[str, list[str]] = json.loads(str(m.get_content()))
+        command: Command = message.get_command()
 
         # rollcall means need to reply to other agent with info about self
-        if message_content["command"][0] == "rollcall":
-            self.__master_id = m.get_sender_id()
-            self.__should_take_roll = True
+        if command == Command.rollcall:
+            self.__master_id = message.get_sender_id()
             self.__prepare_take_roll()
 
-        # getout means agent needs to move out of another agent's way
-        if message_content["command"][0] == "getout":
-            goto: list[str] = message_content["goto"]
-            x, y = goto[0].split(",")
-            self.__coord_to_go = VWCoord(int(x), int(y))
+        # getout means agent needs to move out of another agent's way,
+        # unless exploring, which keeps moving anyway
+        if command == Command.getout and not self.__poses:
+            self.__coord_to_go = VWCoord(*message.get_coord())
+
+        # explore means to sweep a band of rows and report what is in it
+        if command == Command.explore:
+            self.__master_id = message.get_sender_id()
+            self.__start_exploring(message.get_size(), message.get_coord())
 
-        # clean means to receive list of coords to clean
-        if message_content["command"][0] == "clean":
-            colour: str = str(self.get_own_colour())
-            coords_list: list[str] = message_content[colour]
-            self.__save_coords(coords_list)
+        # clean means to receive list of coords to clean, dirt handed out while
+        # exploring waits until the band is swept
+        if command == Command.clean:
+            self.__save_coords(message.get_dirt(str(self.get_own_colour())))
 
         # ignore means the coord received should be removed from own coords list
-        if message_content["command"][0] == "ignore":
-            self.__ignore_coord(message_content["coord"][0])
-
-    def __ignore_coord(self, coord: str) -> None:
-        # deconstruct coord as string to x y
-        x, y = coord.split(",")
-        # create VWCoord object with x and y
-        coord_to_ignore = VWCoord(int(x), int(y))
-        # if coord to ignore matches target coord, reset target coord
-        if coord_to_ignore == self.__coord_to_go:
+        if command == Command.ignore:
+            self.__ignore_coord(message.get_coord())
+
+    def __ignore_coord(self, coord: tuple[int, int]) -> None:
+        # if coord to ignore is the dirt being headed for, reset target coord,
+        # a getout sent alongside may have made it the cell to move out to instead
+        if VWCoord(*coord) == self.__coord_to_go and coord in self.__coords_to_clean:
             self.__coord_to_go = VWCoord(-1, -1)
-        # if coord to ignore in cleaning list, remove it
-        if coord_to_ignore in self.__coords_to_clean:
-            self.__coords_to_clean.remove(coord_to_ignore)
-
-    def __save_coords(self, coords_list: list[str]) -> None:
-        # for each coord in passed in list,
-        # create VWCoord object and store in cleaning list
-        for coord in coords_list:
-            x, y = coord.split(",")
-            dirt: VWCoord = VWCoord(int(x), int(y))
-            if dirt not in self.__coords_to_clean:
-                self.__coords_to_clean.append(dirt)
+        # if coord to ignore in cleaning list, remove it and close the gap in the tour,
+        # nothing else in it moves if it was not there
+        if coord in self.__coords_to_clean:
+            self.__order_coords([], coord)
+
+    def __save_coords(self, coords_list: list[tuple[int, int]]) -> None:
+        # store each new x y in passed in list in cleaning list, in tour order
+        self.__order_coords(
+            [coord for coord in coords_list if coord not in self.__coords_to_clean]
+        )
+
+    def __order_coords(
+        self,
+        new_coords: list[tuple[int, int]],
+        removed: tuple[int, int] = (-1, -1),
+    ) -> None:
+        # order cleaning list into a short tour, the target being headed for stays
+        # first and the rest is ordered from there, a list received in one go is
+        # planned whole, later additions are inserted into the tour already planned,
+        # and the gap left by taking removed out of it is closed by improving only
+        # the stops around it
+        position: VWCoord = self.get_own_position()
+        x, y = position.get_x(), position.get_y()
+        orientation: VWOrientation = self.get_own_orientation()
+        head: list[tuple[int, int]] = []
+        target: tuple[int, int] = (
+            self.__coord_to_go.get_x(),
+            self.__coord_to_go.get_y(),
+        )
+        if target in self.__coords_to_clean:
+            head = [target]
+
+        # the rest goes into the tour in order, found where removed was on the way
+        # rather than by scanning for it beforehand
+        tour: list[tuple[int, int]] = []
+        removed_at: int = -1
+        for coord in self.__coords_to_clean:
+            if coord == removed:
+                removed_at = len(tour)
+            elif coord not in head:
+                tour.append(coord)
+        largest: int = max([x, y] + [max(coord) for coord in head + tour + new_coords])
+        if largest >= self.__oracle.get_n():
+            self.__oracle = get_oracle(largest + 1)
+        if head:
+            orientation = self.__oracle.arrival(x, y, orientation, *target)
+            x, y = target
+
+        if not tour:
+            tour = plan_tour(self.__oracle, x, y, orientation, new_coords)
+        elif new_coords:
+            tour = insert_stops(self.__oracle, x, y, orientation, tour, new_coords)
+        elif removed_at != -1:
+            tour = improve_around(self.__oracle, x, y, orientation, tour, removed_at)
+        self.__coords_to_clean = CoordSet(coords=head + tour)
+
+    def __start_exploring(self, n: int, region: tuple[int, int]) -> None:
+        # sweep band from its corner nearest to self, grid size is known from now on
+        self.__planner = PathPlanner(n)
+        position: VWCoord = self.get_own_position()
+        self.__poses = best_sweep(
+            get_oracle(n),
+            position.get_x(),
+            position.get_y(),
+            self.get_own_orientation(),
+            region,
+        )[1]
+        self.__reported = CoordSet(n)
+
+    def __report_cells(self) -> None:
+        # tell white about cells in view not told about yet
+        empty: list[tuple[int, int]] = []
+        dirt: dict[str, list[tuple[int, int]]] = {}
+        for cell in self.get_latest_observation().get_locations_in_order():
+            location: VWLocation = cell.or_else_raise()
+            x, y = location.get_coord().get_x(), location.get_coord().get_y()
+            if not self.__reported.add(x, y):
+                continue
+            if location.has_dirt():
+                colour: str = str(
+                    location.get_dirt_appearance().or_else_raise().get_colour()
+                )
+                dirt.setdefault(colour, []).append((x, y))
+            else:
+                empty.append((x, y))
+        if empty or dirt:
+            self.__add_message(self.__master_id, codec.observed(empty, dirt))
+
+    def __explore_region(self) -> None:
+        # report what is in view, then head for the next viewpoint and turn to face
+        # its way, once the band is swept tell white where self ended up
+        self.__report_cells()
+        position: VWCoord = self.get_own_position()
+        here: Pose = (position.get_x(), position.get_y(), self.get_own_orientation())
+        while self.__poses and self.__poses[0] == here:
+            self.__poses.pop(0)
+        if not self.__poses:
+            self.__coord_to_go = VWCoord(-1, -1)
+            # white takes the report for any dirt of own colour here being cleaned,
+            # so make it so
+            center: VWLocation = (
+                self.get_latest_observation().get_center().or_else_raise()
+            )
+            if center.has_dirt() and str(
+                center.get_dirt_appearance().or_else_raise().get_colour()
+            ) == str(self.get_own_colour()):
+                self.__coord_to_go = position
+                self.__should_clean = True
+                self.__coords_to_clean.remove(position.get_x(), position.get_y())
+            self.__prepare_take_roll()
+            # dirt received while sweeping was toured from wherever self was then
+            coords: list[tuple[int, int]] = list(self.__coords_to_clean)
+            self.__coords_to_clean = CoordSet()
+            self.__order_coords(coords)
+            return
+
+        x, y, orientation = self.__poses[0]
+        self.__coord_to_go = VWCoord(x, y)
+        if position == self.__coord_to_go:
+            self.__direction_to_go = orientation
+        else:
+            self.__direction_to_go = self.__calc_direction_to_go()
+            self.__detect_obstacle()
+
+    def __observe_surroundings(self) -> None:
+        # cells in view bound the path planner to the grid,
+        # other actors on them are soft obstacles for it
+        locations: list[VWLocation] = [
+            cell.or_else_raise()
+            for cell in self.get_latest_observation().get_locations_in_order()
+        ]
+        seen: list[tuple[int, int]] = [
+            (location.get_coord().get_x(), location.get_coord().get_y())
+            for location in locations
+        ]
+        for x, y in seen:
+            self.__planner.observe(x, y)
+        self.__planner.set_obstacles(
+            seen,
+            (
+                (location.get_coord().get_x(), location.get_coord().get_y())
+                for location in locations
+                if location.has_actor()
+                and location.get_coord() != self.get_own_position()
+            ),
+        )
 
     def __calc_direction_to_go(self) -> VWOrientation:
         now_coord: VWCoord = self.get_own_position()
+
+        # follow planned path around other actors, one cached step per cycle
+        if self.__coord_to_go != VWCoord(-1, -1):
+            self.__observe_surroundings()
+            planned: VWOrientation | None = self.__planner.next_step(
+                (now_coord.get_x(), now_coord.get_y()),
+                self.get_own_orientation(),
+                (self.__coord_to_go.get_x(), self.__coord_to_go.get_y()),
+            )
+            if planned is not None:
+                return planned
+
+        # otherwise head straight for target
         delta_x: int = self.__coord_to_go.get_x() - now_coord.get_x()
         delta_y: int = self.__coord_to_go.get_y() - now_coord.get_y()
 
@@ -837,47 +1429,107 @@ class CleanerMind(VWActorMindSurrogate):
 
     def __find_coord_to_go(self) -> None:
         # find another dirt location to go clean
-        # nearest coord will always be first and supposedly only item in cleaning list
+        # cleaning list is kept in tour order, so the next stop is always first
         self.__coord_to_go = (
-            self.__coords_to_clean[0] if self.__coords_to_clean else VWCoord(-1, -1)
+            VWCoord(*self.__coords_to_clean.first())
+            if self.__coords_to_clean
+            else VWCoord(-1, -1)
+        )
+
+    def __check_progress(self) -> None:
+        # on the way to a target, find out if self is getting nowhere and try
+        # whatever is due, the next thing up if that cannot be tried
+        position: VWCoord = self.get_own_position()
+        resolution: Resolution = self.__monitor.check(
+            (
+                (position.get_x(), position.get_y()),
+                self.get_own_orientation(),
+                (self.__coord_to_go.get_x(), self.__coord_to_go.get_y()),
+            ),
+            self.__resolve,
+        )
+        if resolution != Resolution.none:
+            trace(
+                Level.event,
+                self.get_own_colour(),
+                "getting nowhere at {} going {}, {}",
+                position,
+                self.__coord_to_go,
+                resolution.name,
+            )
+
+    def __resolve(self, resolution: Resolution) -> bool:
+        # try a resolution, false if it cannot be tried
+        observation: VWObservation = self.get_latest_observation()
+
+        # the lesser id has priority, as for move requests between cleaners,
+        # without an agent in the way there is nobody to yield to
+        if resolution == Resolution.yielding:
+            forward_location: PyOptional[VWLocation] = observation.get_forward()
+            if not self.__check_agent_in_cell(forward_location):
+                return False
+            actor: VWActorAppearance = (
+                forward_location.or_else_raise().get_actor_appearance().or_else_raise()
+            )
+            if actor.get_id() < self.get_own_id():
+                self.__yield_cycles = YIELD_CYCLES
+                self.__should_hold = True
+            else:
+                self.__prepare_request_to_move(actor)
+            return True
+
+        # step to any empty cell beside or ahead, coming back for the target after
+        if resolution == Resolution.side_step:
+            cells: list[VWCoord] = [
+                location.or_else_raise().get_coord()
+                for location in (
+                    observation.get_left(),
+                    observation.get_right(),
+                    observation.get_forward(),
+                )
+                if self.__check_valid_empty_cell(location)
+            ]
+            if not cells:
+                return False
+            self.__coord_to_go = self.__random.choice(cells)
+            self.__direction_to_go = self.__calc_direction_to_go()
+            return True
+
+        # leave it to white, which knows where everyone is
+        if not self.__master_id:
+            return False
+        position: VWCoord = self.get_own_position()
+        self.__add_message(
+            self.__master_id, codec.stuck(position.get_x(), position.get_y())
         )
+        return True
 
     def __check_agent_in_cell(self, location: PyOptional[VWLocation]) -> bool:
         # check is cell is valid and has actor
         return not location.is_empty() and location.or_else_raise().has_actor()
 
-    def __add_message(self, actor_id: str, message: str) -> None:
-        # add given message to given actor id slot in queued messages
-        self.__queued_messages[actor_id] = message
-
-    def __prepare_message(self) -> None:
-        # if there are queued messages, get first message, remove it from queue
-        # then set it as next message
-        if self.__queued_messages:
-            self.__next_message = list(self.__queued_messages.items())[0]
-            agent_id = self.__next_message[0]
-            del self.__queued_messages[agent_id]
-        # else clear next message
-        else:
-            self.__next_message = ("", "")
+    def __add_message(self, actor_id: str, message: AgentMessage) -> None:
+        # queue given message for given actor id, behind anything already queued for it
+        self.__outbox.add(actor_id, message)
 
     def __prepare_take_roll(self) -> None:
         # get own position and build roll call message and send to white
         position = self.get_own_position()
-        message: dict[str, str] = {
-            "type": "aboutme",
-            "id": self.get_own_id(),
-            "colour": str(self.get_own_colour()),
-            "coord": f"{position.get_x()},{position.get_y()}",
-        }
-        self.__add_message(self.__master_id, json.dumps(message))
+        message: AgentMessage = codec.aboutme(
+            str(self.get_own_colour()),
+            position.get_x(),
+            position.get_y(),
+            str(self.get_own_orientation()),
+        )
+        self.__add_message(self.__master_id, message)
 
     def __prepare_request_to_move(self, actor: VWActorAppearance) -> None:
         # set up message to ask the agent to move
-        request: dict[str, str] = {"type": "moverequest"}
-        print(f"request {actor.get_colour()} to move")
-        self.__add_message(actor.get_id(), json.dumps(request))
-        self.__should_take_roll = True
+        trace(
+            Level.event, self.get_own_colour(), "request {} to move", actor.get_colour()
+        )
+        self.__add_message(actor.get_id(), codec.moverequest())
+        self.__should_hold = True
 
     def __detect_obstacle(self) -> None:
         # observe forward cell and detect if agent in front, if so, ask agent to move out
@@ -887,9 +1539,12 @@ class CleanerMind(VWActorMindSurrogate):
         # each cycle decrease cooldown
         self.__request_cooldown -= 1
 
-        # if agent ahead and cooldown time cleared, request agent to move
-        if self.__request_cooldown <= 0 and self.__check_agent_in_cell(
-            forward_location
+        # if agent ahead on the planned way and cooldown time cleared,
+        # request agent to move, otherwise the path already goes around it
+        if (
+            self.__request_cooldown <= 0
+            and self.get_own_appearance().is_facing(self.__direction_to_go)
+            and self.__check_agent_in_cell(forward_location)
         ):
             actor: VWActorAppearance = (
                 forward_location.or_else_raise().get_actor_appearance().or_else_raise()
@@ -898,43 +1553,102 @@ class CleanerMind(VWActorMindSurrogate):
             # after asking, set cooldown to 2 (cycles)
             self.__request_cooldown = 2
 
+    def __is_settled(self) -> bool:
+        # nowhere to go and nothing to clean or say
+        return (
+            not self.__poses
+            and self.__coord_to_go == VWCoord(-1, -1)
+            and not self.__should_clean
+            and not self.__should_hold
+            and self.__yield_cycles == 0
+            and not self.__outbox
+        )
+
+    def __is_unchanged(self) -> bool:
+        # settled last cycle and nothing heard or seen since that could unsettle
+        return (
+            self.__settled_on is not None
+            and not self.get_latest_received_messages()
+            and observation_key(self.get_latest_observation()) == self.__settled_on
+        )
+
+    def __trace_state(self) -> None:
+        trace(
+            Level.cycle,
+            self.get_own_colour(),
+            "at {} facing {} going {} towards {}, should clean={}, queue={}",
+            self.get_own_position(),
+            self.get_own_orientation(),
+            self.__coord_to_go,
+            self.__direction_to_go,
+            self.__should_clean,
+            self.__coords_to_clean,
+        )
+
     def revise(self) -> None:
+        # settled and nothing has changed, everything revised before still holds
+        if self.__is_unchanged():
+            self.__trace_state()
+            return
+        self.__settled_on = None
+
         self.__should_clean = False
-        self.__should_take_roll = False
+        # while yielding, hold still until the agent with priority has gone by
+        self.__should_hold = self.__yield_cycles > 0
+        self.__yield_cycles = max(self.__yield_cycles - 1, 0)
 
         # listen for command from master every time
         self.__listen_for_command()
 
+        # while exploring a band for white, that is all there is to do
+        if self.__poses:
+            self.__explore_region()
+            return
+
         # if not yet arrived at target coordinate
         if self.get_own_position() != self.__coord_to_go:
             # if target coordinate is invalid, find somewhere to go
             if self.__coord_to_go == VWCoord(-1, -1):
                 self.__find_coord_to_go()
-            # then, find which direction to go
-            self.__direction_to_go = self.__calc_direction_to_go()
-            self.__detect_obstacle()
+            # then, find which direction to go, with nothing to go to there is
+            # no way for other agents to be in
+            if self.__coord_to_go != VWCoord(-1, -1):
+                self.__direction_to_go = self.__calc_direction_to_go()
+                self.__detect_obstacle()
         # if arrived at target coordinate
         else:
-            # first check if target coordinate has dirt, if so, it needs to be cleaned
-            if self.get_latest_observation().get_center().or_else_raise().has_dirt():
+            position: VWCoord = self.get_own_position()
+            # first check if target coordinate has dirt given to self, if so, it needs
+            # to be cleaned, cleaning own colour cannot fail so tell master now,
+            # alongside the clean
+            if (
+                self.get_latest_observation().get_center().or_else_raise().has_dirt()
+                and self.__coords_to_clean.remove(position.get_x(), position.get_y())
+            ):
                 self.__should_clean = True
+                self.__prepare_take_roll()
             # if no dirt, remove current coordinate from cleaning list,
-            # tell master this place is cleaned, then
+            # tell master this place is cleaned if not told yet, then
             # find another place to go
             else:
-                if self.get_own_position() in self.__coords_to_clean:
-                    self.__coords_to_clean.remove(self.get_own_position())
-                    self.__should_take_roll = True
+                if self.__coords_to_clean.remove(position.get_x(), position.get_y()):
                     self.__prepare_take_roll()
-                    self.__should_clean = False
-            self.__find_coord_to_go()
+                self.__find_coord_to_go()
+                # head for the next target this cycle rather than on a stale direction
+                if self.__coord_to_go not in (position, VWCoord(-1, -1)):
+                    self.__direction_to_go = self.__calc_direction_to_go()
+                    self.__detect_obstacle()
 
-        # prepare to send message if any
-        self.__prepare_message()
+        # on the way somewhere, make sure self is getting there
+        if self.__coord_to_go not in (self.get_own_position(), VWCoord(-1, -1)):
+            self.__check_progress()
 
-        print(
-            f"{self.get_own_colour()} at {self.get_own_position()} facing {self.get_own_orientation()} going {self.__coord_to_go} towards {self.__direction_to_go}, should clean={self.__should_clean}, queue={[str(c) for c in self.__coords_to_clean]}"
-        )
+        # left with nothing to do but wait, keep what self sees to tell if that
+        # changes
+        if self.__is_settled():
+            self.__settled_on = observation_key(self.get_latest_observation())
+
+        self.__trace_state()
 
     ### DECIDE FUNCTIONS ###
 
@@ -956,26 +1670,15 @@ class CleanerMind(VWActorMindSurrogate):
         # if own position is already at coord, do nothing
         return [VWIdleAction()]
 
-    def __whisper(self, recipient_id: str, message: str) -> VWAction:
-        return VWSpeakAction(
-            message=message,
-            recipients=[recipient_id],
-            sender_id=self.get_own_id(),
-        )
-
-    def __send_message(self) -> Iterable[VWAction]:
-        # check if anything to speak to agents
-        if self.__next_message:
-            agent_id, message = self.__next_message
-            return [self.__whisper(agent_id, message)]
-        return [VWIdleAction()]
-
     def __clean(self) -> Iterable[VWAction]:
         return [VWCleanAction()]
 
-    def decide(self) -> Iterable[VWAction]:
-        if self.__should_take_roll and self.__master_id:
-            return self.__send_message()
+    def __act(self) -> Iterable[VWAction]:
+        if self.__should_hold:
+            return [VWIdleAction()]
+
+        if self.__poses:
+            return self.__go_towards(self.__direction_to_go)
 
         if self.get_own_position() == self.__coord_to_go and self.__should_clean:
             return self.__clean()
@@ -985,6 +1688,11 @@ class CleanerMind(VWActorMindSurrogate):
 
         return [VWIdleAction()]
 
+    def decide(self) -> Iterable[VWAction]:
+        # physical action alongside anything queued for other agents,
+        # so reporting back no longer costs a cycle of its own
+        return [*self.__act(), *self.__outbox.flush(self.get_own_id())]
+
 
 if __name__ == "__main__":
     run(
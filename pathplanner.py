@@ -0,0 +1,285 @@
+import heapq
+from typing import Iterable
+
+from vacuumworld.common.vworientation import VWOrientation
+
+from reservation import Path, ReservationTable
+
+
+# Step taken by moving once while facing each orientation
+STEPS: dict[VWOrientation, tuple[int, int]] = {
+    VWOrientation.north: (0, -1),
+    VWOrientation.east: (1, 0),
+    VWOrientation.south: (0, 1),
+    VWOrientation.west: (-1, 0),
+}
+# Extra cycles charged for stepping onto a cell another actor was seen on,
+# a sidestep around it costs at most 2 moves and 4 turns so that is always taken
+SOFT_OBSTACLE_COST: int = 6
+# Number of planned paths kept before the cache is cleared
+MAX_CACHED_PATHS: int = 256
+# Cycles ahead a path is planned around reserved cells, and reserved for
+RESERVATION_WINDOW: int = 12
+
+
+class PathPlanner:
+    def __init__(self, n: int = 0) -> None:
+        # Grid size, 0 if not known
+        self.__n: int = n
+        # Largest x or y known to be on the grid, bounds paths while n is not known,
+        # as grid is square from 0 every cell up to it in both axes exists
+        self.__largest_seen: int = 0
+
+        # Cells other actors were last seen on, kept while out of view
+        self.__obstacles: frozenset[tuple[int, int]] = frozenset()
+        # Bumped each time the obstacles change
+        self.__epoch: int = 0
+
+        # Planned paths keyed by start, start orientation, goal and obstacle epoch
+        self.__cache: dict[
+            tuple[tuple[int, int], VWOrientation, tuple[int, int], int],
+            list[tuple[int, int]],
+        ] = {}
+
+        # Path being followed, index of the cell the agent should be on,
+        # and the epoch whose obstacles it was last checked against
+        self.__path: list[tuple[int, int]] = []
+        self.__path_index: int = 0
+        self.__path_epoch: int = -1
+
+    def get_n(self) -> int:
+        return self.__n
+
+    def get_epoch(self) -> int:
+        return self.__epoch
+
+    def set_obstacles(
+        self, seen: Iterable[tuple[int, int]], occupied: Iterable[tuple[int, int]]
+    ) -> None:
+        # update the soft obstacles from cells in view and those of them with actors,
+        # actors out of view are assumed still where they were last seen,
+        # so the path does not flip each time one leaves the view
+        obstacles: frozenset[tuple[int, int]] = (
+            self.__obstacles - frozenset(seen)
+        ) | frozenset(occupied)
+        if obstacles != self.__obstacles:
+            self.__obstacles = obstacles
+            self.__epoch += 1
+
+    def observe(self, x: int, y: int) -> None:
+        # record a cell known to be on the grid
+        self.__largest_seen = max(self.__largest_seen, x, y)
+
+    def __turns(self, facing: VWOrientation, to: VWOrientation) -> int:
+        # turn actions needed to face one orientation from another
+        if facing == to:
+            return 0
+        return 2 if facing.get_left().get_left() == to else 1
+
+    def __in_bounds(self, x: int, y: int) -> bool:
+        if self.__n > 0:
+            return 0 <= x < self.__n and 0 <= y < self.__n
+        return 0 <= x <= self.__largest_seen and 0 <= y <= self.__largest_seen
+
+    def __estimate(self, x: int, y: int, goal: tuple[int, int]) -> int:
+        dx: int = abs(goal[0] - x)
+        dy: int = abs(goal[1] - y)
+        # at least one turn if goal is off both axes
+        return dx + dy + (1 if dx and dy else 0)
+
+    def __search(
+        self, start: tuple[int, int], facing: VWOrientation, goal: tuple[int, int]
+    ) -> list[tuple[int, int]]:
+        # a* over cell and orientation, each move costs one cycle plus one per turn
+        # before it, so the cheapest path is the one finishing in fewest cycles
+        def estimate(x: int, y: int) -> int:
+            return self.__estimate(x, y, goal)
+
+        if not self.__in_bounds(*goal):
+            return []
+
+        counter: int = 0
+        frontier: list[tuple[int, int, tuple[int, int], VWOrientation]] = [
+            (estimate(*start), counter, start, facing)
+        ]
+        cost: dict[tuple[tuple[int, int], VWOrientation], int] = {(start, facing): 0}
+        came_from: dict[
+            tuple[tuple[int, int], VWOrientation],
+            tuple[tuple[int, int], VWOrientation],
+        ] = {}
+
+        while frontier:
+            _, _, cell, orientation = heapq.heappop(frontier)
+            if cell == goal:
+                path: list[tuple[int, int]] = [cell]
+                state = (cell, orientation)
+                while state in came_from:
+                    state = came_from[state]
+                    path.append(state[0])
+                path.reverse()
+                return path
+
+            g: int = cost[(cell, orientation)]
+            for step_orientation, (sx, sy) in STEPS.items():
+                x: int = cell[0] + sx
+                y: int = cell[1] + sy
+                if not self.__in_bounds(x, y):
+                    continue
+                new_cost: int = g + 1 + self.__turns(orientation, step_orientation)
+                if (x, y) in self.__obstacles:
+                    new_cost += SOFT_OBSTACLE_COST
+                state = ((x, y), step_orientation)
+                if new_cost < cost.get(state, new_cost + 1):
+                    cost[state] = new_cost
+                    came_from[state] = (cell, orientation)
+                    counter += 1
+                    heapq.heappush(
+                        frontier,
+                        (new_cost + estimate(x, y), counter, (x, y), step_orientation),
+                    )
+
+        return []
+
+    def plan(
+        self, start: tuple[int, int], facing: VWOrientation, goal: tuple[int, int]
+    ) -> list[tuple[int, int]]:
+        # cells from start to goal inclusive, empty if goal cannot be reached
+        # start and goal are cells on the grid
+        self.observe(*start)
+        self.observe(*goal)
+        key = (start, facing, goal, self.__epoch)
+        if key not in self.__cache:
+            if len(self.__cache) >= MAX_CACHED_PATHS:
+                self.__cache.clear()
+            self.__cache[key] = self.__search(start, facing, goal)
+        return self.__cache[key]
+
+    def plan_reserved(
+        self,
+        start: tuple[int, int],
+        facing: VWOrientation,
+        goal: tuple[int, int],
+        reservations: ReservationTable,
+        agent_id: str,
+        cycle: int,
+    ) -> Path:
+        # cell to be on at the start of each cycle from this one, keeping off cells
+        # other agents reserved, to goal and staying there if that can be done
+        # within the window, otherwise as far towards it as the window allows,
+        # a* over cell, orientation and cycle, waiting and turning on the spot
+        # taking a cycle like a move, actors in view with nothing reserved are
+        # soft obstacles as for plan
+        self.observe(*start)
+        self.observe(*goal)
+        unknown: frozenset[tuple[int, int]] = frozenset(
+            cell
+            for cell in self.__obstacles
+            if reservations.get_holder(*cell, cycle) == ""
+        )
+        counter: int = 0
+        frontier: list[tuple[int, int, int, tuple[int, int], VWOrientation]] = [
+            (self.__estimate(*start, goal), counter, 0, start, facing)
+        ]
+        cost: dict[tuple[tuple[int, int], VWOrientation, int], int] = {
+            (start, facing, 0): 0
+        }
+        came_from: dict[
+            tuple[tuple[int, int], VWOrientation, int],
+            tuple[tuple[int, int], VWOrientation, int],
+        ] = {}
+
+        while frontier:
+            _, _, t, cell, orientation = heapq.heappop(frontier)
+            if t == RESERVATION_WINDOW or (
+                cell == goal
+                and reservations.is_free_from(*cell, cycle + t, agent_id)
+            ):
+                path: Path = [cell]
+                state = (cell, orientation, t)
+                while state in came_from:
+                    state = came_from[state]
+                    path.append(state[0])
+                path.reverse()
+                return path
+
+            g: int = cost[(cell, orientation, t)]
+            moves: list[tuple[tuple[int, int], VWOrientation]] = [
+                (cell, orientation),
+                (cell, orientation.get_left()),
+                (cell, orientation.get_right()),
+            ]
+            sx, sy = STEPS[orientation]
+            if self.__in_bounds(cell[0] + sx, cell[1] + sy):
+                moves.append(((cell[0] + sx, cell[1] + sy), orientation))
+            for to, to_orientation in moves:
+                # moving onto a cell needs it free before the move as well,
+                # the agent on it may only leave later in the cycle
+                if not reservations.is_free(*to, cycle + t + 1, agent_id) or (
+                    to != cell and not reservations.is_free(*to, cycle + t, agent_id)
+                ):
+                    continue
+                new_cost: int = g + 1
+                if to != cell and to in unknown:
+                    new_cost += SOFT_OBSTACLE_COST
+                state = (to, to_orientation, t + 1)
+                if new_cost < cost.get(state, new_cost + 1):
+                    cost[state] = new_cost
+                    came_from[state] = (cell, orientation, t)
+                    counter += 1
+                    heapq.heappush(
+                        frontier,
+                        (
+                            new_cost + self.__estimate(*to, goal),
+                            counter,
+                            t + 1,
+                            to,
+                            to_orientation,
+                        ),
+                    )
+
+        return [start]
+
+    def __is_following(self, position: tuple[int, int], goal: tuple[int, int]) -> bool:
+        # whether the path being followed still leads from position to goal,
+        # moving the index on if the agent has stepped to the next cell
+        if not self.__path or self.__path[-1] != goal:
+            return False
+        if self.__path[self.__path_index] != position:
+            if (
+                self.__path_index + 1 < len(self.__path)
+                and self.__path[self.__path_index + 1] == position
+            ):
+                self.__path_index += 1
+            else:
+                return False
+        # only look for new obstacles on the rest of the path if they changed
+        if self.__path_epoch != self.__epoch:
+            if any(
+                cell in self.__obstacles
+                for cell in self.__path[self.__path_index + 1 :]
+            ):
+                return False
+            self.__path_epoch = self.__epoch
+        return True
+
+    def next_step(
+        self, position: tuple[int, int], facing: VWOrientation, goal: tuple[int, int]
+    ) -> VWOrientation | None:
+        # orientation to move in next to reach goal, None if at goal or no path,
+        # replanning only when the followed path no longer holds
+        if position == goal:
+            return None
+        if not self.__is_following(position, goal):
+            self.__path = self.plan(position, facing, goal)
+            self.__path_index = 0
+            self.__path_epoch = self.__epoch
+            if len(self.__path) < 2:
+                self.__path = []
+                return None
+
+        x, y = self.__path[self.__path_index]
+        next_x, next_y = self.__path[self.__path_index + 1]
+        for orientation, step in STEPS.items():
+            if step == (next_x - x, next_y - y):
+                return orientation
+        return None
@@ -0,0 +1,108 @@
+# Opt-in per-call timing of mind methods and helper functions, wrapped only while
+# profiling is on, so nothing is added to a call otherwise
+
+import functools
+import inspect
+import time
+from types import ModuleType
+from typing import Any, Callable
+
+
+# Latency buckets are powers of 2 nanoseconds, the last one open ended
+BUCKETS: int = 32
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        # Calls in each power of 2 bucket of nanoseconds, and their total
+        self.__buckets: list[int] = [0] * BUCKETS
+        self.__calls: int = 0
+        self.__total_ns: int = 0
+
+    def add(self, ns: int) -> None:
+        self.__buckets[min(ns.bit_length(), BUCKETS - 1)] += 1
+        self.__calls += 1
+        self.__total_ns += ns
+
+    def get_calls(self) -> int:
+        return self.__calls
+
+    def get_total_ns(self) -> int:
+        return self.__total_ns
+
+    def get_percentile_ns(self, percentile: float) -> int:
+        # upper bound of the bucket the percentile falls in
+        rank: float = percentile * self.__calls
+        seen: int = 0
+        for bucket, count in enumerate(self.__buckets):
+            seen += count
+            if count and seen >= rank:
+                return 1 << bucket
+        return 0
+
+
+class Profiler:
+    def __init__(self) -> None:
+        # Latency histogram by the name of what is timed
+        self.__histograms: dict[str, _Histogram] = {}
+        # Owner, attribute name and original of everything wrapped, to put back
+        self.__wrapped: list[tuple[Any, str, Callable]] = []
+
+    def __wrap(self, owner: Any, attribute: str, name: str) -> None:
+        original: Callable = getattr(owner, attribute)
+        histogram: _Histogram = self.__histograms.setdefault(name, _Histogram())
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start: int = time.perf_counter_ns()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                histogram.add(time.perf_counter_ns() - start)
+
+        self.__wrapped.append((owner, attribute, original))
+        setattr(owner, attribute, timed)
+
+    def wrap_class(self, cls: type) -> None:
+        # every method the class defines, private ones named as in the source,
+        # a method calling another counts both
+        for attribute, value in list(vars(cls).items()):
+            if not inspect.isfunction(value) or attribute == "__init__":
+                continue
+            name: str = attribute.removeprefix(f"_{cls.__name__}")
+            self.__wrap(cls, attribute, f"{cls.__name__}.{name}")
+
+    def wrap_functions(self, module: ModuleType, names: list[str]) -> None:
+        # module level functions, as looked up through that module,
+        # builtins print included
+        for name in names:
+            self.__wrap(module, name, f"{module.__name__}.{name}")
+
+    def unwrap(self) -> None:
+        # put back the originals, latest wrapped first
+        while self.__wrapped:
+            owner, attribute, original = self.__wrapped.pop()
+            setattr(owner, attribute, original)
+
+    def get_histograms(self) -> dict[str, _Histogram]:
+        return self.__histograms
+
+    def __str__(self) -> str:
+        # one line per name called, most total time first
+        lines: list[str] = [
+            f"{'calls':>9} {'total ms':>10} {'mean us':>9} {'p50 us':>8}"
+            f" {'p99 us':>8}  name"
+        ]
+        for name, histogram in sorted(
+            self.__histograms.items(), key=lambda item: -item[1].get_total_ns()
+        ):
+            calls: int = histogram.get_calls()
+            if calls == 0:
+                continue
+            lines.append(
+                f"{calls:>9} {histogram.get_total_ns() / 1e6:>10.1f}"
+                f" {histogram.get_total_ns() / calls / 1e3:>9.1f}"
+                f" {histogram.get_percentile_ns(0.5) / 1e3:>8.1f}"
+                f" {histogram.get_percentile_ns(0.99) / 1e3:>8.1f}  {name}"
+            )
+        return "\n".join(lines)
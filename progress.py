@@ -0,0 +1,130 @@
+# Recent states of an agent in a ring buffer, to tell when it is going round in
+# circles or standing still short of its target, and how hard to try to get it
+# going again, counting both as it goes
+
+from collections import deque
+from enum import IntEnum
+from typing import Callable
+
+from vacuumworld.common.vworientation import VWOrientation
+
+
+# Cycles of no progress before an agent counts as stalled
+HISTORY: int = 12
+# Cycles an agent holds still for when yielding to one with priority
+YIELD_CYCLES: int = 2
+
+
+class Stall(IntEnum):
+    # moving through the same states over and over without getting closer (livelock)
+    repeating = 1
+    # on the same cell without getting closer (deadlock)
+    stuck = 2
+
+
+class Resolution(IntEnum):
+    # nothing to do
+    none = 0
+    # the agent in the way goes first if it has priority, else is asked to move
+    yielding = 1
+    # step to a free cell beside, picked at random
+    side_step = 2
+    # ask the supervisor where to go
+    arbitration = 3
+
+
+# A state: position, orientation and target
+State = tuple[tuple[int, int], VWOrientation, tuple[int, int]]
+
+
+def cells_around(x: int, y: int, n: int) -> list[tuple[int, int]]:
+    # cells of an n x n grid a step from a cell, then two steps, in a fixed order
+    cells: list[tuple[int, int]] = []
+    for distance in (1, 2):
+        for dx in range(-distance, distance + 1):
+            for dy in sorted({abs(dx) - distance, distance - abs(dx)}):
+                if 0 <= x + dx < n and 0 <= y + dy < n:
+                    cells.append((x + dx, y + dy))
+    return cells
+
+
+def _distance(state: State) -> int:
+    (x, y), _, (target_x, target_y) = state
+    return abs(target_x - x) + abs(target_y - y)
+
+
+class ProgressMonitor:
+    def __init__(self) -> None:
+        # Latest states since the last stall, oldest first, kept when the target
+        # changes so agents trading targets back and forth are seen going round
+        self.__states: deque[State] = deque(maxlen=HISTORY)
+        # Resolution tried for the last stall, stronger ones for stalls after it on
+        # the same target until the agent gets closer to it than it was then,
+        # stepping aside to another target and back is no progress
+        self.__resolution: Resolution = Resolution.none
+        # Target and distance to it when the last stall was found
+        self.__stalled_on: tuple[tuple[int, int], int] = ((-1, -1), -1)
+        # Stalls found and resolutions tried, by name
+        self.__counts: dict[str, int] = {}
+
+    def check(self, state: State, resolve: Callable[[Resolution], bool]) -> Resolution:
+        # record a state and, once a full history has gone by without progress,
+        # try the next resolution up from the last with resolve, which is false
+        # if it cannot be tried, then the one after, the one tried or none
+        resolution: Resolution = self.__record(state)
+        while resolution != Resolution.none and not resolve(resolution):
+            resolution = self.__escalate(resolution)
+        if resolution != Resolution.none:
+            self.__resolution = resolution
+            self.__count(resolution.name)
+        return resolution
+
+    def __record(self, state: State) -> Resolution:
+        # resolution due, none unless a stall has just been found
+        self.__states.append(state)
+        if len(self.__states) < HISTORY:
+            return Resolution.none
+        # progress is getting closer to the target than when first going for it
+        # in the history, whichever targets came in between
+        since: State = next(s for s in self.__states if s[2] == state[2])
+        if _distance(state) < _distance(since):
+            target, distance = self.__stalled_on
+            if state[2] == target and _distance(state) < distance:
+                self.__resolution = Resolution.none
+            return Resolution.none
+
+        # a target taken up within the history gets a whole history of its own,
+        # unless it was left for another and taken up again, trading targets back
+        # and forth is going round in circles too
+        states: list[State] = list(self.__states)
+        latest: int = len(states)
+        while latest > 0 and states[latest - 1][2] == state[2]:
+            latest -= 1
+        if latest > 0 and state[2] not in {target for _, _, target in states[:latest]}:
+            return Resolution.none
+
+        positions: set[tuple[int, int]] = {position for position, _, _ in self.__states}
+        stall: Stall = Stall.stuck if len(positions) == 1 else Stall.repeating
+        if stall == Stall.repeating and len(set(self.__states)) == len(self.__states):
+            # going a long way round is not going round in circles
+            return Resolution.none
+
+        self.__states.clear()
+        if state[2] != self.__stalled_on[0]:
+            self.__resolution = Resolution.none
+        self.__stalled_on = (state[2], _distance(state))
+        self.__count(stall.name)
+        # arbitration again once it has been tried, it may turn out differently
+        return Resolution(min(self.__resolution + 1, Resolution.arbitration))
+
+    def __escalate(self, resolution: Resolution) -> Resolution:
+        # the next resolution up, none past the last
+        if resolution == Resolution.arbitration:
+            return Resolution.none
+        return Resolution(resolution + 1)
+
+    def __count(self, name: str) -> None:
+        self.__counts[name] = self.__counts.get(name, 0) + 1
+
+    def get_counts(self) -> dict[str, int]:
+        return self.__counts
@@ -0,0 +1,56 @@
+# Agents heard from, by id and by colour, with where each was and when, so finding
+# one or those of a colour takes no scan and an agent heard from again replaces
+# what was known of it instead of being added a second time
+
+from vacuumworld.common.vworientation import VWOrientation
+
+
+# What was last known of an agent: colour, x, y, orientation and cycle it was so
+Agent = tuple[str, int, int, VWOrientation, int]
+
+
+class AgentRegistry:
+    def __init__(self) -> None:
+        # What was last known of each agent, by id, in the order first heard from
+        self.__agents: dict[str, Agent] = {}
+        # Ids of the agents of each colour, by colour, in the order first heard from
+        self.__colours: dict[str, dict[str, None]] = {}
+
+    def update(
+        self,
+        agent_id: str,
+        colour: str,
+        x: int,
+        y: int,
+        orientation: VWOrientation,
+        cycle: int,
+    ) -> bool:
+        # keep what an agent said of itself, true if it was not heard from before
+        known: Agent | None = self.__agents.get(agent_id)
+        if known is not None and known[0] != colour:
+            del self.__colours[known[0]][agent_id]
+        self.__agents[agent_id] = (colour, x, y, orientation, cycle)
+        self.__colours.setdefault(colour, {})[agent_id] = None
+        return known is None
+
+    def move(self, agent_id: str, x: int, y: int, cycle: int) -> None:
+        # an agent known to be somewhere else since, still facing the way it was
+        colour, _, _, orientation, _ = self.__agents[agent_id]
+        self.__agents[agent_id] = (colour, x, y, orientation, cycle)
+
+    def get(self, agent_id: str) -> Agent:
+        return self.__agents[agent_id]
+
+    def get_ids(self) -> list[str]:
+        # ids of every agent, in the order first heard from
+        return list(self.__agents)
+
+    def get_colour_ids(self, colour: str) -> list[str]:
+        # ids of the agents of a colour, in the order first heard from
+        return list(self.__colours.get(colour, {}))
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self.__agents
+
+    def __len__(self) -> int:
+        return len(self.__agents)
@@ -0,0 +1,79 @@
+# Cells agents have said they will be on, cycle by cycle, so each can plan its moves
+# around the others ahead of time instead of finding them in the way
+
+
+# A cell reserved for each cycle from the cycle a path starts on
+Path = list[tuple[int, int]]
+
+
+class ReservationTable:
+    def __init__(self) -> None:
+        # Path each agent reserved and the cycle it starts on, the last cell of it
+        # is held from then on until the agent reserves again
+        self.__paths: dict[str, tuple[int, Path]] = {}
+        # Agents on each cell at the start of each cycle, by cell then cycle, in the
+        # order they claimed it, two agents' paths can cross on what each was told
+        self.__held: dict[tuple[int, int], dict[int, dict[str, None]]] = {}
+        # Agents staying on each cell from a cycle on, by cell then agent
+        self.__parked: dict[tuple[int, int], dict[str, int]] = {}
+
+    def reserve(self, agent_id: str, start: int, path: Path) -> None:
+        # replaces whatever the agent reserved before
+        self.release(agent_id)
+        if not path:
+            return
+        self.__paths[agent_id] = (start, path)
+        for cycle, cell in enumerate(path[:-1], start):
+            self.__held.setdefault(cell, {}).setdefault(cycle, {})[agent_id] = None
+        self.__parked.setdefault(path[-1], {})[agent_id] = start + len(path) - 1
+
+    def release(self, agent_id: str) -> None:
+        if agent_id not in self.__paths:
+            return
+        start, path = self.__paths.pop(agent_id)
+        # the others holding the same cell on the same cycle keep it
+        for cycle, cell in enumerate(path[:-1], start):
+            holders: dict[str, None] = self.__held[cell][cycle]
+            holders.pop(agent_id, None)
+            if not holders:
+                del self.__held[cell][cycle]
+        self.__parked[path[-1]].pop(agent_id, None)
+
+    def get_cell(self, agent_id: str, cycle: int) -> tuple[int, int] | None:
+        # where the agent said it would be at the start of a cycle, None if it has
+        # not reserved anything covering it
+        if agent_id not in self.__paths:
+            return None
+        start, path = self.__paths[agent_id]
+        if cycle < start:
+            return None
+        return path[min(cycle - start, len(path) - 1)]
+
+    def get_holder(self, x: int, y: int, cycle: int) -> str:
+        # agent on a cell at the start of a cycle, the first to claim it if more
+        # than one did, "" if none said so
+        holders: dict[str, None] = self.__held.get((x, y), {}).get(cycle, {})
+        if holders:
+            return next(iter(holders))
+        for agent_id, since in self.__parked.get((x, y), {}).items():
+            if since <= cycle:
+                return agent_id
+        return ""
+
+    def is_free(self, x: int, y: int, cycle: int, agent_id: str) -> bool:
+        # whether the agent can be on the cell at the start of the cycle
+        holders: dict[str, None] = self.__held.get((x, y), {}).get(cycle, {})
+        if holders:
+            return all(other == agent_id for other in holders)
+        return self.get_holder(x, y, cycle) in ("", agent_id)
+
+    def is_free_from(self, x: int, y: int, cycle: int, agent_id: str) -> bool:
+        # whether the agent can stay on the cell from the start of the cycle on
+        parked: dict[str, int] = self.__parked.get((x, y), {})
+        held: dict[int, dict[str, None]] = self.__held.get((x, y), {})
+        return all(other == agent_id for other in parked) and all(
+            other == agent_id
+            for at, holders in held.items()
+            if at >= cycle
+            for other in holders
+        )
@@ -0,0 +1,406 @@
+# Headless stand-in for the VacuumWorld simulator, to run minds in process without
+# the GUI loop, only what the minds read from an observation is modelled
+
+import contextlib
+import io
+from typing import Callable, Iterable
+
+from pyoptional.pyoptional import PyOptional
+from pystarworldsturbo.common.message import BccMessage
+
+from vacuumworld.common.vwcolour import VWColour
+from vacuumworld.common.vwcoordinates import VWCoord
+from vacuumworld.common.vwdirection import VWDirection
+from vacuumworld.common.vworientation import VWOrientation
+from vacuumworld.model.actions.vwactions import VWAction
+from vacuumworld.model.actions.vwbroadcast_action import VWBroadcastAction
+from vacuumworld.model.actions.vwclean_action import VWCleanAction
+from vacuumworld.model.actions.vwidle_action import VWIdleAction
+from vacuumworld.model.actions.vwmove_action import VWMoveAction
+from vacuumworld.model.actions.vwspeak_action import VWSpeakAction
+from vacuumworld.model.actions.vwturn_action import VWTurnAction
+from vacuumworld.model.actor.mind.surrogate.vwactor_mind_surrogate import (
+    VWActorMindSurrogate,
+)
+
+from codec import Payload
+from pathplanner import STEPS
+
+
+### OBSERVATIONS ###
+
+
+class _ActorAppearance:
+    def __init__(
+        self, actor_id: str, colour: VWColour, orientation: VWOrientation
+    ) -> None:
+        self.__id: str = actor_id
+        self.__colour: VWColour = colour
+        self.__orientation: VWOrientation = orientation
+
+    def get_id(self) -> str:
+        return self.__id
+
+    def get_colour(self) -> VWColour:
+        return self.__colour
+
+    def get_orientation(self) -> VWOrientation:
+        return self.__orientation
+
+    def is_facing(self, orientation: VWOrientation) -> bool:
+        return self.__orientation == orientation
+
+    def is_facing_north(self) -> bool:
+        return self.__orientation == VWOrientation.north
+
+    def is_facing_east(self) -> bool:
+        return self.__orientation == VWOrientation.east
+
+    def is_facing_south(self) -> bool:
+        return self.__orientation == VWOrientation.south
+
+    def is_facing_west(self) -> bool:
+        return self.__orientation == VWOrientation.west
+
+
+class _DirtAppearance:
+    def __init__(self, colour: VWColour) -> None:
+        self.__colour: VWColour = colour
+
+    def get_colour(self) -> VWColour:
+        return self.__colour
+
+
+class _Location:
+    def __init__(
+        self,
+        n: int,
+        x: int,
+        y: int,
+        actor: _ActorAppearance | None,
+        dirt: _DirtAppearance | None,
+    ) -> None:
+        self.__n: int = n
+        self.__coord: VWCoord = VWCoord(x, y)
+        self.__actor: _ActorAppearance | None = actor
+        self.__dirt: _DirtAppearance | None = dirt
+
+    def get_coord(self) -> VWCoord:
+        return self.__coord
+
+    def has_actor(self) -> bool:
+        return self.__actor is not None
+
+    def get_actor_appearance(self) -> PyOptional[_ActorAppearance]:
+        return PyOptional.of_nullable(self.__actor)
+
+    def has_dirt(self) -> bool:
+        return self.__dirt is not None
+
+    def get_dirt_appearance(self) -> PyOptional[_DirtAppearance]:
+        return PyOptional.of_nullable(self.__dirt)
+
+    def has_wall_on(self, orientation: VWOrientation) -> bool:
+        dx, dy = STEPS[orientation]
+        x, y = self.__coord.get_x() + dx, self.__coord.get_y() + dy
+        return not (0 <= x < self.__n and 0 <= y < self.__n)
+
+    def has_wall_on_north(self) -> bool:
+        return self.has_wall_on(VWOrientation.north)
+
+    def has_wall_on_south(self) -> bool:
+        return self.has_wall_on(VWOrientation.south)
+
+    def has_wall_on_east(self) -> bool:
+        return self.has_wall_on(VWOrientation.east)
+
+    def has_wall_on_west(self) -> bool:
+        return self.has_wall_on(VWOrientation.west)
+
+
+class _Observation:
+    def __init__(
+        self, orientation: VWOrientation, locations: dict[str, PyOptional[_Location]]
+    ) -> None:
+        self.__orientation: VWOrientation = orientation
+        # Cells in view by position name, empty where there is a wall
+        self.__locations: dict[str, PyOptional[_Location]] = locations
+
+    def get_center(self) -> PyOptional[_Location]:
+        return self.__locations["center"]
+
+    def get_left(self) -> PyOptional[_Location]:
+        return self.__locations["left"]
+
+    def get_right(self) -> PyOptional[_Location]:
+        return self.__locations["right"]
+
+    def get_forward(self) -> PyOptional[_Location]:
+        return self.__locations["forward"]
+
+    def get_forwardleft(self) -> PyOptional[_Location]:
+        return self.__locations["forwardleft"]
+
+    def get_forwardright(self) -> PyOptional[_Location]:
+        return self.__locations["forwardright"]
+
+    def get_locations_in_order(self) -> list[PyOptional[_Location]]:
+        return [
+            location for location in self.__locations.values() if location.is_present()
+        ]
+
+    def is_wall_immediately_ahead(self) -> bool:
+        return self.get_forward().is_empty()
+
+    def is_wall_one_step_ahead(self) -> bool:
+        forward: PyOptional[_Location] = self.get_forward()
+        return forward.is_present() and forward.or_else_raise().has_wall_on(
+            self.__orientation
+        )
+
+
+### SIMULATOR ###
+
+
+class _Discard(io.TextIOBase):
+    # stdout for quiet runs, the minds print every cycle
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+class Simulator:
+    def __init__(self, n: int, dirt: dict[tuple[int, int], VWColour]) -> None:
+        # Grid size
+        self.__n: int = n
+        # Dirt colour by x y, cleaned dirt is removed
+        self.__dirt: dict[tuple[int, int], VWColour] = dict(dirt)
+
+        # Mind of each actor, in the order they take their turns
+        self.__minds: dict[str, VWActorMindSurrogate] = {}
+        # Colour, x y and orientation of each actor, and actor ids by x y
+        self.__colours: dict[str, VWColour] = {}
+        self.__positions: dict[str, tuple[int, int]] = {}
+        self.__orientations: dict[str, VWOrientation] = {}
+        self.__occupied: dict[tuple[int, int], str] = {}
+        # Observation of each actor made after its last action, perceived at the
+        # start of its next turn, and messages sent to it since its last turn
+        self.__observations: dict[str, _Observation] = {}
+        self.__inboxes: dict[str, list[BccMessage]] = {}
+        # Cells as last seen, by x y, dropped when what is on them changes
+        self.__locations: dict[tuple[int, int], PyOptional[_Location]] = {}
+
+        # Cycles run so far
+        self.__cycle: int = 0
+        # Messages delivered and the size of their content, counted per recipient
+        self.__messages: int = 0
+        self.__message_bytes: int = 0
+        # Moves that went nowhere because another actor was in the way
+        self.__blocked_moves: int = 0
+
+    def add_actor(
+        self,
+        actor_id: str,
+        colour: VWColour,
+        mind: VWActorMindSurrogate,
+        x: int,
+        y: int,
+        orientation: VWOrientation,
+    ) -> None:
+        # place an actor, it takes its turn after the actors already placed
+        if actor_id in self.__minds or (x, y) in self.__occupied:
+            raise ValueError(f"{actor_id} cannot be placed at {x} {y}")
+        self.__minds[actor_id] = mind
+        self.__colours[actor_id] = colour
+        self.__positions[actor_id] = (x, y)
+        self.__orientations[actor_id] = orientation
+        self.__occupied[(x, y)] = actor_id
+        self.__inboxes[actor_id] = []
+        # actors placed earlier see this one from their next observation
+        self.__observations = {}
+        self.__locations.pop((x, y), None)
+
+    def get_n(self) -> int:
+        return self.__n
+
+    def get_cycle(self) -> int:
+        return self.__cycle
+
+    def get_dirt(self) -> dict[tuple[int, int], VWColour]:
+        return dict(self.__dirt)
+
+    def is_clean(self) -> bool:
+        return not self.__dirt
+
+    def get_messages(self) -> int:
+        return self.__messages
+
+    def get_message_bytes(self) -> int:
+        return self.__message_bytes
+
+    def get_blocked_moves(self) -> int:
+        return self.__blocked_moves
+
+    def get_mind(self, actor_id: str) -> VWActorMindSurrogate:
+        return self.__minds[actor_id]
+
+    def get_position(self, actor_id: str) -> tuple[int, int]:
+        return self.__positions[actor_id]
+
+    def get_orientation(self, actor_id: str) -> VWOrientation:
+        return self.__orientations[actor_id]
+
+    def get_observation(self, actor_id: str) -> _Observation:
+        # what the actor perceives at the start of its next turn
+        if actor_id not in self.__observations:
+            self.__observations[actor_id] = self.__observe(actor_id)
+        return self.__observations[actor_id]
+
+    ### OBSERVING ###
+
+    def __location(self, x: int, y: int) -> PyOptional[_Location]:
+        # cells nothing has changed on since they were last seen are shared
+        if (x, y) in self.__locations:
+            return self.__locations[(x, y)]
+        if not (0 <= x < self.__n and 0 <= y < self.__n):
+            return PyOptional.empty()
+        actor_id: str | None = self.__occupied.get((x, y))
+        actor: _ActorAppearance | None = None
+        if actor_id is not None:
+            actor = _ActorAppearance(
+                actor_id, self.__colours[actor_id], self.__orientations[actor_id]
+            )
+        colour: VWColour | None = self.__dirt.get((x, y))
+        dirt: _DirtAppearance | None = (
+            None if colour is None else _DirtAppearance(colour)
+        )
+        self.__locations[(x, y)] = PyOptional.of(_Location(self.__n, x, y, actor, dirt))
+        return self.__locations[(x, y)]
+
+    def __observe(self, actor_id: str) -> _Observation:
+        # the cell the actor is on, either side of it, and the 3 cells ahead
+        x, y = self.__positions[actor_id]
+        orientation: VWOrientation = self.__orientations[actor_id]
+        forward: tuple[int, int] = STEPS[orientation]
+        left: tuple[int, int] = STEPS[orientation.get_left()]
+        right: tuple[int, int] = STEPS[orientation.get_right()]
+        offsets: dict[str, tuple[int, int]] = {
+            "center": (0, 0),
+            "left": left,
+            "right": right,
+            "forward": forward,
+            "forwardleft": (forward[0] + left[0], forward[1] + left[1]),
+            "forwardright": (forward[0] + right[0], forward[1] + right[1]),
+        }
+        return _Observation(
+            orientation,
+            {
+                name: self.__location(x + dx, y + dy)
+                for name, (dx, dy) in offsets.items()
+            },
+        )
+
+    ### ACTING ###
+
+    def __send(
+        self, sender_id: str, content: Payload, recipients: Iterable[str]
+    ) -> None:
+        # deliver straight away, a recipient later in the cycle reads it this cycle
+        size: int = len(content) if isinstance(content, bytes) else len(str(content))
+        for recipient_id in recipients:
+            if recipient_id in self.__minds and recipient_id != sender_id:
+                self.__inboxes[recipient_id].append(
+                    BccMessage(content, sender_id, recipient_id)
+                )
+                self.__messages += 1
+                self.__message_bytes += size
+
+    def __move(self, actor_id: str) -> None:
+        # one cell ahead, nothing happens if a wall or another actor is in the way
+        x, y = self.__positions[actor_id]
+        dx, dy = STEPS[self.__orientations[actor_id]]
+        to: tuple[int, int] = (x + dx, y + dy)
+        if not (0 <= to[0] < self.__n and 0 <= to[1] < self.__n):
+            return
+        if to in self.__occupied:
+            self.__blocked_moves += 1
+            return
+        del self.__occupied[(x, y)]
+        self.__occupied[to] = actor_id
+        self.__positions[actor_id] = to
+        self.__locations.pop((x, y), None)
+        self.__locations.pop(to, None)
+
+    def __clean(self, actor_id: str) -> None:
+        # white cleans any dirt, the others only dirt of their own colour
+        position: tuple[int, int] = self.__positions[actor_id]
+        colour: VWColour | None = self.__dirt.get(position)
+        if colour is not None and self.__colours[actor_id] in (VWColour.white, colour):
+            del self.__dirt[position]
+            self.__locations.pop(position, None)
+
+    def __act(self, actor_id: str, action: VWAction) -> None:
+        if isinstance(action, VWMoveAction):
+            self.__move(actor_id)
+        elif isinstance(action, VWTurnAction):
+            orientation: VWOrientation = self.__orientations[actor_id]
+            self.__orientations[actor_id] = (
+                orientation.get_left()
+                if action.get_direction() == VWDirection.left
+                else orientation.get_right()
+            )
+            self.__locations.pop(self.__positions[actor_id], None)
+        elif isinstance(action, VWCleanAction):
+            self.__clean(actor_id)
+        elif isinstance(action, VWSpeakAction):
+            # no recipients means every other actor, as in VacuumWorld
+            self.__send(
+                actor_id, action.get_message(), action.get_recipients() or self.__minds
+            )
+        elif isinstance(action, VWBroadcastAction):
+            self.__send(actor_id, action.get_message(), self.__minds)
+        elif not isinstance(action, VWIdleAction):
+            raise ValueError(f"{actor_id} chose an unknown action {action}")
+
+    def __turn(self, actor_id: str) -> None:
+        # perceive, revise and decide, then act, at most one physical action
+        # and one speak or broadcast a cycle, choosing none is idling
+        mind: VWActorMindSurrogate = self.__minds[actor_id]
+        mind.update_information(
+            self.get_observation(actor_id), self.__inboxes[actor_id]
+        )
+        self.__inboxes[actor_id] = []
+        mind.revise()
+        actions: list[VWAction] = list(mind.decide())
+
+        communicative: int = sum(
+            isinstance(action, (VWSpeakAction, VWBroadcastAction)) for action in actions
+        )
+        if communicative > 1 or len(actions) - communicative > 1:
+            raise ValueError(f"{actor_id} chose {len(actions)} actions it cannot take")
+        for action in actions:
+            self.__act(actor_id, action)
+
+        # actors earlier in the cycle keep what they saw, as in VacuumWorld
+        self.__observations[actor_id] = self.__observe(actor_id)
+
+    def step(self) -> None:
+        # one cycle, each actor taking its turn in the order they were placed,
+        # the effects of a turn showing to the actors after it straight away
+        for actor_id in self.__minds:
+            self.__turn(actor_id)
+        self.__cycle += 1
+
+    def run(
+        self, until: Callable[["Simulator"], bool], max_cycles: int, quiet: bool = True
+    ) -> bool:
+        # step until the condition holds, checked before each cycle, False if it
+        # still does not after max cycles, the minds' printing is dropped if quiet
+        output: contextlib.AbstractContextManager = contextlib.nullcontext()
+        if quiet:
+            output = contextlib.redirect_stdout(_Discard())
+        with output:
+            while not until(self):
+                if self.__cycle >= max_cycles:
+                    return False
+                self.step()
+        return True
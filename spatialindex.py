@@ -0,0 +1,92 @@
+from typing import Callable
+
+
+class BucketGrid:
+    def __init__(self, n: int, bucket_size: int = 8) -> None:
+        # Width/height of one square bucket in cells
+        self.__bucket_size: int = bucket_size
+        # Number of buckets along each axis
+        self.__buckets_per_side: int = max(1, -(-n // bucket_size))
+
+        # Buckets of x y points, flat index bx * buckets_per_side + by
+        self.__buckets: list[set[tuple[int, int]]] = [
+            set() for _ in range(self.__buckets_per_side**2)
+        ]
+        # Number of points held across all buckets
+        self.__size: int = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __bucket_of(self, x: int, y: int) -> set[tuple[int, int]]:
+        return self.__buckets[
+            (x // self.__bucket_size) * self.__buckets_per_side
+            + y // self.__bucket_size
+        ]
+
+    def __contains__(self, point: tuple[int, int]) -> bool:
+        return point in self.__bucket_of(*point)
+
+    def insert(self, x: int, y: int) -> None:
+        bucket: set[tuple[int, int]] = self.__bucket_of(x, y)
+        if (x, y) not in bucket:
+            bucket.add((x, y))
+            self.__size += 1
+
+    def remove(self, x: int, y: int) -> bool:
+        # remove a point, return whether it was held
+        bucket: set[tuple[int, int]] = self.__bucket_of(x, y)
+        if (x, y) in bucket:
+            bucket.remove((x, y))
+            self.__size -= 1
+            return True
+        return False
+
+    def __ring(self, bx: int, by: int, r: int) -> list[int]:
+        # flat indexes of buckets exactly r buckets away (chebyshev) from bx by
+        side: int = self.__buckets_per_side
+        if r == 0:
+            return [bx * side + by]
+        ring: list[int] = []
+        for i in range(max(0, bx - r), min(side, bx + r + 1)):
+            if abs(i - bx) == r:
+                ring += [i * side + j for j in range(max(0, by - r), min(side, by + r + 1))]
+            else:
+                ring += [i * side + j for j in (by - r, by + r) if 0 <= j < side]
+        return ring
+
+    def nearest(
+        self,
+        x: int,
+        y: int,
+        k: int = 1,
+        cost: Callable[[int, int], int] | None = None,
+    ) -> list[tuple[int, int]]:
+        # up to k points closest to x y by euclidean distance, or by cost(px, py)
+        # if given, which must never be below the chebyshev distance from x y,
+        # ties broken by lowest x then lowest y
+        if self.__size == 0 or k <= 0:
+            return []
+
+        bx: int = x // self.__bucket_size
+        by: int = y // self.__bucket_size
+        found: list[tuple[int, int, int]] = []
+
+        # search outwards ring by ring, until the next ring cannot beat the k-th best
+        for r in range(self.__buckets_per_side):
+            for i in self.__ring(bx, by, r):
+                for px, py in self.__buckets[i]:
+                    if cost is None:
+                        found.append(((px - x) ** 2 + (py - y) ** 2, px, py))
+                    else:
+                        found.append((cost(px, py), px, py))
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                # any point r + 1 buckets away is at least r * bucket_size + 1 cells away
+                bound: int = r * self.__bucket_size + 1
+                if found[-1][0] < (bound**2 if cost is None else bound):
+                    break
+
+        found.sort()
+        return [(px, py) for _, px, py in found[:k]]
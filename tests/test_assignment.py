@@ -0,0 +1,41 @@
+import itertools
+import random
+
+import pytest
+
+from assignment import hungarian
+
+
+def _brute_force(cost: list[list[int]]) -> int:
+    # cheapest total over every way of giving each row a distinct column
+    rows: int = len(cost)
+    columns: int = len(cost[0])
+    return min(
+        sum(cost[row][column] for row, column in enumerate(chosen))
+        for chosen in itertools.permutations(range(columns), rows)
+    )
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_hungarian_matches_brute_force(seed: int) -> None:
+    rng: random.Random = random.Random(seed)
+    rows: int = rng.randint(1, 5)
+    columns: int = rng.randint(rows, 6)
+    # small range so there are plenty of ties
+    high: int = rng.choice([3, 20, 1000])
+    cost: list[list[int]] = [
+        [rng.randint(0, high) for _ in range(columns)] for _ in range(rows)
+    ]
+
+    assigned: list[int] = hungarian(cost)
+
+    assert len(assigned) == rows
+    assert len(set(assigned)) == rows
+    assert all(0 <= column < columns for column in assigned)
+    assert sum(cost[row][column] for row, column in enumerate(assigned)) == (
+        _brute_force(cost)
+    )
+
+
+def test_hungarian_no_rows() -> None:
+    assert hungarian([]) == []
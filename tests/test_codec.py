@@ -0,0 +1,94 @@
+import pytest
+from pystarworldsturbo.common.message import BccMessage
+
+import codec
+
+
+# Coords either side of the grid, past one varint byte and past 32 bits
+COORDS: list[tuple[int, int]] = [
+    (0, 0),
+    (-1, -1),
+    (-1, 7),
+    (63, -64),
+    (127, 128),
+    (-129, 300),
+    (2**20, -(2**20)),
+    (2**40, -(2**40) - 1),
+]
+# Dirt and path coords are never negative, these need more than one byte each
+LARGE_COORDS: list[tuple[int, int]] = [(0, 128), (300, 5), (2**14, 2**21), (2**35, 1)]
+
+
+def _round_trip(message: codec.AgentMessage) -> codec.AgentMessage:
+    payload: codec.Payload = codec.encode(message)
+    decoded: list[codec.AgentMessage] = codec.decode(
+        BccMessage(content=payload, sender_id="sender", recipient_id="recipient")
+    )
+    assert len(decoded) == 1
+    assert decoded[0].get_sender_id() == "sender"
+    return decoded[0]
+
+
+@pytest.fixture(params=[False, True], ids=["binary", "json"])
+def json_debug(request: pytest.FixtureRequest):
+    codec.set_json_debug(request.param)
+    yield request.param
+    codec.set_json_debug(False)
+
+
+@pytest.mark.parametrize("coord", COORDS)
+def test_coord_commands_round_trip(json_debug: bool, coord: tuple[int, int]) -> None:
+    x, y = coord
+    for message in (
+        codec.getout(x, y),
+        codec.ignore(x, y),
+        codec.stuck(x, y),
+        codec.aboutme("green", x, y, "west"),
+        codec.explore(2**16, x, y),
+    ):
+        assert _round_trip(message) == message
+
+
+def test_dirt_commands_round_trip(json_debug: bool) -> None:
+    small: list[tuple[int, int]] = [(0, 1), (2, 3)]
+    for message in (
+        codec.clean({"orange": small, "green": LARGE_COORDS}),
+        codec.clean({"green": small}),
+        codec.observed(LARGE_COORDS, {"orange": small}),
+        codec.observed([], {}),
+        codec.reserve(2**30, LARGE_COORDS + small),
+        codec.reserve(0, []),
+    ):
+        assert _round_trip(message) == message
+
+
+def test_bare_commands_round_trip(json_debug: bool) -> None:
+    for message in (codec.rollcall(), codec.moverequest()):
+        assert _round_trip(message) == message
+
+
+def test_batch_keeps_sections_for_recipient(json_debug: bool) -> None:
+    payload: codec.Payload = codec.encode_batch(
+        [
+            (["a"], [codec.getout(-1, 300)]),
+            (["b", "c"], [codec.ignore(2**20, 0)]),
+            ([], [codec.rollcall()]),
+        ]
+    )
+    decoded: list[codec.AgentMessage] = codec.decode(
+        BccMessage(content=payload, sender_id="sender", recipient_id="c")
+    )
+    assert decoded == [codec.ignore(2**20, 0), codec.rollcall()]
+
+
+def test_unsupported_version_is_rejected() -> None:
+    payload: codec.Payload = codec.encode(codec.rollcall())
+    assert isinstance(payload, bytes)
+    with pytest.raises(ValueError):
+        codec.decode(
+            BccMessage(
+                content=bytes([codec.CODEC_VERSION + 1]) + payload[1:],
+                sender_id="sender",
+                recipient_id="recipient",
+            )
+        )
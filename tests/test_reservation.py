@@ -0,0 +1,49 @@
+from reservation import ReservationTable
+
+
+def test_path_holds_cells_then_parks_on_last() -> None:
+    table: ReservationTable = ReservationTable()
+    table.reserve("a", 10, [(0, 0), (1, 0), (2, 0)])
+
+    assert table.get_cell("a", 9) is None
+    assert table.get_cell("a", 10) == (0, 0)
+    assert table.get_cell("a", 11) == (1, 0)
+    assert table.get_cell("a", 50) == (2, 0)
+    assert table.get_holder(1, 0, 11) == "a"
+    assert table.get_holder(1, 0, 12) == ""
+    assert table.get_holder(2, 0, 12) == "a"
+    assert table.get_holder(2, 0, 11) == ""
+    assert not table.is_free(1, 0, 11, "b")
+    assert table.is_free(1, 0, 11, "a")
+    assert not table.is_free_from(2, 0, 5, "b")
+    assert table.is_free_from(2, 0, 5, "a")
+
+
+def test_reserving_again_replaces_the_old_path() -> None:
+    table: ReservationTable = ReservationTable()
+    table.reserve("a", 0, [(0, 0), (0, 1)])
+    table.reserve("a", 1, [(5, 5)])
+
+    assert table.get_holder(0, 0, 0) == ""
+    assert table.get_holder(0, 1, 3) == ""
+    assert table.get_holder(5, 5, 1) == "a"
+    table.reserve("a", 2, [])
+    assert table.get_cell("a", 2) is None
+    assert table.is_free_from(5, 5, 0, "b")
+
+
+def test_release_leaves_others_on_the_same_cell() -> None:
+    table: ReservationTable = ReservationTable()
+    table.reserve("a", 0, [(0, 0), (1, 1), (2, 2)])
+    table.reserve("b", 0, [(3, 3), (1, 1), (4, 4)])
+
+    # first to claim it holds it, neither can take it from the other
+    assert table.get_holder(1, 1, 1) == "a"
+    assert not table.is_free(1, 1, 1, "a")
+    assert not table.is_free(1, 1, 1, "b")
+
+    table.release("a")
+    assert table.get_holder(1, 1, 1) == "b"
+    assert table.is_free(1, 1, 1, "b")
+    assert table.is_free_from(2, 2, 0, "c")
+    table.release("a")
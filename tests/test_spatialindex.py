@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from spatialindex import BucketGrid
+
+
+def _brute_force(
+    points: set[tuple[int, int]], x: int, y: int, k: int
+) -> list[tuple[int, int]]:
+    # every point by squared euclidean distance, ties by lowest x then lowest y
+    return sorted(points, key=lambda p: ((p[0] - x) ** 2 + (p[1] - y) ** 2, p))[:k]
+
+
+def _chebyshev_plus_turn(x: int, y: int):
+    # a cost never below the chebyshev distance, like cycles on the grid
+    return lambda px, py: abs(px - x) + abs(py - y) + (1 if px != x and py != y else 0)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_nearest_matches_brute_force(seed: int) -> None:
+    rng: random.Random = random.Random(seed)
+    n: int = rng.randint(1, 40)
+    grid: BucketGrid = BucketGrid(n, bucket_size=rng.choice([1, 3, 8]))
+    points: set[tuple[int, int]] = set()
+    for _ in range(rng.randint(0, n * n // 2 + 1)):
+        point: tuple[int, int] = (rng.randrange(n), rng.randrange(n))
+        grid.insert(*point)
+        points.add(point)
+    for point in rng.sample(sorted(points), len(points) // 4):
+        assert grid.remove(*point)
+        points.discard(point)
+    assert len(grid) == len(points)
+
+    for _ in range(10):
+        x, y = rng.randrange(n), rng.randrange(n)
+        k: int = rng.randint(0, 6)
+        assert grid.nearest(x, y, k) == _brute_force(points, x, y, k)
+
+        cost = _chebyshev_plus_turn(x, y)
+        assert grid.nearest(x, y, k, cost=cost) == sorted(
+            points, key=lambda p: (cost(*p), p)
+        )[:k]
+
+
+def test_remove_missing_point() -> None:
+    grid: BucketGrid = BucketGrid(10)
+    grid.insert(3, 4)
+    grid.insert(3, 4)
+    assert len(grid) == 1
+    assert not grid.remove(4, 3)
+    assert grid.remove(3, 4)
+    assert (3, 4) not in grid
+    assert grid.nearest(0, 0) == []
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+from vacuumworld.common.vworientation import VWOrientation
+
+from distanceoracle import ORIENTATIONS, get_oracle
+from tourplanner import build_tour, insert_stops, plan_tour, tour_cycles
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_plan_tour_visits_every_stop_no_slower_than_nearest_neighbour(
+    seed: int,
+) -> None:
+    rng: random.Random = random.Random(seed)
+    n: int = rng.randint(2, 30)
+    oracle = get_oracle(n)
+    x, y = rng.randrange(n), rng.randrange(n)
+    orientation: VWOrientation = rng.choice(ORIENTATIONS)
+    coords: list[tuple[int, int]] = list(
+        {(rng.randrange(n), rng.randrange(n)) for _ in range(rng.randint(0, 60))}
+    )
+
+    greedy: list[tuple[int, int]] = build_tour(oracle, x, y, orientation, coords)
+    tour: list[tuple[int, int]] = plan_tour(oracle, x, y, orientation, coords)
+
+    assert sorted(greedy) == sorted(coords)
+    assert sorted(tour) == sorted(coords)
+    assert tour_cycles(oracle, x, y, orientation, tour) <= tour_cycles(
+        oracle, x, y, orientation, greedy
+    )
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_insert_stops_keeps_every_stop_once(seed: int) -> None:
+    rng: random.Random = random.Random(seed)
+    n: int = rng.randint(2, 30)
+    oracle = get_oracle(n)
+    x, y = rng.randrange(n), rng.randrange(n)
+    orientation: VWOrientation = rng.choice(ORIENTATIONS)
+    cells: list[tuple[int, int]] = [(i, j) for i in range(n) for j in range(n)]
+    coords: list[tuple[int, int]] = rng.sample(cells, min(len(cells), 20))
+    tour: list[tuple[int, int]] = plan_tour(oracle, x, y, orientation, coords[:10])
+
+    # stops already on the tour are not added again
+    extended: list[tuple[int, int]] = insert_stops(
+        oracle, x, y, orientation, tour, coords[5:]
+    )
+
+    assert sorted(extended) == sorted(coords)
@@ -0,0 +1,232 @@
+from vacuumworld.common.vworientation import VWOrientation
+
+from distanceoracle import DistanceOracle
+from spatialindex import BucketGrid
+
+
+# Longest stretch of the tour a single 2-opt or Or-opt move may span,
+# keeps each improvement pass near linear on long dirt lists
+MAX_SPAN: int = 40
+# Longest run of consecutive stops Or-opt moves elsewhere
+MAX_OR_OPT_RUN: int = 3
+# Improvement passes over the whole tour before settling for what is found
+MAX_PASSES: int = 4
+# Stops either side of where a planned tour changed that are improved again, the
+# rest of the tour was improved already and is left as it is
+WINDOW: int = 16
+
+
+def tour_cycles(
+    oracle: DistanceOracle,
+    x: int,
+    y: int,
+    orientation: VWOrientation,
+    tour: list[tuple[int, int]],
+) -> int:
+    # move and turn actions to visit every stop in order from x y facing orientation
+    total: int = 0
+    for to_x, to_y in tour:
+        total += oracle.cycles(x, y, orientation, to_x, to_y)
+        orientation = oracle.arrival(x, y, orientation, to_x, to_y)
+        x, y = to_x, to_y
+    return total
+
+
+def _leg(a: tuple[int, int], b: tuple[int, int]) -> int:
+    # cycles between two stops whatever the orientation on arrival at a,
+    # the manhattan distance and the one turn needed when off both axes
+    dx: int = abs(a[0] - b[0])
+    dy: int = abs(a[1] - b[1])
+    return dx + dy + (1 if dx and dy else 0)
+
+
+def build_tour(
+    oracle: DistanceOracle,
+    x: int,
+    y: int,
+    orientation: VWOrientation,
+    coords: list[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    # nearest neighbour by cycles from x y facing orientation
+    remaining: BucketGrid = BucketGrid(oracle.get_n())
+    for cx, cy in coords:
+        remaining.insert(cx, cy)
+
+    tour: list[tuple[int, int]] = []
+    while len(remaining):
+        to_x, to_y = remaining.nearest(
+            x,
+            y,
+            cost=lambda px, py: oracle.cycles(x, y, orientation, px, py),
+        )[0]
+        remaining.remove(to_x, to_y)
+        tour.append((to_x, to_y))
+        orientation = oracle.arrival(x, y, orientation, to_x, to_y)
+        x, y = to_x, to_y
+
+    return tour
+
+
+def _improve(
+    oracle: DistanceOracle,
+    x: int,
+    y: int,
+    orientation: VWOrientation,
+    tour: list[tuple[int, int]],
+    end: tuple[int, int] | None,
+) -> list[tuple[int, int]]:
+    # 2-opt and Or-opt on a tour starting at x y and, unless end is None, going on
+    # to end once done, which stays last, a move is tried when it shortens the
+    # tour ignoring orientation, and kept only if the exact cycles counting every
+    # turn go down too
+    tail: list[tuple[int, int]] = [] if end is None else [end]
+    best: list[tuple[int, int]] = list(tour)
+    best_cycles: int = tour_cycles(oracle, x, y, orientation, best + tail)
+
+    def accept(candidate: list[tuple[int, int]]) -> bool:
+        nonlocal best, best_cycles
+        cycles: int = tour_cycles(oracle, x, y, orientation, candidate + tail)
+        if cycles < best_cycles:
+            best, best_cycles = candidate, cycles
+            return True
+        return False
+
+    for _ in range(MAX_PASSES):
+        improved: bool = False
+        stops: list[tuple[int, int]] = [(x, y)] + best + tail
+        # stops that can be moved are 1 to last - 1, end is after them
+        last: int = len(best) + 1
+
+        # 2-opt: reverse stops[i..j]
+        for i in range(1, last - 1):
+            for j in range(i + 1, min(last, i + MAX_SPAN)):
+                before: int = _leg(stops[i - 1], stops[i])
+                after: int = _leg(stops[i - 1], stops[j])
+                if j + 1 < len(stops):
+                    before += _leg(stops[j], stops[j + 1])
+                    after += _leg(stops[i], stops[j + 1])
+                if after < before and accept(
+                    stops[1:i] + stops[i : j + 1][::-1] + stops[j + 1 : last]
+                ):
+                    improved = True
+                    stops = [(x, y)] + best + tail
+
+        # Or-opt: move a short run stops[i..i+run-1] to sit after stops[k]
+        for run in range(1, MAX_OR_OPT_RUN + 1):
+            for i in range(1, last - run + 1):
+                end_at: int = i + run - 1
+                removed: int = _leg(stops[i - 1], stops[i])
+                added: int = 0
+                if end_at + 1 < len(stops):
+                    removed += _leg(stops[end_at], stops[end_at + 1])
+                    added += _leg(stops[i - 1], stops[end_at + 1])
+                for k in range(max(0, i - MAX_SPAN), min(last, i + MAX_SPAN)):
+                    if i - 1 <= k <= end_at:
+                        continue
+                    gain: int = removed - added - _leg(stops[k], stops[i])
+                    if k + 1 < len(stops):
+                        gain += _leg(stops[k], stops[k + 1]) - _leg(
+                            stops[end_at], stops[k + 1]
+                        )
+                    if gain <= 0:
+                        continue
+                    segment: list[tuple[int, int]] = stops[i : end_at + 1]
+                    rest: list[tuple[int, int]] = stops[:i] + stops[end_at + 1 : last]
+                    at: int = k + 1 if k < i else k + 1 - run
+                    if accept((rest[:at] + segment + rest[at:])[1:]):
+                        improved = True
+                        stops = [(x, y)] + best + tail
+                        break
+
+        if not improved:
+            break
+
+    return best
+
+
+def improve_tour(
+    oracle: DistanceOracle,
+    x: int,
+    y: int,
+    orientation: VWOrientation,
+    tour: list[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    # 2-opt and Or-opt over the whole of an open tour starting at x y
+    return _improve(oracle, x, y, orientation, tour, None)
+
+
+def improve_around(
+    oracle: DistanceOracle,
+    x: int,
+    y: int,
+    orientation: VWOrientation,
+    tour: list[tuple[int, int]],
+    at: int,
+) -> list[tuple[int, int]]:
+    # 2-opt and Or-opt over the stops within WINDOW of position at in a tour
+    # improved before, where a stop was just put in or taken out, the stop after
+    # them staying next, kept only if the exact cycles of the whole tour go down
+    low: int = max(at - WINDOW, 0)
+    high: int = min(at + WINDOW, len(tour))
+    if high - low < 2:
+        return tour
+    for to_x, to_y in tour[:low]:
+        orientation = oracle.arrival(x, y, orientation, to_x, to_y)
+        x, y = to_x, to_y
+    end: tuple[int, int] | None = tour[high] if high < len(tour) else None
+    window: list[tuple[int, int]] = _improve(
+        oracle, x, y, orientation, tour[low:high], end
+    )
+    if window == tour[low:high]:
+        return tour
+    # the orientation on arriving after the window can differ, so the cycles of the
+    # rest of the tour can too
+    candidate: list[tuple[int, int]] = tour[:low] + window + tour[high:]
+    if tour_cycles(oracle, x, y, orientation, candidate[low:]) < tour_cycles(
+        oracle, x, y, orientation, tour[low:]
+    ):
+        return candidate
+    return tour
+
+
+def plan_tour(
+    oracle: DistanceOracle,
+    x: int,
+    y: int,
+    orientation: VWOrientation,
+    coords: list[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    # order coords into a short tour from x y facing orientation
+    return improve_tour(
+        oracle, x, y, orientation, build_tour(oracle, x, y, orientation, coords)
+    )
+
+
+def insert_stops(
+    oracle: DistanceOracle,
+    x: int,
+    y: int,
+    orientation: VWOrientation,
+    tour: list[tuple[int, int]],
+    coords: list[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    # put each new stop where it lengthens the tour least, then improve the
+    # stops around it
+    tour = list(tour)
+    for coord in coords:
+        if coord in tour:
+            continue
+        stops: list[tuple[int, int]] = [(x, y)] + tour
+        best_at: int = len(tour)
+        best_cost: int = _leg(stops[-1], coord)
+        for k in range(len(stops) - 1):
+            cost: int = (
+                _leg(stops[k], coord)
+                + _leg(coord, stops[k + 1])
+                - _leg(stops[k], stops[k + 1])
+            )
+            if cost < best_cost:
+                best_at, best_cost = k, cost
+        tour.insert(best_at, coord)
+        tour = improve_around(oracle, x, y, orientation, tour, best_at)
+    return tour
@@ -0,0 +1,74 @@
+# Level gated trace of what the minds are doing, formatted only when its level is
+# on, kept in a ring buffer that can be written out to a file and echoed to stdout,
+# written out each time it fills when traced to a file, so long runs lose nothing
+
+from collections import deque
+from enum import IntEnum
+
+
+class Level(IntEnum):
+    # nothing traced
+    off = 0
+    # once a run, such as the grid size and the finished map
+    info = 1
+    # requests and instructions passed between agents
+    event = 2
+    # the state of every agent every cycle
+    cycle = 3
+
+
+# Records kept before the oldest are dropped
+CAPACITY: int = 10000
+
+# A record: level, who traced it and the message
+Record = tuple[Level, str, str]
+
+
+# Highest level traced
+_level: Level = Level.info
+# If true, records are printed as they are traced as well
+_echo: bool = True
+# Latest records, oldest first
+_records: deque[Record] = deque(maxlen=CAPACITY)
+# File the records are written to each time the ring buffer fills, "" if none
+_path: str = ""
+
+
+def configure(
+    level: Level, echo: bool = True, capacity: int = CAPACITY, path: str = ""
+) -> None:
+    # records already kept are dropped
+    global _level, _echo, _records, _path
+    _level = level
+    _echo = echo
+    _records = deque(maxlen=capacity)
+    _path = path
+
+
+def is_enabled(level: Level) -> bool:
+    return level <= _level
+
+
+def trace(level: Level, source: object, template: str, *args: object) -> None:
+    # the template is filled in with str.format only if the level is on,
+    # so arguments are passed as they are, not formatted beforehand
+    if level > _level:
+        return
+    record: Record = (level, str(source), template.format(*args))
+    _records.append(record)
+    if _path and len(_records) == _records.maxlen:
+        flush(_path)
+    if _echo:
+        print(f"{record[1]}: {record[2]}")
+
+
+def get_records() -> list[Record]:
+    return list(_records)
+
+
+def flush(path: str) -> None:
+    # append the records kept to a file, one line each, and drop them
+    with open(path, "a") as file:
+        for level, source, message in _records:
+            file.write(f"{level.name} {source}: {message}\n")
+    _records.clear()